@@ -3,21 +3,295 @@ TestVeri_Duygulu.xlsx dosyasındaki entry'leri okuyup
 duygu analizini yapıp Twitter sütununa yazan script
 """
 
+import argparse
+import itertools
+import json
 import os
-import sys
+import threading
 import time
 import unicodedata
+from collections import deque
+from dataclasses import asdict
+import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
 
 # .env dosyasını yükle
 load_dotenv()
 
 # NLP servisini import et
 from services.nlp_service import NLPService
+from services.inference_workers import InferenceWorkerPool
+from services.dataset_io import SINK_FORMATS, export_excel, iter_chunks, open_sink
+from services.checkpoint_log import CheckpointLog
+from services.watchdog import LatencyStats, WatchdogExecutor
 
-def analyze_test_data(input_file='TestVeri_Duygulu.xlsx', output_file='TestVeri_Duygulu_Analyzed.xlsx', samples_per_category=None):
+# RDuygu'yu 0,1,2 formatına çevir (sağlam normalize)
+# Not: 0=olumsuz, 1=nötr, 2=olumlu
+RDUYGU_MAP = {
+    'negative': 0, 'neg': 0, 'olumsuz': 0, '-1': 0, '0': 0,
+    'neutral': 1, 'neu': 1, 'nötr': 1, 'notr': 1, '1': 1,
+    'positive': 2, 'pos': 2, 'olumlu': 2, '2': 2
+}
+
+
+def normalize_rduygu(x):
+    """RDuygu değerini 0/1/2'ye çevir (int/float/string varyantlarını yakala); eşleşmezse -1."""
+    try:
+        # Sayısal ise doğrudan kontrol et
+        if isinstance(x, (int, float)):
+            xi = int(x)
+            return xi if xi in (0, 1, 2) else -1
+        # Metinsel ise sözlükten eşle
+        s = str(x).lower().strip()
+        return RDUYGU_MAP.get(s, -1)
+    except Exception:
+        return -1
+
+
+def normalize_category(label: object) -> str:
+    """Kategori adını karşılaştırma için sadeleştir (küçük harf, aksan ve Türkçe karakterler ASCII)."""
+    text = str(label).strip().lower().replace('’', "'").replace('‘', "'")
+    text = unicodedata.normalize('NFKD', text)
+    return text.encode('ascii', 'ignore').decode()
+
+
+def _init_runner(workers: int, isolate: bool = False):
+    """
+    NLP servisini ve zaman aşımlı çağrı katmanını başlat.
+    workers > 1 veya isolate ise modeller worker süreçlerinde çalışır ve takılan worker öldürülüp yeniden
+    başlatılır; aksi halde süreç içi WatchdogExecutor kullanılır (takılan thread sadece bırakılabilir; o
+    dönene kadar yeni satır başlatılmaz, NLP_ABANDON_WAIT_FACTOR x zaman aşımı içinde dönmezse analiz
+    öldürülebilir tek worker'lı havuza taşınır).
+
+    Returns:
+        tuple: (nlp_service, runner) — worker modunda ikisi de InferenceWorkerPool'dur
+    """
+    if workers > 1 or isolate:
+        print(f"\n🤖 Initializing {workers} NLP worker process{'es' if workers > 1 else ''}...")
+        pool = InferenceWorkerPool(workers)
+        pool.load()
+        return pool, pool
+    print("\n🤖 Initializing NLP service...")
+    nlp_service = NLPService()
+    return nlp_service, WatchdogExecutor(nlp_service, fallback_factory=lambda: InferenceWorkerPool(1))
+
+
+def _timed_call(runner, latency: LatencyStats, method: str, arg, timeout: float, entries: int = 1):
+    """
+    runner.call + gecikme kaydı (worker modunda kuyruk / yeniden yükleme beklemesi, süreç içi modda
+    bırakılan thread'i bekleme süresi hariç; ikincisi LatencyStats.record_blocked ile ayrıca sayılır).
+    """
+    if isinstance(runner, InferenceWorkerPool):
+        future = runner.submit(method, arg, analysis='combined')
+        result = runner.wait(future, timeout=timeout)
+        latency.record(future.run_sec, entries)
+        return result
+    waited = runner.wait_abandoned()
+    if waited:
+        latency.record_blocked(waited)
+    start_ts = time.time()
+    result = runner.call(method, arg, timeout=timeout)
+    latency.record(time.time() - start_ts, entries)
+    return result
+
+
+def _print_latency(latency: LatencyStats, runner):
+    print(f"\n⏱️ Latency per entry: {latency.format()}")
+    if isinstance(runner, InferenceWorkerPool):
+        restarts = sum(w['restarts'] for w in runner.readiness()['workers'].values())
+        if restarts:
+            print(f"   ♻️ {restarts} wedged worker process(es) restarted")
+    elif runner.abandoned:
+        print(f"   ⚠️ {runner.abandoned} hung call(s) abandoned in-process; later rows waited for them to return "
+              f"(use --isolate to kill them instead)")
+        if runner.fallback is not None:
+            print("   ♻️ A hung call did not return in time; remaining rows ran in an isolated worker process")
+        elif runner.wedged:
+            print("   ❌ A hung call did not return in time; remaining rows were marked as failed")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+def save_probability_dump(path, nlp_service, entry_probs, entry_lexicon, df_sampled):
+    """
+    Cümle bazlı olasılık matrisini rescore_sentiment.py için .npz olarak kaydet.
+
+    Dosya içeriği:
+        probs (toplam cümle x sınıf), offsets (entry + 1), lexicon (entry x 2),
+        rduygu / tduygu (0/1/2, -1 = yok), etiket eşlemesi ve analizde kullanılan oylama ayarları
+    """
+    labels, class_to_sentiment, class_known = nlp_service.sentiment_label_map()
+    counts = [len(p) for p in entry_probs]
+    offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+    rows = [row for p in entry_probs for row in p]
+    probs = np.asarray(rows, dtype=np.float32).reshape(len(rows), len(labels))
+    tduygu = pd.to_numeric(df_sampled['Tduygu'], errors='coerce').fillna(-1).astype(int)
+    np.savez_compressed(
+        path,
+        probs=probs,
+        offsets=offsets,
+        lexicon=np.asarray(entry_lexicon, dtype=np.int64).reshape(len(entry_lexicon), 2),
+        rduygu=df_sampled['RDuygu'].apply(normalize_rduygu).to_numpy(dtype=np.int64),
+        tduygu=tduygu.to_numpy(dtype=np.int64),
+        labels=np.asarray(labels),
+        class_to_sentiment=np.asarray(class_to_sentiment, dtype=np.int64),
+        class_known=np.asarray(class_known, dtype=bool),
+        voting=json.dumps(asdict(nlp_service.voting)),
+        model=nlp_service.sentiment_model_id,
+    )
+    print(f"💾 Sentence probabilities saved ({len(rows)} sentences, {len(entry_probs)} entries) -> {path}")
+
+
+def write_metrics_report(df_sampled, output_file):
+    """
+    Dağılım özetini ve duygu / kategori doğruluk metriklerini yazdır, <output>_metrics.txt'ye kaydet.
+    df_sampled en az RDuygu, Rkategori, topic, Tduygu ve Tkategori sütunlarını içermelidir.
+    """
+    # Özet istatistikler
+    metrics_lines = []
+    def mprint(s: str):
+        print(s)
+        metrics_lines.append(s)
+    total_samples = len(df_sampled)
+    mprint("\n📊 Summary:")
+
+    mprint("\n   Topic (Rkategori) Distribution:")
+    topic_counts = df_sampled['topic'].value_counts()
+    for topic, count in topic_counts.items():
+        percentage = (count / total_samples) * 100
+        mprint(f"      {topic}: {count} ({percentage:.1f}%)")
+
+    mprint("\n   Tduygu Distribution:")
+    sentiment_counts = df_sampled['Tduygu'].value_counts()
+    sentiment_labels = {0: 'negative', 1: 'neutral', 2: 'positive'}
+    for code, count in sentiment_counts.items():
+        if code != '':
+            percentage = (count / total_samples) * 100
+            label = sentiment_labels.get(code, 'unknown')
+            mprint(f"      {code} ({label}): {count} ({percentage:.1f}%)")
+
+    mprint("\n   Tkategori Distribution:")
+    category_counts = df_sampled['Tkategori'].value_counts()
+    for category, count in category_counts.items():
+        if category != '':
+            percentage = (count / total_samples) * 100
+            mprint(f"      {category}: {count} ({percentage:.1f}%)")
+
+    # Doğruluk hesaplama
+    mprint(f"\n🎯 Accuracy Metrics:")
+
+    # Geçerli satırları filtrele
+    valid_mask = (df_sampled['Tduygu'] != '') & (df_sampled['RDuygu'] != '')
+    valid_df = df_sampled[valid_mask].copy()
+
+    if len(valid_df) > 0:
+        # RDuygu'yu normalize et (int/float/string varyantlarını yakala)
+        valid_df['RDuygu_normalized'] = valid_df['RDuygu'].apply(normalize_rduygu)
+
+        # Sadece başarıyla eşleşenleri al
+        valid_df = valid_df[valid_df['RDuygu_normalized'].isin([0, 1, 2])]
+
+        if len(valid_df) > 0:
+            # Tduygu'yu güvenli şekilde int'e çevir ve sadece 0/1/2 olanları kullan
+            valid_df['Tduygu_int'] = pd.to_numeric(valid_df['Tduygu'], errors='coerce')
+            valid_df = valid_df[valid_df['Tduygu_int'].isin([0, 1, 2])]
+            true_labels = valid_df['RDuygu_normalized'].astype(int)
+            pred_labels = valid_df['Tduygu_int'].astype(int)
+
+            mprint("\n   === SENTIMENT ACCURACY ===")
+
+            # Accuracy hesapla
+            correct = (true_labels == pred_labels).sum()
+            total = len(valid_df)
+            accuracy = correct / total
+
+            mprint(f"   Total valid samples: {total}")
+            mprint(f"   Correct predictions: {correct}")
+            mprint(f"   Accuracy: {accuracy:.2%}")
+
+            # Sklearn varsa detaylı metrikler
+            try:
+                from sklearn.metrics import classification_report, confusion_matrix
+
+                mprint("\n📈 Classification Report:")
+                target_names = ['negative (0)', 'neutral (1)', 'positive (2)']
+                try:
+                    report_text = classification_report(true_labels, pred_labels, labels=[0, 1, 2], target_names=target_names, zero_division=0)
+                    mprint(report_text)
+                except Exception as e:
+                    mprint(f"   ⚠️ Could not compute classification report: {e}")
+
+                mprint("\n🔢 Confusion Matrix:")
+                cm = confusion_matrix(true_labels, pred_labels, labels=[0, 1, 2])
+
+                # Confusion matrix'i güzel formatta yazdır
+                mprint(f"{'':15} {'Pred-0':>10} {'Pred-1':>10} {'Pred-2':>10}")
+                labels_text = ['True-0 (neg)', 'True-1 (neu)', 'True-2 (pos)']
+                for i, label in enumerate(labels_text):
+                    row_str = f"{label:15}"
+                    for j in range(3):
+                        row_str += f"{cm[i][j]:>10}"
+                    mprint(row_str)
+
+            except ImportError:
+                mprint("\n   💡 Tip: Install scikit-learn for detailed metrics:")
+                mprint("      pip install scikit-learn")
+
+            # Kategori doğruluğu (Rkategori vs Tkategori)
+            mprint("\n   === CATEGORY ACCURACY ===")
+            valid_cat_mask = (df_sampled['Tkategori'] != '') & (df_sampled['Rkategori'] != '')
+            valid_cat_df = df_sampled[valid_cat_mask].copy()
+
+            if len(valid_cat_df) > 0:
+                valid_cat_df['Rkategori_norm'] = valid_cat_df['Rkategori'].apply(normalize_category)
+                valid_cat_df['Tkategori_norm'] = valid_cat_df['Tkategori'].apply(normalize_category)
+
+                true_cat = valid_cat_df['Rkategori_norm']
+                pred_cat = valid_cat_df['Tkategori_norm']
+
+                cat_correct = (true_cat == pred_cat).sum()
+                cat_total = len(valid_cat_df)
+                cat_accuracy = cat_correct / cat_total
+
+                mprint(f"   Total samples: {cat_total}")
+                mprint(f"   Correct predictions: {cat_correct}")
+                mprint(f"   Category Accuracy: {cat_accuracy:.2%}")
+
+                try:
+                    from sklearn.metrics import classification_report
+                    mprint("\n📈 Category Classification Report:")
+                    try:
+                        cat_report_text = classification_report(true_cat, pred_cat, zero_division=0)
+                        mprint(cat_report_text)
+                    except Exception as e:
+                        mprint(f"   ⚠️ Could not compute category classification report: {e}")
+                except ImportError:
+                    pass
+
+        else:
+            mprint("   ⚠️ No valid RDuygu labels found after normalization")
+    else:
+        mprint("   ⚠️ No valid samples found (both RDuygu and Tduygu must be non-empty)")
+
+    # Metrikleri dosyaya kaydet
+    base, ext = os.path.splitext(output_file)
+    metrics_file = f"{base}_metrics.txt"
+    try:
+        with open(metrics_file, 'w', encoding='utf-8') as f:
+            f.write("\n".join(metrics_lines) + "\n")
+        print(f"\n📝 Metrics saved to: {metrics_file}")
+    except Exception as e:
+        print(f"\n⚠️ Could not save metrics file: {e}")
+
+
+def analyze_test_data(input_file='TestVeri_Duygulu.xlsx', output_file='TestVeri_Duygulu_Analyzed.xlsx', samples_per_category=None,
+                      dump_probs=None, workers=1, resume=False, isolate=False):
     """
     Excel dosyasındaki entry'leri okuyup duygu ve tema analizi yap.
     İsteğe bağlı: Her kategoriden dengeli sayıda örnek seçer.
@@ -36,6 +310,15 @@ def analyze_test_data(input_file='TestVeri_Duygulu.xlsx', output_file='TestVeri_
         samples_per_category: Her kategoriden kaç örnek alınacak.
                       None, 'all', 0 veya 'none' ise örnekleme yapılmaz
                       ve tüm geçerli satırlar işlenir.
+        dump_probs: Verilirse her entry'nin cümle olasılıkları bu .npz dosyasına yazılır
+                    (rescore_sentiment.py ile model yüklemeden oylama ayarı taraması için)
+        workers: 1'den büyükse satırlar chunk'lar halinde her biri kendi NLPService'ini ve torch thread
+                 payını (NLP_WORKER_THREADS, varsayılan çekirdek / worker) kullanan worker süreçlerine dağıtılır;
+                 sonuçlar metrikler hesaplanmadan önce orijinal satır sırasıyla birleştirilir
+        resume: True ise checkpoint günlüğünde (CHECKPOINT_PATH) aynı metinle kaydı olan satırlar atlanır,
+                nihai çıktı günlükteki tahminlerle birlikte kurulur
+        isolate: True ise tek worker'da bile analiz ayrı bir süreçte çalışır; NLP_TIMEOUT_SEC aşılınca
+                 süreç öldürülüp yeniden başlatılır
     """
     print(f"📖 Reading file: {input_file}")
     
@@ -100,8 +383,9 @@ def analyze_test_data(input_file='TestVeri_Duygulu.xlsx', output_file='TestVeri_
         print(f"   Will predict: Tduygu, Tkategori")
         
         # NLP servisini başlat
-        print("\n🤖 Initializing NLP service...")
-        nlp_service = NLPService()
+        nlp_service, runner = _init_runner(workers, isolate)
+        pool = runner if isinstance(runner, InferenceWorkerPool) else None
+        latency = LatencyStats()
 
         # Her çağrı için zaman aşımı (saniye)
         try:
@@ -110,270 +394,340 @@ def analyze_test_data(input_file='TestVeri_Duygulu.xlsx', output_file='TestVeri_
             per_call_timeout = 45
         print(f"   Per-entry timeout: {per_call_timeout}s (set NLP_TIMEOUT_SEC to change)")
 
+        # Toplu analiz: kaç satır tek seferde modele gönderilir
+        try:
+            batch_rows = max(1, int(os.getenv('NLP_BATCH_SIZE', '16')))
+        except Exception:
+            batch_rows = 16
+        print(f"   Batch size: {batch_rows} rows (set NLP_BATCH_SIZE to change)")
+
         def _analyze_one(text: str):
-            return nlp_service.analyze_combined(text)
-        
+            return _timed_call(runner, latency, 'analyze_combined', text, per_call_timeout)
+
         # Her entry için duygu ve tema analizi yap
         print(f"\n🔬 Analyzing {len(df_sampled)} entries...")
         
-        sentiment_results = []
-        category_results = []
+        # Satır id'si -> (Tduygu, Tkategori); başarısız satırlar için ('', '')
+        predictions = {}
+        # --dump-probs: satır id'si -> (cümle olasılıkları, son cümle sözlük sayıları)
+        entry_probs = {}
 
-        # Checkpoint ayarları
-        try:
-            save_every = int(os.getenv('CHECKPOINT_EVERY', '20'))
-        except Exception:
-            save_every = 20
-        checkpoint_path = os.getenv('CHECKPOINT_PATH', output_file.replace('.xlsx', '_partial.xlsx'))
+        def _record_probs(chunk: list, texts: list):
+            # Sadece tahmini başarılı satırlar için; çağrı da analiz gibi zaman aşımı katmanından geçer
+            if not dump_probs:
+                return
+            ok = [(idx, text) for (idx, _), text in zip(chunk, texts) if predictions.get(idx, ('', '')) != ('', '')]
+            dumped = {}
+            if ok:
+                try:
+                    items = runner.call('sentiment_probs_batch', [text for _, text in ok],
+                                        timeout=per_call_timeout * len(ok))
+                    dumped = {idx: item for (idx, _), item in zip(ok, items)}
+                except Exception as e:
+                    print(f"   [Rows {ok[0][0]}..{ok[-1][0]}] ⚠️ Could not dump probabilities: {e}")
+            for idx, _ in chunk:
+                item = dumped.get(idx, {})
+                entry_probs[idx] = (item.get('probs', []), item.get('lexicon', (0, 0)))
+
+        # Checkpoint günlüğü: her tahmin satır id'si + metin özetiyle sadece ekleme yapılan JSONL'e yazılır,
+        # CHECKPOINT_EVERY kayıtta bir diske zorlanır (0: günlük kapalı)
+        save_every = _env_int('CHECKPOINT_EVERY', 20)
+        checkpoint_path = os.getenv('CHECKPOINT_PATH', os.path.splitext(output_file)[0] + '_checkpoint.jsonl')
+        checkpoint = CheckpointLog(checkpoint_path, resume=resume) if save_every > 0 else None
+        if resume and checkpoint is None:
+            print("   ⚠️ CHECKPOINT_EVERY=0: checkpoint log disabled, nothing to resume from")
+        if checkpoint is not None and checkpoint.rotated_to:
+            print(f"   ⚠️ Existing checkpoint log moved to {checkpoint.rotated_to} (run without --resume); "
+                  f"to continue from it, rename it back to {checkpoint_path} and rerun with --resume")
+
+        sentiment_map = {
+            'negative': 0,
+            'neutral': 1,
+            'positive': 2
+        }
+
+        def _record(idx, text: str, combined_result):
+            if combined_result is None:
+                # Başarısız satırlar günlüğe yazılmaz; --resume onları tekrar dener
+                predictions[idx] = ('', '')
+            else:
+                # Duygu analizi sonucu -> 0, 1, 2 formatında; tema analizi sonucu
+                sentiment = sentiment_map.get(combined_result['sentiment']['sentiment'], 1)
+                topic = combined_result['theme']['main_topic']
+                predictions[idx] = (sentiment, topic)
+                if checkpoint is not None:
+                    checkpoint.append(idx, text, Tduygu=sentiment, Tkategori=topic)
+                    # Diske zorlama sıklığı bu çalışmada günlüğe eklenen kayıtlarla sayılır
+                    if checkpoint.appended % save_every == 0:
+                        checkpoint.flush()
+
+            # İlerleme göster (her 5 kayıtta bir; worker modunda tamamlanan chunk'larla raporlanır)
+            if pool is None and len(predictions) % 5 == 0:
+                print(f"   Progress: {len(predictions)}/{len(df_sampled)}", flush=True)
+
+        def _sequential_results(chunks):
+            # (chunk, texts, sonuç listesi veya hata) üretir
+            for chunk, texts in chunks:
+                chunk_timeout = per_call_timeout * len(chunk)
+                start_ts = time.time()
+                try:
+                    combined_results = _timed_call(runner, latency, 'analyze_combined_batch', texts, chunk_timeout,
+                                                   len(texts))
+                except Exception as e:
+                    yield chunk, texts, e
+                    continue
+                elapsed = time.time() - start_ts
+                if elapsed > chunk_timeout * 0.7:
+                    print(f"   [Rows {chunk[0][0]}..{chunk[-1][0]}] ⚠️ Slow batch took {elapsed:.1f}s")
+                yield chunk, texts, combined_results
+
+        progress = {'done': 0, 'started': time.time()}
+        progress_lock = threading.Lock()
+
+        def _chunk_done(n: int):
+            with progress_lock:
+                progress['done'] += n
+                done = progress['done']
+                rate = done / max(time.time() - progress['started'], 1e-6)
+            print(f"   Progress: {done}/{len(df_sampled)} ({rate:.1f} entries/s, {workers} workers)", flush=True)
+
+        def _sharded_results(chunks):
+            # Chunk'lar boşalan worker'a gider (havuzda en fazla 2 x worker chunk bekler);
+            # sonuçlar orijinal satır sırasıyla döner, böylece checkpoint'ler de sıralı kalır
+            chunks = iter(chunks)
+            in_flight = deque()
+
+            def _submit(item):
+                chunk, texts = item
+                future = pool.submit('analyze_combined_batch', texts, analysis='combined')
+                future.add_done_callback(lambda _, n=len(texts): _chunk_done(n))
+                in_flight.append((chunk, texts, future))
+
+            for item in itertools.islice(chunks, workers * 2):
+                _submit(item)
+            while in_flight:
+                chunk, texts, future = in_flight.popleft()
+                try:
+                    # Süre chunk'ın worker'da başladığı andan ölçülür; aşılırsa worker yeniden başlatılır
+                    outcome = pool.wait(future, timeout=per_call_timeout * len(chunk))
+                    latency.record(future.run_sec, len(texts))
+                except Exception as e:
+                    outcome = e
+                next_item = next(chunks, None)
+                if next_item is not None:
+                    _submit(next_item)
+                yield chunk, texts, outcome
 
-        def _save_partial(k: int):
-            try:
-                tmp_df = df_sampled.copy()
-                if k > 0:
-                    idxs = tmp_df.index[:k]
-                    tmp_df.loc[idxs, 'Tduygu'] = sentiment_results[:k]
-                    tmp_df.loc[idxs, 'Tkategori'] = category_results[:k]
-                tmp_df.to_excel(checkpoint_path, index=False)
-                print(f"   💾 Checkpoint saved ({k} rows) -> {checkpoint_path}")
-            except Exception as e:
-                print(f"   ⚠️ Checkpoint save failed: {e}")
-        
         try:
+            rows = []
             for idx, row in df_sampled.iterrows():
-                body_text = str(row['body'])
-                
-                try:
-                    # Hem duygu hem tema analizi yap (zaman aşımı ile)
-                    start_ts = time.time()
-                    # Her olası takılmada ana iş parçacığını korumak için tek kullanımlık executor
-                    executor = ThreadPoolExecutor(max_workers=1)
-                    future = executor.submit(_analyze_one, body_text)
-                    try:
-                        combined_result = future.result(timeout=per_call_timeout)
-                    except FuturesTimeout:
-                        print(f"   [Row {idx}] ⏳ Timeout after {per_call_timeout}s — skipping entry")
-                        # Bu executor artık beklenmeden kapatılır; arka planda çalışan thread bırakılabilir
-                        executor.shutdown(wait=False)
-                        raise TimeoutError(f"analyze_combined timeout > {per_call_timeout}s")
-                    except Exception as e_call:
-                        executor.shutdown(wait=False)
-                        raise e_call
+                record = checkpoint.get(idx, str(row['body'])) if (resume and checkpoint is not None) else None
+                if record is not None:
+                    predictions[idx] = (record['Tduygu'], record['Tkategori'])
+                else:
+                    rows.append((idx, row))
+            if resume:
+                print(f"   ⏩ Resuming: {len(predictions)} rows restored from {checkpoint_path}, {len(rows)} left")
+            progress['done'] = len(predictions)
+
+            chunks = []
+            for start in range(0, len(rows), batch_rows):
+                chunk = rows[start:start + batch_rows]
+                chunks.append((chunk, [str(row['body']) for _, row in chunk]))
+
+            # Hem duygu hem tema analizi yap (zaman aşımı ile, batch halinde)
+            results_iter = _sharded_results(chunks) if pool is not None else _sequential_results(chunks)
+            for chunk, texts, outcome in results_iter:
+                if isinstance(outcome, Exception):
+                    # Batch hatası / zaman aşımı: satır satır (entry başına zaman aşımıyla) tekrar dene,
+                    # hatayı sadece ilgili satıra yaz; yavaş tek entry batch'in geri kalanını düşürmesin
+                    if isinstance(outcome, TimeoutError):
+                        chunk_timeout = per_call_timeout * len(chunk)
+                        print(f"   [Rows {chunk[0][0]}..{chunk[-1][0]}] ⏳ Timeout after {chunk_timeout}s "
+                              f"— retrying row by row")
+                        latency.record_timeout(0)  # entry'ler satır satır denemede sayılır
                     else:
-                        executor.shutdown(wait=True)
-                    elapsed = time.time() - start_ts
-                    if elapsed > per_call_timeout * 0.7:
-                        print(f"   [Row {idx}] ⚠️ Slow call took {elapsed:.1f}s")
-
-                    # Duygu analizi sonucu -> 0, 1, 2 formatında
-                    sentiment = combined_result['sentiment']['sentiment']
-                    sentiment_map = {
-                        'negative': 0,
-                        'neutral': 1,
-                        'positive': 2
-                    }
-                    sentiment_code = sentiment_map.get(sentiment, 1)
-                    
-                    # Tema analizi sonucu
-                    main_topic = combined_result['theme']['main_topic']
-                    
-                    sentiment_results.append(sentiment_code)
-                    category_results.append(main_topic)
-                    
-                    # İlerleme göster (her 5 kayıtta bir)
-                    if (len(sentiment_results)) % 5 == 0:
-                        print(f"   Progress: {len(sentiment_results)}/{len(df_sampled)}", flush=True)
-
-                    # Periyodik checkpoint
-                    if save_every > 0 and (len(sentiment_results) % save_every == 0):
-                        _save_partial(len(sentiment_results))
-                
-                except Exception as e:
-                    print(f"   [Row {idx}] Error: {e}")
-                    sentiment_results.append('')
-                    category_results.append('')
-                    if save_every > 0 and (len(sentiment_results) % save_every == 0):
-                        _save_partial(len(sentiment_results))
+                        print(f"   [Rows {chunk[0][0]}..{chunk[-1][0]}] Batch error: {outcome} — retrying row by row")
+                    for (idx, _), body_text in zip(chunk, texts):
+                        try:
+                            _record(idx, body_text, _analyze_one(body_text))
+                        except TimeoutError as e_row:
+                            print(f"   [Row {idx}] ⏳ {e_row}")
+                            latency.record_timeout()
+                            _record(idx, body_text, None)
+                        except Exception as e_row:
+                            print(f"   [Row {idx}] Error: {e_row}")
+                            _record(idx, body_text, None)
+                    _record_probs(chunk, texts)
+                    continue
+
+                for (idx, _), body_text, combined_result in zip(chunk, texts, outcome):
+                    _record(idx, body_text, combined_result)
+                # Cümle önbelleği sıcak olduğundan bu çağrı modele tekrar gitmez
+                # (worker modunda chunk'ı işleyen worker'a denk gelmeyebilir)
+                _record_probs(chunk, texts)
         except KeyboardInterrupt:
-            print("\n🛑 Interrupted by user. Saving checkpoint before exit...")
-            _save_partial(len(sentiment_results))
+            print(f"\n🛑 Interrupted by user. Progress is kept in {checkpoint_path}; rerun with --resume")
             raise
-        
-        # Sonuçları sütunlara yaz
-        df_sampled['Tduygu'] = sentiment_results
-        df_sampled['Tkategori'] = category_results
-        
-        print(f"\n   ✅ Analysis completed: {len(sentiment_results)} entries processed")
-        
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
+
+        # Sonuçları sütunlara yaz (orijinal satır sırasıyla)
+        df_sampled['Tduygu'] = [predictions.get(idx, ('', ''))[0] for idx in df_sampled.index]
+        df_sampled['Tkategori'] = [predictions.get(idx, ('', ''))[1] for idx in df_sampled.index]
+
+        print(f"\n   ✅ Analysis completed: {len(predictions)} entries processed")
+        _print_latency(latency, runner)
+
         # Sonuçları kaydet
         print(f"\n💾 Saving results to: {output_file}")
         df_sampled.to_excel(output_file, index=False)
+        if dump_probs:
+            # Günlükten geri yüklenen satırların olasılıkları burada hesaplanır
+            missing = [idx for idx in df_sampled.index if idx not in entry_probs]
+            for start in range(0, len(missing), batch_rows):
+                ids = missing[start:start + batch_rows]
+                _record_probs([(idx, None) for idx in ids], [str(df_sampled.at[idx, 'body']) for idx in ids])
+            ordered = [entry_probs[idx] for idx in df_sampled.index]
+            save_probability_dump(dump_probs, nlp_service, [p for p, _ in ordered], [lex for _, lex in ordered],
+                                  df_sampled)
+        runner.close()
         
-        # Özet istatistikler
-        metrics_lines = []
-        def mprint(s: str):
-            print(s)
-            metrics_lines.append(s)
-        total_samples = len(df_sampled)
-        mprint("\n📊 Summary:")
-        
-        mprint("\n   Topic (Rkategori) Distribution:")
-        topic_counts = df_sampled['topic'].value_counts()
-        for topic, count in topic_counts.items():
-            percentage = (count / total_samples) * 100
-            mprint(f"      {topic}: {count} ({percentage:.1f}%)")
-        
-        mprint("\n   Tduygu Distribution:")
-        sentiment_counts = df_sampled['Tduygu'].value_counts()
-        sentiment_labels = {0: 'negative', 1: 'neutral', 2: 'positive'}
-        for code, count in sentiment_counts.items():
-            if code != '':
-                percentage = (count / total_samples) * 100
-                label = sentiment_labels.get(code, 'unknown')
-                mprint(f"      {code} ({label}): {count} ({percentage:.1f}%)")
-        
-        mprint("\n   Tkategori Distribution:")
-        category_counts = df_sampled['Tkategori'].value_counts()
-        for category, count in category_counts.items():
-            if category != '':
-                percentage = (count / total_samples) * 100
-                mprint(f"      {category}: {count} ({percentage:.1f}%)")
-        
-        # Doğruluk hesaplama
-        mprint(f"\n🎯 Accuracy Metrics:")
-        
-        # RDuygu'yu 0,1,2 formatına çevir (sağlam normalize)
-        # Not: 0=olumsuz, 1=nötr, 2=olumlu
-        rduygu_map = {
-            'negative': 0, 'neg': 0, 'olumsuz': 0, '-1': 0, '0': 0,
-            'neutral': 1, 'neu': 1, 'nötr': 1, 'notr': 1, '1': 1,
-            'positive': 2, 'pos': 2, 'olumlu': 2, '2': 2
-        }
-        
-        # Geçerli satırları filtrele
-        valid_mask = (df_sampled['Tduygu'] != '') & (df_sampled['RDuygu'] != '')
-        valid_df = df_sampled[valid_mask].copy()
+        write_metrics_report(df_sampled, output_file)
+
+        print(f"\n✅ Analysis complete! Results saved to: {output_file}")
         
-        if len(valid_df) > 0:
-            # RDuygu'yu normalize et (int/float/string varyantlarını yakala)
-            def _normalize_rduygu(x):
-                try:
-                    # Sayısal ise doğrudan kontrol et
-                    if isinstance(x, (int, float)):
-                        xi = int(x)
-                        return xi if xi in (0, 1, 2) else -1
-                    # Metinsel ise sözlükten eşle
-                    s = str(x).lower().strip()
-                    return rduygu_map.get(s, -1)
-                except Exception:
-                    return -1
-
-            valid_df['RDuygu_normalized'] = valid_df['RDuygu'].apply(_normalize_rduygu)
-            
-            # Sadece başarıyla eşleşenleri al
-            valid_df = valid_df[valid_df['RDuygu_normalized'].isin([0, 1, 2])]
-            
-            if len(valid_df) > 0:
-                # Tduygu'yu güvenli şekilde int'e çevir ve sadece 0/1/2 olanları kullan
-                valid_df['Tduygu_int'] = pd.to_numeric(valid_df['Tduygu'], errors='coerce')
-                valid_df = valid_df[valid_df['Tduygu_int'].isin([0, 1, 2])]
-                true_labels = valid_df['RDuygu_normalized'].astype(int)
-                pred_labels = valid_df['Tduygu_int'].astype(int)
-                
-                mprint("\n   === SENTIMENT ACCURACY ===")
-                
-                # Accuracy hesapla
-                correct = (true_labels == pred_labels).sum()
-                total = len(valid_df)
-                accuracy = correct / total
-                
-                mprint(f"   Total valid samples: {total}")
-                mprint(f"   Correct predictions: {correct}")
-                mprint(f"   Accuracy: {accuracy:.2%}")
-                
-                # Sklearn varsa detaylı metrikler
-                try:
-                    from sklearn.metrics import classification_report, confusion_matrix
+    except FileNotFoundError:
+        print(f"❌ File not found: {input_file}")
+        print("   Please make sure the file exists in the current directory.")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
 
-                    mprint("\n📈 Classification Report:")
-                    target_names = ['negative (0)', 'neutral (1)', 'positive (2)']
-                    try:
-                        report_text = classification_report(true_labels, pred_labels, labels=[0, 1, 2], target_names=target_names, zero_division=0)
-                        mprint(report_text)
-                    except Exception as e:
-                        mprint(f"   ⚠️ Could not compute classification report: {e}")
 
-                    mprint("\n🔢 Confusion Matrix:")
-                    cm = confusion_matrix(true_labels, pred_labels, labels=[0, 1, 2])
+SENTIMENT_CODES = {'negative': 0, 'neutral': 1, 'positive': 2}
+LABEL_COLUMNS = ('RDuygu', 'Rkategori', 'topic', 'Tduygu', 'Tkategori')
 
-                    # Confusion matrix'i güzel formatta yazdır
-                    mprint(f"{'':15} {'Pred-0':>10} {'Pred-1':>10} {'Pred-2':>10}")
-                    labels_text = ['True-0 (neg)', 'True-1 (neu)', 'True-2 (pos)']
-                    for i, label in enumerate(labels_text):
-                        row_str = f"{label:15}"
-                        for j in range(3):
-                            row_str += f"{cm[i][j]:>10}"
-                        mprint(row_str)
 
-                except ImportError:
-                    mprint("\n   💡 Tip: Install scikit-learn for detailed metrics:")
-                    mprint("      pip install scikit-learn")
-                
-                # Kategori doğruluğu (Rkategori vs Tkategori)
-                mprint("\n   === CATEGORY ACCURACY ===")
-                valid_cat_mask = (df_sampled['Tkategori'] != '') & (df_sampled['Rkategori'] != '')
-                valid_cat_df = df_sampled[valid_cat_mask].copy()
-                
-                if len(valid_cat_df) > 0:
-                    def _normalize(label: object) -> str:
-                        text = str(label).strip().lower().replace('’', "'").replace('‘', "'")
-                        text = unicodedata.normalize('NFKD', text)
-                        return text.encode('ascii', 'ignore').decode()
-
-                    valid_cat_df['Rkategori_norm'] = valid_cat_df['Rkategori'].apply(_normalize)
-                    valid_cat_df['Tkategori_norm'] = valid_cat_df['Tkategori'].apply(_normalize)
-
-                    true_cat = valid_cat_df['Rkategori_norm']
-                    pred_cat = valid_cat_df['Tkategori_norm']
-                    
-                    cat_correct = (true_cat == pred_cat).sum()
-                    cat_total = len(valid_cat_df)
-                    cat_accuracy = cat_correct / cat_total
-                    
-                    mprint(f"   Total samples: {cat_total}")
-                    mprint(f"   Correct predictions: {cat_correct}")
-                    mprint(f"   Category Accuracy: {cat_accuracy:.2%}")
-                    
-                    try:
-                        from sklearn.metrics import classification_report
-                        mprint("\n📈 Category Classification Report:")
-                        try:
-                            cat_report_text = classification_report(true_cat, pred_cat, zero_division=0)
-                            mprint(cat_report_text)
-                        except Exception as e:
-                            mprint(f"   ⚠️ Could not compute category classification report: {e}")
-                    except ImportError:
-                        pass
-                
-            else:
-                mprint("   ⚠️ No valid RDuygu labels found after normalization")
-        else:
-            mprint("   ⚠️ No valid samples found (both RDuygu and Tduygu must be non-empty)")
-        
-        # Metrikleri dosyaya kaydet
-        base, ext = os.path.splitext(output_file)
-        metrics_file = f"{base}_metrics.txt"
+def _analyze_texts(runner, texts: list, batch_rows: int, per_call_timeout: int, latency: LatencyStats) -> list:
+    """Metinleri batch_rows'luk batch'lerle analiz et; başarısız satırlar için None (giriş sırasıyla)."""
+    batches = [texts[i:i + batch_rows] for i in range(0, len(texts), batch_rows)]
+    # Worker modunda parçanın tüm batch'leri aynı anda havuza gönderilir
+    pool = runner if isinstance(runner, InferenceWorkerPool) else None
+    futures = [pool.submit('analyze_combined_batch', b, analysis='combined') for b in batches] if pool else None
+    results = []
+    for i, batch in enumerate(batches):
+        timeout = per_call_timeout * len(batch)
         try:
-            with open(metrics_file, 'w', encoding='utf-8') as f:
-                f.write("\n".join(metrics_lines) + "\n")
-            print(f"\n📝 Metrics saved to: {metrics_file}")
+            if futures is not None:
+                results.extend(pool.wait(futures[i], timeout=timeout))
+                latency.record(futures[i].run_sec, len(batch))
+            else:
+                results.extend(_timed_call(runner, latency, 'analyze_combined_batch', batch, timeout, len(batch)))
         except Exception as e:
-            print(f"\n⚠️ Could not save metrics file: {e}")
+            # Batch hatası / zaman aşımı: satır satır (entry başına zaman aşımıyla) tekrar dene,
+            # hatayı sadece ilgili satıra yaz
+            if isinstance(e, TimeoutError):
+                print(f"   ⏳ {e} — retrying row by row")
+                latency.record_timeout(0)  # entry'ler satır satır denemede sayılır
+            else:
+                print(f"   Batch error: {e} — retrying row by row")
+            for text in batch:
+                try:
+                    results.append(_timed_call(runner, latency, 'analyze_combined', text, per_call_timeout))
+                except TimeoutError as e_row:
+                    print(f"   Row error: {e_row}")
+                    latency.record_timeout()
+                    results.append(None)
+                except Exception as e_row:
+                    print(f"   Row error: {e_row}")
+                    results.append(None)
+    return results
 
-        print(f"\n✅ Analysis complete! Results saved to: {output_file}")
-        
+
+def analyze_stream(input_file, sink_path, required_cols=('body', 'RDuygu', 'Rkategori'), chunk_rows=1000, workers=1,
+                   isolate=False):
+    """
+    Girdiyi (CSV / JSONL / Parquet / xlsx) chunk_rows satırlık parçalar halinde okuyup analiz et ve
+    tahminleri (Tduygu, Tkategori) parça parça JSONL / Parquet sink'e ekle. Metinler bellekte tutulmaz.
+
+    Returns:
+        pd.DataFrame: Metrikler için sadece etiket / tahmin sütunları (başarısız satırlarda '')
+    """
+    per_call_timeout = _env_int('NLP_TIMEOUT_SEC', 45)
+    batch_rows = max(1, _env_int('NLP_BATCH_SIZE', 16))
+    print(f"   Chunk: {chunk_rows} rows, batch size: {batch_rows} rows, per-entry timeout: {per_call_timeout}s")
+
+    _, runner = _init_runner(workers, isolate)
+    latency = LatencyStats()
+
+    label_frames = []
+    read_rows = 0
+    started = time.time()
+    print(f"\n🔬 Streaming {input_file} -> {sink_path}")
+    try:
+        with open_sink(sink_path) as sink:
+            for chunk in iter_chunks(input_file, chunk_rows):
+                read_rows += len(chunk)
+                missing = [c for c in required_cols if c not in chunk.columns]
+                if missing:
+                    raise ValueError(f"Required columns not found: {missing} (columns: {list(chunk.columns)})")
+                mask = pd.Series(True, index=chunk.index)
+                for col in required_cols:
+                    mask &= chunk[col].notna() & (chunk[col].astype(str).str.strip() != '')
+                chunk = chunk[mask].copy()
+                if chunk.empty:
+                    continue
+
+                results = _analyze_texts(runner, chunk['body'].astype(str).tolist(), batch_rows, per_call_timeout,
+                                         latency)
+                chunk['Tduygu'] = pd.array(
+                    [SENTIMENT_CODES.get(r['sentiment']['sentiment'], 1) if r else None for r in results],
+                    dtype='Int64'
+                )
+                chunk['Tkategori'] = [r['theme']['main_topic'] if r else None for r in results]
+                if 'Rkategori' in chunk.columns:
+                    chunk['topic'] = chunk['Rkategori']
+                sink.write(chunk)
+
+                labels = chunk[[c for c in LABEL_COLUMNS if c in chunk.columns]].copy()
+                labels['Tduygu'] = labels['Tduygu'].astype(object).where(labels['Tduygu'].notna(), '')
+                labels['Tkategori'] = labels['Tkategori'].fillna('')
+                label_frames.append(labels)
+                rate = sink.rows / max(time.time() - started, 1e-6)
+                print(f"   Progress: {sink.rows} analyzed / {read_rows} read ({rate:.1f} entries/s)", flush=True)
+        print(f"\n   ✅ Analysis completed: {sum(len(f) for f in label_frames)} entries written to {sink_path}")
+        _print_latency(latency, runner)
+    finally:
+        runner.close()
+
+    if not label_frames:
+        return pd.DataFrame(columns=[c for c in LABEL_COLUMNS])
+    return pd.concat(label_frames)
+
+
+def analyze_test_data_stream(input_file, output_file, chunk_rows=1000, excel_output=None, workers=1, isolate=False):
+    """
+    analyze_test_data'nın akış modu: örnekleme yapılmaz, tüm geçerli satırlar işlenir.
+    output_file .jsonl / .parquet değilse aynı isimle .jsonl'e yazılır; excel_output verilirse
+    sonuç en sonda Excel'e aktarılır.
+    """
+    print(f"📖 Streaming file: {input_file}")
+    try:
+        sink_path = output_file
+        if os.path.splitext(output_file)[1].lower() not in SINK_FORMATS:
+            sink_path = os.path.splitext(output_file)[0] + '.jsonl'
+        labels = analyze_stream(input_file, sink_path, chunk_rows=chunk_rows, workers=workers, isolate=isolate)
+        write_metrics_report(labels, sink_path)
+        if excel_output:
+            print(f"\n💾 Exporting {sink_path} -> {excel_output}")
+            rows = export_excel(sink_path, excel_output)
+            print(f"   {rows} rows written")
+        print(f"\n✅ Analysis complete! Results saved to: {sink_path}")
     except FileNotFoundError:
         print(f"❌ File not found: {input_file}")
-        print("   Please make sure the file exists in the current directory.")
     except Exception as e:
         print(f"❌ Error: {e}")
         import traceback
@@ -382,18 +736,38 @@ def analyze_test_data(input_file='TestVeri_Duygulu.xlsx', output_file='TestVeri_
 
 if __name__ == "__main__":
     # Komut satırından dosya adı ve örnek sayısı alınabilir
-    input_file = sys.argv[1] if len(sys.argv) > 1 else 'TestVeri_Duygulu.xlsx'
-    output_file = sys.argv[2] if len(sys.argv) > 2 else 'TestVeri_Duygulu_Analyzed.xlsx'
-    if len(sys.argv) > 3:
-        arg = sys.argv[3].strip().lower()
-        if arg in ('all', 'none', '0'):
-            samples = None
-        else:
+    parser = argparse.ArgumentParser(description="Excel'deki entry'ler için duygu + tema tahmini ve doğruluk raporu")
+    parser.add_argument('input_file', nargs='?', default='TestVeri_Duygulu.xlsx')
+    parser.add_argument('output_file', nargs='?', default='TestVeri_Duygulu_Analyzed.xlsx')
+    parser.add_argument('samples', nargs='?', default=None,
+                        help="Kategori başına örnek sayısı ('all', 'none' veya 0: tüm satırlar)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Satırları bu kadar worker sürecine dağıt (her biri kendi modelini yükler)')
+    parser.add_argument('--isolate', action='store_true',
+                        help='Tek worker ile de analizi ayrı süreçte çalıştır; zaman aşımında süreç yeniden başlatılır')
+    parser.add_argument('--dump-probs', metavar='PATH',
+                        help='Cümle bazlı olasılık matrisini .npz olarak kaydet (rescore_sentiment.py için)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Checkpoint günlüğünde tamamlanmış satırları atla (CHECKPOINT_PATH)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Girdiyi (csv/jsonl/parquet/xlsx) parça parça oku, tahminleri .jsonl/.parquet çıktıya ekle')
+    parser.add_argument('--chunk-rows', type=int, default=1000, help='Akış modunda parça başına satır')
+    parser.add_argument('--excel-export', metavar='PATH', help='Akış modunda sonucu en sonda Excel\'e de aktar')
+    args = parser.parse_args()
+
+    if args.stream:
+        sampling = args.samples is not None and args.samples.strip().lower() not in ('all', 'none', '0')
+        if sampling or args.dump_probs or args.resume:
+            parser.error('--stream does not support per-category sampling, --dump-probs or --resume')
+        analyze_test_data_stream(args.input_file, args.output_file, args.chunk_rows, args.excel_export, args.workers,
+                                 args.isolate)
+    else:
+        samples = None
+        if args.samples is not None and args.samples.strip().lower() not in ('all', 'none', '0'):
             try:
-                samples = int(arg)
+                samples = int(args.samples)
             except Exception:
                 samples = None
-    else:
-        samples = None
-    
-    analyze_test_data(input_file, output_file, samples)
+
+        analyze_test_data(args.input_file, args.output_file, samples, dump_probs=args.dump_probs,
+                          workers=args.workers, resume=args.resume, isolate=args.isolate)
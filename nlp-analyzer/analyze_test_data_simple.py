@@ -3,8 +3,8 @@ Sadece duygu analizi için basitleştirilmiş script
 Rkategori olmadan çalışır
 """
 
+import argparse
 import os
-import sys
 import unicodedata
 import pandas as pd
 from dotenv import load_dotenv
@@ -15,6 +15,94 @@ load_dotenv()
 # NLP servisini import et
 from services.nlp_service import NLPService
 
+def print_summary(df_clean):
+    """RDuygu / Tduygu / Tkategori dağılımları ile duygu ve (varsa Rkategori) kategori doğruluğunu yazdır."""
+    # Özet
+    print("\n📊 Summary:")
+    print("\n   RDuygu Distribution:")
+    rduygu_counts = df_clean['RDuygu'].value_counts()
+    for val, count in rduygu_counts.items():
+        print(f"      {val}: {count}")
+
+    print("\n   Tduygu Distribution:")
+    tduygu_counts = df_clean['Tduygu'].value_counts()
+    labels = {0: 'negative', 1: 'neutral', 2: 'positive'}
+    for val, count in tduygu_counts.items():
+        if val != '':
+            print(f"      {val} ({labels.get(val, 'unknown')}): {count}")
+
+    print("\n   Tkategori Distribution:")
+    tkat_counts = df_clean['Tkategori'].value_counts().head(7)
+    for cat, count in tkat_counts.items():
+        print(f"      {cat}: {count}")
+
+    # Accuracy
+    print("\n🎯 Sentiment Accuracy:")
+    valid = df_clean[df_clean['Tduygu'] != ''].copy()
+
+    if len(valid) > 0:
+        correct = (valid['RDuygu'] == valid['Tduygu']).sum()
+        total = len(valid)
+        accuracy = correct / total
+
+        print(f"   Total: {total}")
+        print(f"   Correct: {correct}")
+        print(f"   Accuracy: {accuracy:.2%}")
+
+        try:
+            from sklearn.metrics import classification_report, confusion_matrix
+
+            print("\n📈 Classification Report:")
+            target_names = ['negative (0)', 'neutral (1)', 'positive (2)']
+            print(classification_report(valid['RDuygu'], valid['Tduygu'], 
+                                       target_names=target_names, zero_division=0))
+
+            print("\n🔢 Confusion Matrix:")
+            cm = confusion_matrix(valid['RDuygu'], valid['Tduygu'], labels=[0, 1, 2])
+
+            print(f"{'':15} {'Pred-0':>10} {'Pred-1':>10} {'Pred-2':>10}")
+            labels_text = ['True-0 (neg)', 'True-1 (neu)', 'True-2 (pos)']
+            for i, label in enumerate(labels_text):
+                print(f"{label:15}", end='')
+                for j in range(3):
+                    print(f"{cm[i][j]:>10}", end='')
+                print()
+
+        except ImportError:
+            print("   💡 Install scikit-learn: pip install scikit-learn")
+
+    print("\n🎯 Category Accuracy:")
+    if 'Rkategori' in df_clean.columns:
+        valid_cat = df_clean[(df_clean['Tkategori'] != '') & (df_clean['Rkategori'].notna()) & (df_clean['Rkategori'] != '')].copy()
+        if len(valid_cat) > 0:
+            def _normalize(label: object) -> str:
+                text = str(label).strip().lower().replace('’', "'").replace('‘', "'")
+                text = unicodedata.normalize('NFKD', text)
+                return text.encode('ascii', 'ignore').decode()
+
+            valid_cat['Rkategori_norm'] = valid_cat['Rkategori'].apply(_normalize)
+            valid_cat['Tkategori_norm'] = valid_cat['Tkategori'].apply(_normalize)
+
+            cat_correct = (valid_cat['Rkategori_norm'] == valid_cat['Tkategori_norm']).sum()
+            cat_total = len(valid_cat)
+            cat_accuracy = cat_correct / cat_total
+
+            print(f"   Total: {cat_total}")
+            print(f"   Correct: {cat_correct}")
+            print(f"   Accuracy: {cat_accuracy:.2%}")
+
+            try:
+                from sklearn.metrics import classification_report
+                print("\n📈 Category Classification Report:")
+                print(classification_report(valid_cat['Rkategori_norm'], valid_cat['Tkategori_norm'], zero_division=0))
+            except ImportError:
+                print("   💡 Install scikit-learn: pip install scikit-learn")
+        else:
+            print("   ⚠️ No valid category labels to compare")
+    else:
+        print("   ⚠️ Rkategori column not found; skipping category accuracy")
+
+
 def analyze_test_data_simple(input_file='test2.xlsx', output_file='Sonuc.xlsx'):
     """
     Excel dosyasındaki entry'leri okuyup sadece duygu analizi yap
@@ -100,91 +188,8 @@ def analyze_test_data_simple(input_file='test2.xlsx', output_file='Sonuc.xlsx'):
         print(f"\n💾 Saving results to: {output_file}")
         df_clean.to_excel(output_file, index=False)
         
-        # Özet
-        print("\n📊 Summary:")
-        print("\n   RDuygu Distribution:")
-        rduygu_counts = df_clean['RDuygu'].value_counts()
-        for val, count in rduygu_counts.items():
-            print(f"      {val}: {count}")
-        
-        print("\n   Tduygu Distribution:")
-        tduygu_counts = df_clean['Tduygu'].value_counts()
-        labels = {0: 'negative', 1: 'neutral', 2: 'positive'}
-        for val, count in tduygu_counts.items():
-            if val != '':
-                print(f"      {val} ({labels.get(val, 'unknown')}): {count}")
-        
-        print("\n   Tkategori Distribution:")
-        tkat_counts = df_clean['Tkategori'].value_counts().head(7)
-        for cat, count in tkat_counts.items():
-            print(f"      {cat}: {count}")
-        
-        # Accuracy
-        print("\n🎯 Sentiment Accuracy:")
-        valid = df_clean[df_clean['Tduygu'] != ''].copy()
-        
-        if len(valid) > 0:
-            correct = (valid['RDuygu'] == valid['Tduygu']).sum()
-            total = len(valid)
-            accuracy = correct / total
-            
-            print(f"   Total: {total}")
-            print(f"   Correct: {correct}")
-            print(f"   Accuracy: {accuracy:.2%}")
-            
-            try:
-                from sklearn.metrics import classification_report, confusion_matrix
-                
-                print("\n📈 Classification Report:")
-                target_names = ['negative (0)', 'neutral (1)', 'positive (2)']
-                print(classification_report(valid['RDuygu'], valid['Tduygu'], 
-                                           target_names=target_names, zero_division=0))
-                
-                print("\n🔢 Confusion Matrix:")
-                cm = confusion_matrix(valid['RDuygu'], valid['Tduygu'], labels=[0, 1, 2])
-                
-                print(f"{'':15} {'Pred-0':>10} {'Pred-1':>10} {'Pred-2':>10}")
-                labels_text = ['True-0 (neg)', 'True-1 (neu)', 'True-2 (pos)']
-                for i, label in enumerate(labels_text):
-                    print(f"{label:15}", end='')
-                    for j in range(3):
-                        print(f"{cm[i][j]:>10}", end='')
-                    print()
-                
-            except ImportError:
-                print("   💡 Install scikit-learn: pip install scikit-learn")
+        print_summary(df_clean)
 
-        print("\n🎯 Category Accuracy:")
-        if 'Rkategori' in df_clean.columns:
-            valid_cat = df_clean[(df_clean['Tkategori'] != '') & (df_clean['Rkategori'].notna()) & (df_clean['Rkategori'] != '')].copy()
-            if len(valid_cat) > 0:
-                def _normalize(label: object) -> str:
-                    text = str(label).strip().lower().replace('’', "'").replace('‘', "'")
-                    text = unicodedata.normalize('NFKD', text)
-                    return text.encode('ascii', 'ignore').decode()
-
-                valid_cat['Rkategori_norm'] = valid_cat['Rkategori'].apply(_normalize)
-                valid_cat['Tkategori_norm'] = valid_cat['Tkategori'].apply(_normalize)
-
-                cat_correct = (valid_cat['Rkategori_norm'] == valid_cat['Tkategori_norm']).sum()
-                cat_total = len(valid_cat)
-                cat_accuracy = cat_correct / cat_total
-
-                print(f"   Total: {cat_total}")
-                print(f"   Correct: {cat_correct}")
-                print(f"   Accuracy: {cat_accuracy:.2%}")
-
-                try:
-                    from sklearn.metrics import classification_report
-                    print("\n📈 Category Classification Report:")
-                    print(classification_report(valid_cat['Rkategori_norm'], valid_cat['Tkategori_norm'], zero_division=0))
-                except ImportError:
-                    print("   💡 Install scikit-learn: pip install scikit-learn")
-            else:
-                print("   ⚠️ No valid category labels to compare")
-        else:
-            print("   ⚠️ Rkategori column not found; skipping category accuracy")
-        
         print(f"\n✅ Complete! Results saved to: {output_file}")
         
     except Exception as e:
@@ -193,8 +198,42 @@ def analyze_test_data_simple(input_file='test2.xlsx', output_file='Sonuc.xlsx'):
         traceback.print_exc()
 
 
+def analyze_test_data_simple_stream(input_file, output_file, chunk_rows=1000, excel_output=None):
+    """
+    Akış modu: girdi (csv/jsonl/parquet/xlsx) parça parça okunur, tahminler .jsonl/.parquet çıktıya eklenir.
+    output_file .jsonl / .parquet değilse aynı isimle .jsonl'e yazılır.
+    """
+    from analyze_test_data import analyze_stream
+    from services.dataset_io import SINK_FORMATS, export_excel
+
+    print(f"📖 Streaming file: {input_file}")
+    try:
+        sink_path = output_file
+        if os.path.splitext(output_file)[1].lower() not in SINK_FORMATS:
+            sink_path = os.path.splitext(output_file)[0] + '.jsonl'
+        labels = analyze_stream(input_file, sink_path, required_cols=('body', 'RDuygu'), chunk_rows=chunk_rows)
+        print_summary(labels)
+        if excel_output:
+            print(f"\n💾 Exporting {sink_path} -> {excel_output}")
+            print(f"   {export_excel(sink_path, excel_output)} rows written")
+        print(f"\n✅ Complete! Results saved to: {sink_path}")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+
+
 if __name__ == "__main__":
-    input_file = sys.argv[1] if len(sys.argv) > 1 else 'test2.xlsx'
-    output_file = sys.argv[2] if len(sys.argv) > 2 else 'Sonuc.xlsx'
-    
-    analyze_test_data_simple(input_file, output_file)
+    parser = argparse.ArgumentParser(description="Excel'deki entry'ler için duygu (+ tema) tahmini")
+    parser.add_argument('input_file', nargs='?', default='test2.xlsx')
+    parser.add_argument('output_file', nargs='?', default='Sonuc.xlsx')
+    parser.add_argument('--stream', action='store_true',
+                        help='Girdiyi (csv/jsonl/parquet/xlsx) parça parça oku, tahminleri .jsonl/.parquet çıktıya ekle')
+    parser.add_argument('--chunk-rows', type=int, default=1000, help='Akış modunda parça başına satır')
+    parser.add_argument('--excel-export', metavar='PATH', help='Akış modunda sonucu en sonda Excel\'e de aktar')
+    args = parser.parse_args()
+
+    if args.stream:
+        analyze_test_data_simple_stream(args.input_file, args.output_file, args.chunk_rows, args.excel_export)
+    else:
+        analyze_test_data_simple(args.input_file, args.output_file)
@@ -3,14 +3,19 @@ Eksi Sozluk NLP Analiz Uygulamasi - Flask backend API
 """
 
 import os
+import time
 from dotenv import load_dotenv
 import logging
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, g, render_template, request, jsonify
 from flask_cors import CORS
 from werkzeug.middleware.proxy_fix import ProxyFix
 
 from services.nlp_service import NLPService
 from services.eksisozluk_service import EksiSozlukService
+from services.micro_batcher import MicroBatcher
+from services.inference_workers import InferenceWorkerPool
+from services.metrics import CONTENT_TYPE, REGISTRY, SIZE_BUCKETS, Counter, Histogram, merge_families, render
+from services import tracing
 
 load_dotenv()  # .env dosyasını yükle
 
@@ -26,15 +31,74 @@ logging.basicConfig(
 logger = logging.getLogger("nlp-analyzer")
 
 # Services
-nlp_service = NLPService()
+# Modeller arka planda yüklenir: Flask portu hemen açar, arama/başlık uçları beklemeden çalışır.
+# Analiz uçları ilgili model hazır olana kadar 503 + Retry-After döner (bkz. /api/ready).
+# NLP_WORKERS > 0 ise modeller ayrı inference süreçlerinde çalışır; Flask thread'leri sadece metin iletir.
+NLP_WORKERS = int(os.getenv('NLP_WORKERS', '0'))
+if NLP_WORKERS > 0:
+    nlp_service = InferenceWorkerPool(NLP_WORKERS)
+else:
+    nlp_service = NLPService(load=False)
 eksi_service = EksiSozlukService()
 
-logger.info("✅ NLP service loaded successfully")
+RETRY_AFTER_SEC = int(os.getenv('NLP_RETRY_AFTER_SEC', '10'))
+if os.getenv('NLP_BACKGROUND_LOAD', 'true').lower() in ('1', 'true', 'yes'):
+    nlp_service.start_background_load()
+    logger.info("⏳ NLP models are loading in the background")
+else:
+    nlp_service.load()
+    logger.info("✅ NLP service loaded successfully")
+
+# Mikro-batching: eşzamanlı tekil istekler kısa bir pencerede toplanıp tek forward pass'te çalışır
+# Worker havuzunda her worker'a aynı anda bir batch gidebilsin diye dağıtıcı thread sayısı worker sayısı kadardır
+MICROBATCH_ENABLED = os.getenv('MICROBATCH_ENABLE', 'true').lower() in ('1', 'true', 'yes')
+BATCH_CONCURRENCY = max(1, NLP_WORKERS)
+sentiment_batcher = MicroBatcher(nlp_service.analyze_sentiment_batch, name='sentiment', concurrency=BATCH_CONCURRENCY)
+theme_batcher = MicroBatcher(nlp_service.analyze_theme_batch, name='theme', concurrency=BATCH_CONCURRENCY)
+combined_batcher = MicroBatcher(nlp_service.analyze_combined_batch, name='combined', concurrency=BATCH_CONCURRENCY)
 
 # Configuration
 app.config['JSON_AS_ASCII'] = False
 app.config['JSONIFY_PRETTYPRINT_REGULAR'] = True
 
+# Metrikler (bkz. /api/metrics): route etiketi URL kuralıdır ('/api/topic/<slug>'), ham yol değil
+HTTP_REQUEST_SECONDS = Histogram('http_request_duration_seconds', 'HTTP istek süresi', ('method', 'route'))
+HTTP_REQUESTS = Counter('http_requests_total', 'HTTP istekleri', ('method', 'route', 'status'))
+API_BATCH_ENTRIES = Histogram('api_batch_entries', '/api/analyze/batch isteği başına analiz edilen entry sayısı',
+                              buckets=SIZE_BUCKETS)
+
+
+# İstek izleme: X-Request-ID gelirse kullanılır, yoksa üretilir; SLOW_REQUEST_MS'i aşan istekler span dökümüyle loglanır
+SLOW_REQUEST_MS = tracing.slow_request_ms_from_env()
+
+
+@app.before_request
+def _start_request_timer():
+    g.request_started = time.perf_counter()
+    request_id = tracing.new_request_id(request.headers.get(tracing.REQUEST_ID_HEADER))
+    g.trace, g.trace_token = tracing.start(request_id, f"{request.method} {request.path}")
+
+
+@app.after_request
+def _record_request_metrics(response):
+    started = g.get('request_started')
+    route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    if started is not None:
+        HTTP_REQUEST_SECONDS.labels(request.method, route).observe(time.perf_counter() - started)
+        HTTP_REQUESTS.labels(request.method, route, str(response.status_code)).inc()
+    trace = g.get('trace')
+    if trace is not None:
+        response.headers[tracing.REQUEST_ID_HEADER] = trace.request_id
+        tracing.log_if_slow(trace, SLOW_REQUEST_MS, route=route, status=response.status_code)
+    return response
+
+
+@app.teardown_request
+def _finish_trace(exc):
+    token = g.pop('trace_token', None)
+    if token is not None:
+        tracing.finish(token)
+
 
 @app.route('/')
 def index():
@@ -94,6 +158,50 @@ def get_topic_entries(slug):
         return jsonify({'success': False, 'error': 'Başlık entryleri alınırken hata oluştu'}), 500
 
 
+def _sentiment_payload(result, entry_id):
+    """Build the sentiment response body shared by single and combined endpoints."""
+    return {
+        'entry_id': entry_id,
+        'sentiment': result['sentiment'],
+        'label': result.get('label', result['sentiment']),
+        'score': result['score'],
+        'confidence': result['confidence'],
+        'model': 'nlp_service'
+    }
+
+
+def _theme_payload(result, entry_id):
+    """Build the theme response body shared by single and combined endpoints."""
+    return {
+        'entry_id': entry_id,
+        'themes': result['themes'],
+        'keywords': result['keywords'],
+        'main_topic': result['main_topic'],
+        'scores': result.get('scores', {}),
+        'is_ambiguous': result.get('is_ambiguous', False),
+        'label': result['main_topic'],  # Frontend için
+        'model': 'nlp_service'
+    }
+
+
+def _not_ready_response(analysis):
+    """Return a 503 response while the models needed for `analysis` are not ready, else None."""
+    if nlp_service.is_ready(analysis):
+        return None
+    state = nlp_service.readiness()
+    if state['status'] == 'failed':
+        response = jsonify({'success': False, 'error': 'NLP modelleri yüklenemedi', 'status': state['status']})
+    else:
+        response = jsonify({
+            'success': False,
+            'error': 'NLP modelleri yükleniyor, lütfen biraz sonra tekrar deneyin',
+            'status': state['status']
+        })
+        response.headers['Retry-After'] = str(RETRY_AFTER_SEC)
+    response.status_code = 503
+    return response
+
+
 @app.route('/api/analyze/sentiment', methods=['POST'])
 def analyze_sentiment():
     """Run sentiment analysis for a single text."""
@@ -108,22 +216,19 @@ def analyze_sentiment():
     if len(text) > 5000:
         return jsonify({'success': False, 'error': 'Metin çok uzun (maksimum 5000 karakter)'}), 400
 
+    not_ready = _not_ready_response('sentiment')
+    if not_ready:
+        return not_ready
+
     try:
         text = text
         entry_id = data.get('entry_id')
 
-        result = nlp_service.analyze_sentiment(text)
-        return jsonify({
-            'success': True,
-            'data': {
-                'entry_id': entry_id,
-                'sentiment': result['sentiment'],
-                'label': result.get('label', result['sentiment']),
-                'score': result['score'],
-                'confidence': result['confidence'],
-                'model': 'nlp_service'
-            }
-        })
+        if MICROBATCH_ENABLED:
+            result = sentiment_batcher(text)
+        else:
+            result = nlp_service.analyze_sentiment(text)
+        return jsonify({'success': True, 'data': _sentiment_payload(result, entry_id)})
     except Exception as e:
         logger.exception("Sentiment analysis error")
         return jsonify({'success': False, 'error': 'Duygu analizi sırasında hata oluştu'}), 500
@@ -143,27 +248,60 @@ def analyze_theme():
     if len(text) > 5000:
         return jsonify({'success': False, 'error': 'Metin çok uzun (maksimum 5000 karakter)'}), 400
 
+    not_ready = _not_ready_response('theme')
+    if not_ready:
+        return not_ready
+
     try:
         text = text
         entry_id = data.get('entry_id')
 
-        result = nlp_service.analyze_theme(text)
+        if MICROBATCH_ENABLED:
+            result = theme_batcher(text)
+        else:
+            result = nlp_service.analyze_theme(text)
+        return jsonify({'success': True, 'data': _theme_payload(result, entry_id)})
+    except Exception as e:
+        logger.exception("Theme analysis error")
+        return jsonify({'success': False, 'error': 'Tema analizi sırasında hata oluştu'}), 500
+
+
+@app.route('/api/analyze/combined', methods=['POST'])
+def analyze_combined():
+    """Run sentiment and theme analysis for a single text in one round trip."""
+    data = request.get_json()
+
+    if not data or 'text' not in data:
+        return jsonify({'success': False, 'error': 'Metin gereklidir'}), 400
+
+    text = str(data.get('text', '')).strip()
+    if len(text) < 3:
+        return jsonify({'success': False, 'error': 'Metin en az 3 karakter olmalıdır'}), 400
+    if len(text) > 5000:
+        return jsonify({'success': False, 'error': 'Metin çok uzun (maksimum 5000 karakter)'}), 400
+
+    not_ready = _not_ready_response('combined')
+    if not_ready:
+        return not_ready
+
+    try:
+        entry_id = data.get('entry_id')
+
+        if MICROBATCH_ENABLED:
+            result = combined_batcher(text)
+        else:
+            result = nlp_service.analyze_combined(text)
         return jsonify({
             'success': True,
             'data': {
                 'entry_id': entry_id,
-                'themes': result['themes'],
-                'keywords': result['keywords'],
-                'main_topic': result['main_topic'],
-                'scores': result.get('scores', {}),
-                'is_ambiguous': result.get('is_ambiguous', False),
-                'label': result['main_topic'],  # Frontend için
-                'model': 'nlp_service'
+                'sentiment': _sentiment_payload(result['sentiment'], entry_id),
+                'theme': _theme_payload(result['theme'], entry_id)
             }
         })
     except Exception as e:
-        logger.exception("Theme analysis error")
-        return jsonify({'success': False, 'error': 'Tema analizi sırasında hata oluştu'}), 500
+        logger.exception("Combined analysis error")
+        return jsonify({'success': False, 'error': 'Analiz sırasında hata oluştu'}), 500
 
 
 @app.route('/api/analyze/batch', methods=['POST'])
@@ -174,6 +312,10 @@ def analyze_batch():
     if not data or 'entries' not in data or not isinstance(data['entries'], list):
         return jsonify({'success': False, 'error': 'Entries listesi gereklidir'}), 400
 
+    not_ready = _not_ready_response('combined')
+    if not_ready:
+        return not_ready
+
     try:
         entries = data['entries']
 
@@ -191,16 +333,12 @@ def analyze_batch():
                 continue
             texts.append(text)
             ids.append(entry.get('id'))
+        API_BATCH_ENTRIES.observe(len(texts))
 
-        try:
-            sentiment_results = [nlp_service.analyze_sentiment(t) for t in texts]
-            theme_results = [nlp_service.analyze_theme(t) for t in texts]
-        except Exception:
-            sentiment_results = []
-            theme_results = []
-            for t in texts:
-                sentiment_results.append(nlp_service.analyze_sentiment(t))
-                theme_results.append(nlp_service.analyze_theme(t))
+        # Ön işleme metin başına bir kez yapılır, iki model de aynı hazırlığı kullanır
+        combined_results = nlp_service.analyze_combined_batch(texts)
+        sentiment_results = [r['sentiment'] for r in combined_results]
+        theme_results = [r['theme'] for r in combined_results]
 
             # Count sentiments
         for s in sentiment_results:
@@ -247,12 +385,44 @@ def get_stats():
             'version': '1.0.0',
             'services': {
                 'eksi_api': eksi_service.check_status(),
-                'nlp_service': 'ready'
-            }
+                'nlp_service': nlp_service.readiness()
+            },
+            'batching': {
+                'enabled': MICROBATCH_ENABLED,
+                'sentiment': sentiment_batcher.stats(),
+                'theme': theme_batcher.stats(),
+                'combined': combined_batcher.stats()
+            },
+            'cache': nlp_service.cache_stats(),
+            'stages': nlp_service.stage_timings()
         }
     })
 
 
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus text exposition of request, batching, NLP stage, cache and upstream API metrics."""
+    if NLP_WORKERS > 0:
+        # NLP metrikleri worker süreçlerinde tutulur; worker etiketiyle birleştirilir
+        families = merge_families(REGISTRY.collect(), nlp_service.metrics_snapshot())
+    else:
+        families = REGISTRY.collect() + nlp_service.cache_metrics()
+    return Response(render(families), content_type=CONTENT_TYPE)
+
+
+@app.route('/api/ready', methods=['GET'])
+def get_readiness():
+    """Readiness probe: 200 once every NLP model is loaded, 503 while loading or after a failure."""
+    state = nlp_service.readiness()
+    ready = state['status'] == 'ready'
+    response = jsonify({'success': ready, 'data': state})
+    if not ready:
+        response.status_code = 503
+        if state['status'] != 'failed':
+            response.headers['Retry-After'] = str(RETRY_AFTER_SEC)
+    return response
+
+
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors."""
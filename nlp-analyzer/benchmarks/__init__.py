@@ -0,0 +1 @@
+"""Benchmark paketi (python -m benchmarks.<modül> ile çalıştırılır)"""
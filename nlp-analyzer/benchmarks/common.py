@@ -0,0 +1,141 @@
+"""
+Benchmark Yardımcıları
+Repodaki veri setlerinden sabit örnek metinler ve gecikme istatistikleri
+"""
+
+import glob
+import html
+import json
+import os
+import random
+import re
+import sys
+import unicodedata
+from typing import Dict, List, Optional
+
+ANALYZER_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+REPO_ROOT = os.path.abspath(os.path.join(ANALYZER_ROOT, '..'))
+DEFAULT_DATASET_GLOB = os.path.join(REPO_ROOT, 'eksisozluk-api-master', 'eksisozluk_dataset_*.json')
+DEFAULT_LABELED_FILE = os.path.join(ANALYZER_ROOT, 'test2.xlsx')
+
+
+def clean_body(text: str) -> str:
+    """Entry gövdesini EksiSozlukService ile aynı kurallarla düz metne çevir."""
+    text = text.replace('<br>', '\n').replace('<br/>', '\n').replace('<br />', '\n')
+    text = re.sub(r'<[^>]+>', '', text)
+    text = html.unescape(text)
+    text = unicodedata.normalize('NFC', text)
+    text = re.sub(r'\$(\w{1,10})\$', r'\1', text)
+    text = re.sub(r'[\t\r\f]+', ' ', text)
+    return text.strip()
+
+
+def load_sample_texts(limit: Optional[int] = 500, pattern: str = DEFAULT_DATASET_GLOB,
+                      seed: int = 42) -> List[str]:
+    """
+    Toplanmış eksisozluk_dataset_*.json dosyalarından sabit (seed'li) örnek metinler döndür.
+
+    Args:
+        limit (int): En fazla kaç metin (None: hepsi)
+        pattern (str): Dataset dosyaları için glob deseni
+        seed (int): Örnekleme seed'i; aynı seed aynı örnekleri verir
+    """
+    texts = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        entries = data.get('entries', []) if isinstance(data, dict) else data
+        for entry in entries:
+            body = entry.get('body') if isinstance(entry, dict) else entry
+            if isinstance(body, str):
+                body = clean_body(body)
+                if len(body) >= 3:
+                    texts.append(body)
+
+    if not texts:
+        raise FileNotFoundError(f"No dataset entries found for pattern: {pattern}")
+    if limit is not None and limit < len(texts):
+        texts = random.Random(seed).sample(texts, limit)
+    return texts
+
+
+def load_labeled_samples(path: str = DEFAULT_LABELED_FILE, limit: Optional[int] = None):
+    """
+    Etiketli Excel dosyasından (body, RDuygu) çiftlerini döndür.
+
+    Returns:
+        tuple: (texts, labels) - labels 0=negative, 1=neutral, 2=positive
+    """
+    import pandas as pd
+
+    df = pd.read_excel(path)
+    df = df[(df['body'].notna()) & (df['RDuygu'].notna())]
+    df = df[pd.to_numeric(df['RDuygu'], errors='coerce').isin([0, 1, 2])]
+    if limit is not None:
+        df = df.head(limit)
+    return [str(b) for b in df['body']], [int(l) for l in df['RDuygu']]
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Doğrusal enterpolasyonlu yüzdelik (q: 0-100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def summarize_latencies(seconds: List[float]) -> Dict[str, float]:
+    """Saniye cinsinden gecikme listesini ms özetine çevir."""
+    total = sum(seconds)
+    return {
+        'count': len(seconds),
+        'total_s': round(total, 4),
+        'mean_ms': round(total / len(seconds) * 1000, 4) if seconds else 0.0,
+        'p50_ms': round(percentile(seconds, 50) * 1000, 4),
+        'p95_ms': round(percentile(seconds, 95) * 1000, 4),
+        'p99_ms': round(percentile(seconds, 99) * 1000, 4),
+        'per_sec': round(len(seconds) / total, 2) if total > 0 else 0.0,
+    }
+
+
+def rss_mb() -> float:
+    """Sürecin anlık bellek kullanımı (RSS, MB); /proc yoksa psutil, o da yoksa tepe değer."""
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024.0 * 1024.0)
+    except ImportError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024.0 * 1024.0) if sys.platform == 'darwin' else peak / 1024.0
+
+
+def build_service(load: bool = True, **env):
+    """
+    Verilen ortam değişkenleriyle yeni bir NLPService oluştur (örn. NLP_BACKEND='onnx').
+    load=False ile modeller yüklenmeden döner (bileşenler ayrı ayrı yüklenecekse).
+    Ölçüm önbellek isabetleriyle karışmasın diye sonuç ve cümle önbellekleri kapatılır;
+    değişkenler oluşturma sonrası eski haline döndürülür.
+    """
+    from services.nlp_service import NLPService
+
+    env = {'NLP_CACHE_ENABLE': 'false', 'SENTENCE_CACHE_ENABLE': 'false', **env}
+    saved = {k: os.environ.get(k) for k in env}
+    os.environ.update({k: str(v) for k, v in env.items()})
+    try:
+        return NLPService(load=load)
+    finally:
+        for k, v in saved.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
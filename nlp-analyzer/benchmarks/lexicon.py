@@ -0,0 +1,114 @@
+"""
+Duygu Sözlüğü Eşleştirme Benchmark'ı
+Eski terim başına `w in t` taraması ile Aho-Corasick LexiconMatcher'ı, yerleşik sözlüğe korpustan seçilen
+kelime / ikili kelime terimleri eklenerek büyütülen sözlüklerde entry başına süre üzerinden karşılaştırır.
+Eşleşme sayılarının aynı olduğu entry oranı da raporlanır (fark, kelime içi eşleşmelerin artık sayılmamasıdır).
+
+Kullanım:
+    python -m benchmarks.lexicon --limit 500 --sizes 0,1000,5000,20000
+    python -m benchmarks.lexicon --positive pos.txt --negative neg.txt
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+
+from benchmarks.common import load_sample_texts, summarize_latencies
+from services.lexicon import DEFAULT_NEGATIVE, DEFAULT_POSITIVE, LexiconMatcher, load_terms
+
+WORD_RE = re.compile(r"[a-zçğıöşü]{4,}")
+
+
+def legacy_counts(positive, negative, text: str):
+    # NLPService._lexicon_counts'un eski hali
+    t = text.lower()
+    pos = sum(1 for w in positive if w in t)
+    neg = sum(1 for w in negative if w in t)
+    return pos, neg
+
+
+def synthetic_terms(texts: list, size: int, seed: int = 42):
+    """Korpustaki kelime ve ikili kelimelerden size adet terim; yarısı pozitif, yarısı negatif."""
+    words, bigrams = set(), set()
+    for text in texts:
+        tokens = WORD_RE.findall(text.lower())
+        words.update(tokens)
+        bigrams.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    pool = sorted(words) + sorted(bigrams)
+    terms = random.Random(seed).sample(pool, min(size, len(pool)))
+    return set(terms[::2]), set(terms[1::2])
+
+
+def _time_per_entry(fn, texts: list, repeat: int):
+    latencies = []
+    for text in texts:
+        best = None
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn(text)
+            elapsed = time.perf_counter() - t0
+            best = elapsed if best is None else min(best, elapsed)
+        latencies.append(best)
+    return summarize_latencies(latencies)
+
+
+def run_case(name: str, positive: set, negative: set, texts: list, repeat: int) -> dict:
+    t0 = time.perf_counter()
+    matcher = LexiconMatcher(positive, negative)
+    build_ms = (time.perf_counter() - t0) * 1000
+    legacy = _time_per_entry(lambda t: legacy_counts(positive, negative, t), texts, repeat)
+    automaton = _time_per_entry(matcher.counts, texts, repeat)
+    agree = sum(legacy_counts(positive, negative, t) == matcher.counts(t) for t in texts) / len(texts)
+    return {
+        'name': name,
+        'terms': len(matcher.terms),
+        'build_ms': round(build_ms, 2),
+        'legacy': legacy,
+        'automaton': automaton,
+        'speedup': round(legacy['mean_ms'] / automaton['mean_ms'], 2) if automaton['mean_ms'] else 0.0,
+        'agreement': round(agree, 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lexicon scoring time per entry: substring scan vs Aho-Corasick")
+    parser.add_argument('--limit', type=int, default=500, help='Dataset örnek sayısı')
+    parser.add_argument('--repeat', type=int, default=3, help='Entry başına tekrar (en iyisi alınır)')
+    parser.add_argument('--sizes', default='0,1000,5000,20000',
+                        help='Yerleşik sözlüğe eklenecek korpus terimi sayıları (virgülle)')
+    parser.add_argument('--positive', help='Gerçek pozitif sözlük dosyası (satır başına bir terim)')
+    parser.add_argument('--negative', help='Gerçek negatif sözlük dosyası')
+    parser.add_argument('--json', dest='json_path', help='Sonuçları JSON olarak kaydet')
+    args = parser.parse_args()
+
+    texts = load_sample_texts(args.limit)
+    corpus = load_sample_texts(None)
+    print(f"📖 {len(texts)} sample entries, mean {sum(map(len, texts)) / len(texts):.0f} chars")
+
+    results = []
+    for size in (int(s) for s in args.sizes.split(',') if s.strip()):
+        extra_pos, extra_neg = synthetic_terms(corpus, size)
+        results.append(run_case(f"builtin+{size}", DEFAULT_POSITIVE | extra_pos, DEFAULT_NEGATIVE | extra_neg,
+                                texts, args.repeat))
+    if args.positive or args.negative:
+        positive = DEFAULT_POSITIVE | (load_terms(args.positive) if args.positive else set())
+        negative = DEFAULT_NEGATIVE | (load_terms(args.negative) if args.negative else set())
+        results.append(run_case('files', positive, negative, texts, args.repeat))
+
+    print(f"\n📚 Lexicon scoring time per entry")
+    print(f"   {'lexicon':<16} {'terms':>7} {'build ms':>9} {'scan ms':>9} {'automaton ms':>13} "
+          f"{'speedup':>8} {'agree':>7}")
+    for r in results:
+        print(f"   {r['name']:<16} {r['terms']:>7} {r['build_ms']:>9.1f} {r['legacy']['mean_ms']:>9.4f} "
+              f"{r['automaton']['mean_ms']:>13.4f} {r['speedup']:>7.2f}x {r['agreement']:>7.1%}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ Results saved to: {args.json_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+ONNX Backend Parite ve Hız Benchmark'ı
+test2.xlsx üzerinde torch ve ONNX Runtime backend'lerinin duygu / tema etiket uyumunu kontrol eder,
+ardından entry başına gecikme (batch=1) ve toplu işlem hızını karşılaştırır.
+Önce `python export_onnx.py` çalıştırılmış olmalıdır.
+
+Kullanım:
+    python -m benchmarks.onnx_backend --limit 200
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from benchmarks.common import build_service, load_labeled_samples, summarize_latencies
+
+
+def _run(service, texts, batch_size):
+    # Gecikme: entry başına tek çağrı; hız: batch_size'lık toplu çağrılar
+    latencies = []
+    results = []
+    for text in texts:
+        t0 = time.perf_counter()
+        results.append(service.analyze_combined(text))
+        latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    for b in range(0, len(texts), batch_size):
+        service.analyze_combined_batch(texts[b:b + batch_size])
+    batch_elapsed = time.perf_counter() - t0
+    return results, {
+        'single': summarize_latencies(latencies),
+        'batch_size': batch_size,
+        'batch_entries_per_sec': round(len(texts) / batch_elapsed, 2) if batch_elapsed else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Torch vs ONNX Runtime: label parity and latency")
+    parser.add_argument('--limit', type=int, default=None, help='test2.xlsx satır sınırı')
+    parser.add_argument('--batch-size', type=int, default=16)
+    parser.add_argument('--min-agreement', type=float, default=0.99,
+                        help='Bu uyumun altında çıkış kodu 1 olur')
+    parser.add_argument('--json', dest='json_path', help='Sonuçları JSON olarak kaydet')
+    args = parser.parse_args()
+
+    texts, labels = load_labeled_samples(limit=args.limit)
+    print(f"📖 {len(texts)} labeled entries")
+
+    torch_service = build_service(NLP_BACKEND='torch')
+    onnx_service = build_service(NLP_BACKEND='onnx')
+    if onnx_service.backend != 'onnx':
+        print("❌ ONNX models not found, run: python export_onnx.py")
+        sys.exit(1)
+
+    torch_results, torch_perf = _run(torch_service, texts, args.batch_size)
+    onnx_results, onnx_perf = _run(onnx_service, texts, args.batch_size)
+
+    sentiment_map = {'negative': 0, 'neutral': 1, 'positive': 2}
+    sentiment_agree = sum(
+        t['sentiment']['sentiment'] == o['sentiment']['sentiment'] for t, o in zip(torch_results, onnx_results)
+    ) / len(texts)
+    theme_agree = sum(
+        t['theme']['main_topic'] == o['theme']['main_topic'] for t, o in zip(torch_results, onnx_results)
+    ) / len(texts)
+
+    def _accuracy(results):
+        return sum(
+            sentiment_map.get(r['sentiment']['sentiment'], 1) == y for r, y in zip(results, labels)
+        ) / len(labels)
+
+    report = {
+        'entries': len(texts),
+        'agreement': {'sentiment': round(sentiment_agree, 4), 'theme': round(theme_agree, 4)},
+        'sentiment_accuracy': {'torch': round(_accuracy(torch_results), 4),
+                               'onnx': round(_accuracy(onnx_results), 4)},
+        'torch': torch_perf,
+        'onnx': onnx_perf,
+    }
+
+    print("\n🎯 Label agreement (torch vs onnx)")
+    print(f"   Sentiment: {sentiment_agree:.2%}   Theme: {theme_agree:.2%}")
+    print(f"   RDuygu accuracy: torch {report['sentiment_accuracy']['torch']:.2%}, "
+          f"onnx {report['sentiment_accuracy']['onnx']:.2%}")
+
+    print("\n⏱️ Latency per entry (batch=1) and batch throughput")
+    print(f"   {'backend':<8} {'mean ms':>10} {'p50 ms':>10} {'p95 ms':>10} {'entries/s':>12}")
+    for name, perf in (('torch', torch_perf), ('onnx', onnx_perf)):
+        single = perf['single']
+        print(f"   {name:<8} {single['mean_ms']:>10.2f} {single['p50_ms']:>10.2f} "
+              f"{single['p95_ms']:>10.2f} {perf['batch_entries_per_sec']:>12.2f}")
+    if onnx_perf['single']['mean_ms']:
+        report['latency_speedup'] = round(torch_perf['single']['mean_ms'] / onnx_perf['single']['mean_ms'], 2)
+    if torch_perf['batch_entries_per_sec']:
+        report['throughput_speedup'] = round(
+            onnx_perf['batch_entries_per_sec'] / torch_perf['batch_entries_per_sec'], 2
+        )
+    print(f"   Speedup: latency {report.get('latency_speedup', 0):.2f}x, "
+          f"throughput {report.get('throughput_speedup', 0):.2f}x")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ Results saved to: {args.json_path}")
+
+    if min(sentiment_agree, theme_agree) < args.min_agreement:
+        print(f"\n❌ Agreement below {args.min_agreement:.0%}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""
+Hassasiyet Modu Değerlendirmesi (NLP_PRECISION=fp32|int8|bf16)
+Her mod ayrı bir süreçte yüklenir (RSS ölçümü birbirine karışmasın), test2.xlsx üzerinde
+duygu / kategori doğruluğu, model yükleme sonrası bellek artışı ve entry başına gecikme ölçülür.
+Doğruluk değişimi Sonuc_full_son_metrics.txt'deki referans değerlere göre raporlanır.
+
+Kullanım:
+    python -m benchmarks.precision --precisions fp32,int8,bf16
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+from benchmarks.common import ANALYZER_ROOT, DEFAULT_LABELED_FILE, build_service, rss_mb, summarize_latencies
+
+DEFAULT_BASELINE = os.path.join(ANALYZER_ROOT, 'Sonuc_full_son_metrics.txt')
+
+
+def parse_baseline(path: str) -> dict:
+    """analyze_test_data.py metrik dosyasından duygu ve kategori doğruluğunu oku."""
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    sentiment = re.search(r"^\s*Accuracy:\s*([\d.]+)%", text, flags=re.MULTILINE)
+    category = re.search(r"Category Accuracy:\s*([\d.]+)%", text)
+    return {
+        'sentiment_accuracy': float(sentiment.group(1)) / 100 if sentiment else None,
+        'category_accuracy': float(category.group(1)) / 100 if category else None,
+    }
+
+
+def run_worker(precision: str, path: str, batch_size: int) -> dict:
+    """Tek bir hassasiyet modunu bu süreçte yükleyip ölç."""
+    import pandas as pd
+    from analyze_test_data import normalize_category, normalize_rduygu
+
+    df = pd.read_excel(path)
+    df = df[(df['body'].notna()) & (df['RDuygu'].notna()) & (df['Rkategori'].notna())]
+    texts = [str(b) for b in df['body']]
+    rduygu = [normalize_rduygu(x) for x in df['RDuygu']]
+    categories = [normalize_category(x) for x in df['Rkategori']]
+
+    import torch  # noqa: F401  (torch'un kendi belleği model artışına sayılmasın)
+    rss_before = rss_mb()
+    t0 = time.perf_counter()
+    service = build_service(NLP_PRECISION=precision)
+    load_s = time.perf_counter() - t0
+    rss_after = rss_mb()
+
+    latencies = []
+    for text in texts:
+        t0 = time.perf_counter()
+        service.analyze_combined(text)
+        latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    results = []
+    for b in range(0, len(texts), batch_size):
+        results.extend(service.analyze_combined_batch(texts[b:b + batch_size]))
+    batch_s = time.perf_counter() - t0
+
+    sentiment_map = {'negative': 0, 'neutral': 1, 'positive': 2}
+    scored = [(sentiment_map.get(r['sentiment']['sentiment'], 1), y) for r, y in zip(results, rduygu) if y >= 0]
+    return {
+        'precision': service.precision,  # desteklenmiyorsa fp32'ye düşmüş olabilir
+        'entries': len(texts),
+        'sentiment_accuracy': sum(p == y for p, y in scored) / len(scored) if scored else 0.0,
+        'category_accuracy': sum(
+            normalize_category(r['theme']['main_topic']) == c for r, c in zip(results, categories)
+        ) / len(texts),
+        'model_rss_mb': round(rss_after - rss_before, 1),
+        'load_s': round(load_s, 2),
+        'single': summarize_latencies(latencies),
+        'batch_entries_per_sec': round(len(texts) / batch_s, 2) if batch_s else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Accuracy, memory and latency of NLP_PRECISION modes")
+    parser.add_argument('--precisions', default='fp32,int8,bf16')
+    parser.add_argument('--data', default=DEFAULT_LABELED_FILE)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Referans metrik dosyası')
+    parser.add_argument('--batch-size', type=int, default=16)
+    parser.add_argument('--json', dest='json_path', help='Sonuçları JSON olarak kaydet')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.data, args.batch_size)))
+        return
+
+    baseline = parse_baseline(args.baseline)
+    print(f"📖 Baseline ({os.path.basename(args.baseline)}): "
+          f"sentiment {baseline['sentiment_accuracy']:.2%}, category {baseline['category_accuracy']:.2%}")
+
+    reports = []
+    for precision in [p.strip() for p in args.precisions.split(',') if p.strip()]:
+        print(f"\n🔬 Measuring {precision}...")
+        proc = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.precision', '--worker', precision,
+             '--data', args.data, '--batch-size', str(args.batch_size)],
+            cwd=ANALYZER_ROOT, capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            print(f"   ❌ {precision} failed:\n{proc.stderr[-2000:]}")
+            continue
+        report = json.loads(proc.stdout.strip().splitlines()[-1])
+        report['requested'] = precision
+        reports.append(report)
+
+    if not reports:
+        sys.exit(1)
+    reference = next((r for r in reports if r['precision'] == 'fp32'), reports[0])
+
+    print(f"\n{'mode':<6} {'sent acc':>9} {'Δ base':>8} {'cat acc':>9} {'Δ base':>8} "
+          f"{'RSS MB':>8} {'Δ RSS':>8} {'mean ms':>9} {'speedup':>8} {'entries/s':>10}")
+    for r in reports:
+        d_sent = r['sentiment_accuracy'] - (baseline['sentiment_accuracy'] or 0)
+        d_cat = r['category_accuracy'] - (baseline['category_accuracy'] or 0)
+        d_rss = r['model_rss_mb'] - reference['model_rss_mb']
+        speedup = reference['single']['mean_ms'] / r['single']['mean_ms'] if r['single']['mean_ms'] else 0.0
+        r.update({'delta_sentiment_vs_baseline': round(d_sent, 4), 'delta_category_vs_baseline': round(d_cat, 4),
+                  'delta_rss_vs_fp32_mb': round(d_rss, 1), 'latency_speedup_vs_fp32': round(speedup, 2)})
+        name = r['precision'] if r['precision'] == r['requested'] else f"{r['requested']}→{r['precision']}"
+        print(f"{name:<6} {r['sentiment_accuracy']:>9.2%} {d_sent:>+8.2%} {r['category_accuracy']:>9.2%} "
+              f"{d_cat:>+8.2%} {r['model_rss_mb']:>8.1f} {d_rss:>+8.1f} {r['single']['mean_ms']:>9.2f} "
+              f"{speedup:>7.2f}x {r['batch_entries_per_sec']:>10.2f}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'baseline': baseline, 'modes': reports}, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ Results saved to: {args.json_path}")
+
+
+if __name__ == '__main__':
+    main()
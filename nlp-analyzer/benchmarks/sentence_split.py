@@ -0,0 +1,140 @@
+"""
+Cümle Bölme Benchmark'ı
+SENTENCE_SPLITTER modlarını (vnlp, rules, auto) ve eski regex fallback'ini toplanan veri seti üzerinde
+entry başına süre ve VNLP ile uyum üzerinden karşılaştırır. Uyum iki şekilde raporlanır: cümle listesi
+VNLP ile birebir aynı olan entry oranı ve cümle sonu konumları üzerinden sınır F1'i.
+Girdi, NLPService._preprocess_for_sentiment_batch'in rules / auto modlarında böldüğü metindir: (bkz: ...) ve
+URL'leri temizlenmiş, henüz normalize edilmemiş ham entry. VNLP kurulu değilse sadece rules / regex süreleri
+ölçülür.
+
+Kullanım:
+    python -m benchmarks.sentence_split --limit 1000
+    python -m benchmarks.sentence_split --auto-chars 200,300,500 --json split.json
+"""
+
+import argparse
+import json
+import re
+import time
+
+from benchmarks.common import load_sample_texts, summarize_latencies
+from services.nlp_service import NLPService
+from services.sentence_splitter import RuleSentenceSplitter
+
+SENTENCE_RE = re.compile(r"[\.\?!…\n]+")
+
+
+def regex_split(text: str) -> list:
+    # NLPService._split_sentences'ın eski regex fallback'i
+    return [p.strip() for p in SENTENCE_RE.split(text) if p.strip()]
+
+
+def sentence_ends(text: str, sentences: list) -> set:
+    """Cümlelerin metindeki bitiş konumları (bulunamayan cümleler atlanır)."""
+    ends, pos = set(), 0
+    for sentence in sentences:
+        idx = text.find(sentence, pos)
+        if idx < 0:
+            continue
+        pos = idx + len(sentence)
+        ends.add(pos)
+    ends.discard(len(text.rstrip()))
+    return ends
+
+
+def _time_per_entry(fn, texts: list, repeat: int):
+    latencies, outputs = [], []
+    for text in texts:
+        best = None
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            out = fn(text)
+            elapsed = time.perf_counter() - t0
+            best = elapsed if best is None else min(best, elapsed)
+        latencies.append(best)
+        outputs.append(out)
+    return summarize_latencies(latencies), outputs
+
+
+def agreement(texts: list, outputs: list, reference: list) -> dict:
+    exact = tp = fp = fn = 0
+    for text, out, ref in zip(texts, outputs, reference):
+        exact += out == ref
+        got, want = sentence_ends(text, out), sentence_ends(text, ref)
+        tp += len(got & want)
+        fp += len(got - want)
+        fn += len(want - got)
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall = tp / (tp + fn) if tp + fn else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {
+        'exact': round(exact / len(texts), 4),
+        'boundary_precision': round(precision, 4),
+        'boundary_recall': round(recall, 4),
+        'boundary_f1': round(f1, 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sentence splitting time per entry and agreement with VNLP")
+    parser.add_argument('--limit', type=int, default=1000, help='Dataset örnek sayısı')
+    parser.add_argument('--repeat', type=int, default=3, help='Entry başına tekrar (en iyisi alınır)')
+    parser.add_argument('--auto-chars', default='300',
+                        help='auto modu için denenecek SENTENCE_SPLITTER_AUTO_CHARS eşikleri (virgülle)')
+    parser.add_argument('--json', dest='json_path', help='Sonuçları JSON olarak kaydet')
+    args = parser.parse_args()
+
+    texts = [NLPService._clean_for_sentiment(t) for t in load_sample_texts(args.limit)]
+    lengths = sorted(map(len, texts))
+    print(f"📖 {len(texts)} sample entries, mean {sum(lengths) / len(lengths):.0f} chars, "
+          f"median {lengths[len(lengths) // 2]} chars")
+
+    rules = RuleSentenceSplitter()
+    try:
+        from vnlp import SentenceSplitter
+        vnlp_splitter = SentenceSplitter()
+    except Exception as e:
+        print(f"⚠️ VNLP SentenceSplitter not available ({e}); measuring rules / regex only")
+        vnlp_splitter = None
+
+    def vnlp_split(text):
+        return [s.strip() for s in vnlp_splitter.split(text) if s.strip()]
+
+    modes = [('rules', rules.split), ('regex', regex_split)]
+    if vnlp_splitter is not None:
+        modes.insert(0, ('vnlp', vnlp_split))
+
+    results, outputs = [], {}
+    for name, fn in modes:
+        latency, outputs[name] = _time_per_entry(fn, texts, args.repeat)
+        results.append({'mode': name, 'latency': latency})
+
+    if vnlp_splitter is not None:
+        # auto: kısa entry'ler rules, uzunlar VNLP (ölçülen süreler entry bazında birleştirilir)
+        for chars in (int(c) for c in args.auto_chars.split(',') if c.strip()):
+            def auto_split(text, chars=chars):
+                return rules.split(text) if len(text) <= chars else vnlp_split(text)
+            latency, outputs[f'auto@{chars}'] = _time_per_entry(auto_split, texts, args.repeat)
+            results.append({'mode': f'auto@{chars}', 'latency': latency,
+                            'rules_share': round(sum(len(t) <= chars for t in texts) / len(texts), 4)})
+        for r in results:
+            r['agreement'] = agreement(texts, outputs[r['mode']], outputs['vnlp'])
+
+    base = results[0]['latency']['mean_ms']
+    print(f"\n✂️ Sentence splitting per entry")
+    print(f"   {'mode':<12} {'mean ms':>9} {'p95 ms':>9} {'speedup':>8} {'exact':>7} {'bnd F1':>7}")
+    for r in results:
+        lat, agree = r['latency'], r.get('agreement')
+        speedup = base / lat['mean_ms'] if lat['mean_ms'] else 0.0
+        exact = f"{agree['exact']:>7.1%}" if agree else f"{'-':>7}"
+        f1 = f"{agree['boundary_f1']:>7.3f}" if agree else f"{'-':>7}"
+        print(f"   {r['mode']:<12} {lat['mean_ms']:>9.4f} {lat['p95_ms']:>9.4f} {speedup:>7.2f}x {exact} {f1}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ Results saved to: {args.json_path}")
+
+
+if __name__ == '__main__':
+    main()
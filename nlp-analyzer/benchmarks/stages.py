@@ -0,0 +1,362 @@
+"""
+NLPService Aşama Benchmark'ı
+Veri setinden seçilen sabit örnekler üzerinde duygu / tema akışının her aşamasını ayrı ayrı ölçer:
+preprocess (ham metinden bkz / URL temizliği), split ve normalize (VNLP; sıraları SENTENCE_SPLITTER moduna göre
+servisteki gibidir), tokenize, theme_tokenize,
+forward, theme_forward, vote, theme_post, keywords ve karşılaştırma için uçtan uca analyze_combined_batch.
+Her aşamanın girdisi bir önceki aşamanın ısınma çıktısıdır; süreler mini-batch'ler üzerinden entry başına
+(entries/sec, p50 / p95) raporlanır.
+
+Modeller:
+    tiny   - Veri setinden eğitilen küçük bir WordPiece tokenizer ve rastgele başlatılmış 2 katmanlı BERT
+             sınıflandırıcılarından oluşan yerel bir model paketi (ağ gerektirmez; doğruluk anlamsızdır,
+             forward süresi gerçek modelden küçüktür, ön / son işleme aşamaları gerçek koddur)
+    bundle - bundle_models.py ile üretilmiş gerçek offline paket (--bundle-dir)
+    hub    - NLPService'in varsayılan model adları (hub veya models/ cache'i)
+
+--history ile her çalışma JSONL dosyasına eklenir ve aynı ayarlarla yapılmış bir önceki çalışmaya göre
+entries/sec ve p50 / p95 değişimleri gösterilir; --tolerance'ı aşan gerilemeler işaretlenir.
+
+Kullanım:
+    python -m benchmarks.stages --limit 300
+    python -m benchmarks.stages --history benchmarks/stages_history.jsonl --label "sentence splitter"
+    python -m benchmarks.stages --models bundle --bundle-dir ../models/bundle --json stages.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.common import ANALYZER_ROOT, build_service, load_sample_texts, summarize_latencies
+
+DEFAULT_TINY_DIR = os.path.join(ANALYZER_ROOT, 'models', 'bench_tiny')
+TINY_CONFIG = {'vocab_size': 4000, 'hidden_size': 64, 'num_hidden_layers': 2, 'num_attention_heads': 2,
+               'intermediate_size': 128, 'seed': 0}
+SENTIMENT_LABELS = ('negative', 'neutral', 'positive')
+TOPIC_LABELS = tuple(f"LABEL_{i}" for i in range(7))
+# Karşılaştırmada gerileme sayılan metrikler: (metrik, büyük olan mı iyi)
+COMPARED_METRICS = (('per_sec', True), ('p50_ms', False), ('p95_ms', False))
+
+
+def build_tiny_bundle(out_dir: str, texts: list, config: dict = TINY_CONFIG) -> str:
+    """
+    Rastgele ağırlıklı küçük sentiment / topic modellerini NLPService'in okuduğu paket formatında yaz.
+    Tokenizer örnek metinlerden eğitilir; aynı metin ve config aynı paketi üretir.
+    """
+    import torch
+    from tokenizers import Tokenizer, models, normalizers, pre_tokenizers, processors, trainers
+    from transformers import BertConfig, BertForSequenceClassification, BertTokenizerFast
+
+    from services.model_bundle import save_bundle_model, write_manifest
+
+    specials = ['[PAD]', '[UNK]', '[CLS]', '[SEP]', '[MASK]']
+    backend = Tokenizer(models.WordPiece(unk_token='[UNK]'))
+    backend.normalizer = normalizers.BertNormalizer(lowercase=False, strip_accents=False)
+    backend.pre_tokenizer = pre_tokenizers.BertPreTokenizer()
+    backend.train_from_iterator(
+        texts, trainers.WordPieceTrainer(vocab_size=config['vocab_size'], special_tokens=specials)
+    )
+    cls_id, sep_id = backend.token_to_id('[CLS]'), backend.token_to_id('[SEP]')
+    backend.post_processor = processors.TemplateProcessing(
+        single='[CLS] $A [SEP]', pair='[CLS] $A [SEP] $B:1 [SEP]:1',
+        special_tokens=[('[CLS]', cls_id), ('[SEP]', sep_id)],
+    )
+    tokenizer = BertTokenizerFast(tokenizer_object=backend, do_lower_case=False, strip_accents=False)
+
+    entries = {}
+    torch.manual_seed(config['seed'])
+    for name, labels in (('sentiment', SENTIMENT_LABELS), ('topic', TOPIC_LABELS)):
+        model_config = BertConfig(
+            vocab_size=len(tokenizer),
+            hidden_size=config['hidden_size'],
+            num_hidden_layers=config['num_hidden_layers'],
+            num_attention_heads=config['num_attention_heads'],
+            intermediate_size=config['intermediate_size'],
+            max_position_embeddings=512,
+            num_labels=len(labels),
+            id2label=dict(enumerate(labels)),
+            label2id={label: i for i, label in enumerate(labels)},
+        )
+        model = BertForSequenceClassification(model_config).eval()
+        entries[name] = save_bundle_model(out_dir, name, model, tokenizer, source=f"stand-in/tiny-{name}")
+    write_manifest(out_dir, entries, stand_in=config, samples=len(texts))
+    return out_dir
+
+
+def _tiny_bundle(out_dir: str, texts: list, rebuild: bool) -> str:
+    # Aynı config ve örnek sayısıyla üretilmiş paket varsa tekrar kullanılır
+    manifest_path = os.path.join(out_dir, 'manifest.json')
+    if not rebuild and os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('stand_in') == TINY_CONFIG and manifest.get('samples') == len(texts):
+            print(f"📦 Reusing stand-in models in {out_dir}")
+            return out_dir
+    print(f"📦 Building tiny stand-in models in {out_dir}")
+    return build_tiny_bundle(out_dir, texts)
+
+
+def load_service(models: str, bundle_dir: str):
+    """NLPService'i bileşen bileşen yükle; VNLP yüklenemezse normalize aşaması atlanır."""
+    env = {'NLP_MODEL_BUNDLE': bundle_dir} if models != 'hub' else {}
+    service = build_service(load=False, **env)
+    service._configure_runtime()
+    service._load_component('sentiment', service._load_sentiment)
+    service._load_component('topic', service._load_topic)
+    try:
+        service._load_component('vnlp', service._load_vnlp)
+        vnlp_ready = True
+    except Exception:
+        print("⚠️ VNLP unavailable: normalize stage skipped, text is lower-cased and split with the rule splitter")
+        vnlp_ready = False
+    return service, vnlp_ready
+
+
+def time_stage(fn, batches: list, repeat: int, reset=None) -> dict:
+    """
+    fn'i tüm mini-batch'lerde repeat kez çalıştır; toplamı en kısa turun entry başına süreleri özetlenir.
+    reset her turdan önce çağrılır (örn. deasciify önbelleğini boşaltmak için).
+    """
+    best = None
+    for _ in range(repeat):
+        if reset is not None:
+            reset()
+        run = []
+        for batch in batches:
+            t0 = time.perf_counter()
+            fn(batch)
+            run.append((time.perf_counter() - t0, len(batch)))
+        if best is None or sum(sec for sec, _ in run) < sum(sec for sec, _ in best):
+            best = run
+    return summarize_latencies([sec / n for sec, n in best for _ in range(n)])
+
+
+def run_stages(service, texts: list, vnlp_ready: bool, batch_size: int, repeat: int, threshold: float) -> dict:
+    from services.nlp_service import PreparedText
+    from services.result_cache import LRUCache
+
+    batches = [list(range(i, min(i + batch_size, len(texts)))) for i in range(0, len(texts), batch_size)]
+    cache_size = service.deasciify_cache.max_size if service.deasciify_cache is not None else 0
+
+    def reset_deasciify():
+        # Her tur soğuk önbellekle başlar; tur içindeki batch'ler arası isabetler üretimdeki gibi sayılır
+        if cache_size:
+            service.deasciify_cache = LRUCache(cache_size)
+
+    # Aşama girdileri: gerçek akışın bir kez (ısınma) çalıştırılmış çıktıları
+    # Servisteki sıra: bkz / URL ham metinden temizlenir; vnlp modunda metin normalize edilip bölünür,
+    # rules / auto modunda önce bölünür, cümleler birlikte normalize edilir
+    cleaned = [service._clean_for_sentiment(t) for t in texts]
+    split_first = service.sentence_splitter_mode != 'vnlp'
+    if split_first:
+        split_inputs = cleaned
+        normalize_inputs = [service._split_sentences(t) or [t] for t in cleaned]
+    else:
+        normalize_inputs = [[t] for t in cleaned]
+        split_inputs = [_quiet(service._normalize_for_sentiment, [t], 1)[0] for t in cleaned]
+    sentences = _quiet(service._preprocess_for_sentiment_batch, texts)
+    prepared = [service.prepare_text(t, preprocessed=c) for t, c in zip(texts, sentences)]
+    failed = {side: sum(side in p.errors for p in prepared) for side in ('sentiment', 'theme')}
+    if any(failed.values()):
+        raise RuntimeError(f"Preparation failed for some samples: {failed}")
+
+    sentiment_model, sentiment_tok = service.sentiment_model, service.sentiment_tokenizer
+    topic_model, topic_tok = service.topic_model, service.topic_tokenizer
+    flat = service._forward_probs(sentiment_model, sentiment_tok, [ids for p in prepared for ids in p.sentiment_ids],
+                                  service.sentiment_batch_size)
+    probs, offset = [], 0
+    for p in prepared:
+        probs.append(flat[offset:offset + len(p.sentiment_ids)])
+        offset += len(p.sentiment_ids)
+    topic_probs = service._forward_probs(topic_model, topic_tok, [p.topic_ids for p in prepared],
+                                         service.topic_batch_size)
+    topic_labels = topic_model.config.id2label
+
+    stages = {
+        'preprocess': (lambda b: [service._clean_for_sentiment(texts[i]) for i in b], None),
+        'split': (lambda b: [service._split_sentences(split_inputs[i]) for i in b], None),
+    }
+    if vnlp_ready:
+        stages['normalize'] = (lambda b: service.normalize_batch([s for i in b for s in normalize_inputs[i]]),
+                               reset_deasciify)
+    stages.update({
+        'tokenize': (lambda b: sentiment_tok([s for i in b for s in sentences[i]], add_special_tokens=False), None),
+        'theme_tokenize': (lambda b: [service._prepare_theme(PreparedText(raw=texts[i])) for i in b], None),
+        'forward': (lambda b: service._forward_probs(
+            sentiment_model, sentiment_tok, [ids for i in b for ids in prepared[i].sentiment_ids],
+            service.sentiment_batch_size), None),
+        'theme_forward': (lambda b: service._forward_probs(
+            topic_model, topic_tok, [prepared[i].topic_ids for i in b], service.topic_batch_size), None),
+        'vote': (lambda b: [service._vote_sentiment(probs[i], prepared[i].sentences) for i in b], None),
+        'theme_post': (lambda b: [
+            service._theme_from_scores([{'label': topic_labels[k], 'score': s} for k, s in enumerate(topic_probs[i])],
+                                       prepared[i], threshold)
+            for i in b], None),
+        'keywords': (lambda b: service.keyword_extractor.extract_batch([prepared[i].topic_text for i in b], n=8),
+                     None),
+        'end_to_end': (lambda b: service.analyze_combined_batch([texts[i] for i in b], threshold), reset_deasciify),
+    })
+    if not vnlp_ready:
+        # Normalizer fallback uyarısı her çağrıda basılır; ölçümü ve çıktıyı kirletmesin
+        e2e, reset = stages['end_to_end']
+        stages['end_to_end'] = (lambda b: _quiet(e2e, b), reset)
+
+    results = {}
+    for name, (fn, reset) in stages.items():
+        results[name] = time_stage(fn, batches, repeat, reset)
+        print(f"   {name:<15} {results[name]['per_sec']:>10.1f} entries/s")
+    return results
+
+
+def _quiet(fn, *args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args)
+
+
+def _git_commit() -> str:
+    try:
+        proc = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ANALYZER_ROOT,
+                              capture_output=True, text=True, timeout=10)
+        return proc.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def previous_run(history_path: str, config: dict):
+    """Geçmişte aynı ayarlarla (config) yapılmış son çalışma."""
+    if not os.path.exists(history_path):
+        return None
+    last = None
+    with open(history_path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # yarım yazılmış satır
+            if record.get('config') == config:
+                last = record
+    return last
+
+
+def compare(current: dict, previous: dict, tolerance: float) -> list:
+    """
+    Aşama bazında değişimler.
+
+    Returns:
+        list: (aşama, metrik, önceki, şimdiki, değişim oranı, gerileme mi)
+    """
+    rows = []
+    for stage, stats in current['stages'].items():
+        before = previous['stages'].get(stage)
+        if not before:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS:
+            old, new = before.get(metric), stats.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            regressed = (-change if higher_is_better else change) > tolerance
+            rows.append((stage, metric, old, new, change, regressed))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage NLPService throughput and latency on fixed dataset samples")
+    parser.add_argument('--models', choices=('tiny', 'bundle', 'hub'), default='tiny',
+                        help='tiny: yerel rastgele stand-in modeller (ağ yok), bundle: --bundle-dir, hub: varsayılanlar')
+    parser.add_argument('--bundle-dir', help='--models bundle için paket klasörü (tiny için varsayılan: models/bench_tiny)')
+    parser.add_argument('--rebuild', action='store_true', help='Stand-in modelleri yeniden üret')
+    parser.add_argument('--limit', type=int, default=300, help='Dataset örnek sayısı')
+    parser.add_argument('--batch-size', type=int, default=16, help='Aşama çağrısı başına entry sayısı')
+    parser.add_argument('--repeat', type=int, default=3, help='Tur sayısı (en hızlı tur raporlanır)')
+    parser.add_argument('--threads', type=int, help='torch thread sayısı')
+    parser.add_argument('--threshold', type=float, default=0.15, help='Tema eşiği')
+    parser.add_argument('--label', default='', help='Geçmiş kaydı için açıklama (örn. sürüm veya değişiklik)')
+    parser.add_argument('--json', dest='json_path', help='Bu çalışmanın sonuçlarını JSON olarak kaydet')
+    parser.add_argument('--history', help='Çalışmanın ekleneceği JSONL geçmiş dosyası')
+    parser.add_argument('--tolerance', type=float, default=0.20,
+                        help='Gerileme sayılacak değişim oranı (µs düzeyindeki aşamalarda ölçüm gürültüsü ~%%15)')
+    parser.add_argument('--fail-on-regression', action='store_true', help='Gerileme varsa çıkış kodu 1')
+    args = parser.parse_args()
+
+    texts = load_sample_texts(args.limit)
+    print(f"📖 {len(texts)} sample entries, mean {sum(map(len, texts)) / len(texts):.0f} chars")
+
+    bundle_dir = args.bundle_dir
+    if args.models == 'tiny':
+        bundle_dir = _tiny_bundle(bundle_dir or DEFAULT_TINY_DIR, texts, args.rebuild)
+    elif args.models == 'bundle' and not bundle_dir:
+        parser.error('--models bundle requires --bundle-dir')
+
+    import torch
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    service, vnlp_ready = load_service(args.models, bundle_dir)
+    config = {
+        'models': args.models,
+        'sentiment_model': service.sentiment_model_id,
+        'topic_model': service.topic_model_name,
+        'stand_in': TINY_CONFIG if args.models == 'tiny' else None,
+        'samples': len(texts),
+        'batch_size': args.batch_size,
+        'torch_threads': torch.get_num_threads(),
+        'device': str(service.torch_device),
+        'sentence_splitter': service.sentence_splitter_mode,
+        'vnlp': vnlp_ready,
+    }
+
+    print(f"\n⏱️ Stages ({args.batch_size} entries per call, best of {args.repeat})")
+    report = {
+        'label': args.label,
+        'commit': _git_commit(),
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': sys.version.split()[0],
+        'torch': torch.__version__,
+        'config': config,
+        'stages': run_stages(service, texts, vnlp_ready, args.batch_size, args.repeat, args.threshold),
+    }
+
+    print(f"\n   {'stage':<15} {'entries/s':>10} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    for name, s in report['stages'].items():
+        print(f"   {name:<15} {s['per_sec']:>10.1f} {s['mean_ms']:>9.3f} {s['p50_ms']:>9.3f} {s['p95_ms']:>9.3f}")
+
+    regressions = []
+    if args.history:
+        previous = previous_run(args.history, config)
+        if previous is None:
+            print(f"\n📈 No previous run with the same settings in {args.history}")
+        else:
+            rows = compare(report, previous, args.tolerance)
+            regressions = [r for r in rows if r[5]]
+            print(f"\n📈 Compared with {previous.get('commit') or '?'} ({previous.get('created_at')}"
+                  f"{', ' + previous['label'] if previous.get('label') else ''})")
+            for stage, metric, old, new, change, regressed in rows:
+                flag = '  ❌ regression' if regressed else ''
+                print(f"   {stage:<15} {metric:<8} {old:>10.3f} -> {new:>10.3f} ({change:+.1%}){flag}")
+        os.makedirs(os.path.dirname(os.path.abspath(args.history)), exist_ok=True)
+        with open(args.history, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(report, ensure_ascii=False) + '\n')
+        print(f"✅ Appended to history: {args.history}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"✅ Results saved to: {args.json_path}")
+
+    if regressions:
+        print(f"\n⚠️ {len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
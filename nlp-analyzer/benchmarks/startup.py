@@ -0,0 +1,140 @@
+"""
+Başlangıç (Cold Start) Profili
+Her ölçüm temiz bir Python sürecinde yapılır:
+  - scripts: giriş noktalarının (app.py ve CLI scriptleri) import süresi ve torch/transformers/vnlp'yi
+    import edip etmedikleri
+  - cold start: kütüphane import'ları, tokenizer yükleme, ağırlık yükleme, cihaza taşıma ve
+    ilk inference (duygu / tema) süreleri; ikinci çağrı ısınmış süre olarak verilir
+
+Kullanım:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --skip-models --json startup.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.common import ANALYZER_ROOT
+
+HEAVY_MODULES = ('torch', 'transformers', 'vnlp', 'tensorflow')
+# Ana bloğu __main__ korumalı olan giriş noktaları (check_data.py import edilince çalışır, ölçülmez)
+ENTRY_POINTS = ('app', 'analyze_test_data', 'analyze_test_data_simple', 'test_models')
+SAMPLE_TEXT = "telefonu iki haftadır kullanıyorum. bataryası iyi ama kamerası beklediğim gibi değil."
+
+
+def _subprocess_json(args: list, env: dict = None) -> dict:
+    proc = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.startup'] + args,
+        cwd=ANALYZER_ROOT, capture_output=True, text=True, env={**os.environ, **(env or {})}
+    )
+    if proc.returncode != 0:
+        return {'error': proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'failed'}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def worker_import(module: str) -> dict:
+    """Tek bir giriş noktasını import et; süre ve yüklenen ağır kütüphaneler."""
+    started = time.perf_counter()
+    __import__(module)
+    elapsed = time.perf_counter() - started
+    return {
+        'import_s': round(elapsed, 3),
+        'heavy_modules': sorted(m for m in HEAVY_MODULES if m in sys.modules),
+    }
+
+
+def worker_cold_start() -> dict:
+    """Servisi sıfırdan yükle; aşama süreleri ve ilk / ikinci inference."""
+    from benchmarks.common import build_service
+
+    started = time.perf_counter()
+    import services.nlp_service  # noqa: F401
+    module_import_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    service = build_service()
+    load_s = time.perf_counter() - started
+    readiness = service.readiness()
+
+    first = {}
+    for name, fn in (('sentiment', service.analyze_sentiment), ('theme', service.analyze_theme)):
+        t0 = time.perf_counter()
+        fn(SAMPLE_TEXT)
+        first[name] = round(time.perf_counter() - t0, 3)
+    warm = {}
+    for name, fn in (('sentiment', service.analyze_sentiment), ('theme', service.analyze_theme)):
+        t0 = time.perf_counter()
+        fn(SAMPLE_TEXT)  # build_service önbellekleri kapatır, ikinci çağrı da modeli çalıştırır
+        warm[name] = round(time.perf_counter() - t0, 3)
+
+    return {
+        'module_import_s': round(module_import_s, 3),
+        'load_s': round(load_s, 3),
+        'runtime': readiness['runtime'],
+        'components': {
+            name: {'load_sec': c['load_sec'], 'stages': c['stages']}
+            for name, c in readiness['components'].items()
+        },
+        'first_inference_s': first,
+        'warm_inference_s': warm,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time and cold-start profile of nlp-analyzer")
+    parser.add_argument('--skip-models', action='store_true', help='Sadece import sürelerini ölç')
+    parser.add_argument('--json', dest='json_path', help='Sonuçları JSON olarak kaydet')
+    parser.add_argument('--worker-import', help=argparse.SUPPRESS)
+    parser.add_argument('--worker-cold-start', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker_import:
+        print(json.dumps(worker_import(args.worker_import)))
+        return
+    if args.worker_cold_start:
+        print(json.dumps(worker_cold_start()))
+        return
+
+    report = {'scripts': {}}
+    print("📦 Entry point import time (fresh interpreter)")
+    print(f"   {'module':<28} {'import s':>9}  heavy modules loaded")
+    for module in ENTRY_POINTS:
+        # app import'u model yüklemeyi arka planda başlatır; ölçülen süre port açılmadan önceki kısımdır
+        res = _subprocess_json(['--worker-import', module], env={'NLP_BACKGROUND_LOAD': 'true'})
+        report['scripts'][module] = res
+        if 'error' in res:
+            print(f"   {module:<28} {'-':>9}  ❌ {res['error']}")
+        else:
+            print(f"   {module:<28} {res['import_s']:>9.3f}  {', '.join(res['heavy_modules']) or '-'}")
+
+    if not args.skip_models:
+        print("\n🧊 Cold start breakdown")
+        res = _subprocess_json(['--worker-cold-start'])
+        report['cold_start'] = res
+        if 'error' in res:
+            print(f"   ❌ {res['error']}")
+        else:
+            print(f"   {'services.nlp_service import':<34} {res['module_import_s']:>8.3f}s")
+            for stage, sec in res['runtime'].items():
+                print(f"   {stage:<34} {sec:>8.3f}s")
+            for name, comp in res['components'].items():
+                for stage, sec in comp['stages'].items():
+                    print(f"   {name + ' ' + stage:<34} {sec:>8.3f}s")
+                print(f"   {name + ' total (concurrent)':<34} {comp['load_sec'] or 0:>8.3f}s")
+            print(f"   {'load() wall time':<34} {res['load_s']:>8.3f}s")
+            for name in ('sentiment', 'theme'):
+                print(f"   {'first ' + name + ' inference':<34} {res['first_inference_s'][name]:>8.3f}s "
+                      f"(warm {res['warm_inference_s'][name]:.3f}s)")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ Results saved to: {args.json_path}")
+
+
+if __name__ == '__main__':
+    main()
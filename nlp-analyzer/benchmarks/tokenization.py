@@ -0,0 +1,127 @@
+"""
+Tokenizasyon Benchmark'ı
+Eski encode -> decode -> yeniden encode akışı ile tek seferlik tokenizasyon yolunu
+entry başına tokenizer süresi üzerinden karşılaştırır.
+
+Kullanım:
+    python -m benchmarks.tokenization --limit 500
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+
+from transformers import AutoTokenizer
+from transformers.utils import logging as hf_logging
+
+from benchmarks.common import ANALYZER_ROOT, load_sample_texts, summarize_latencies
+from services.nlp_service import keep_last_tokens
+
+SENTENCE_RE = re.compile(r"[\.\?!…\n]+")
+
+
+def _prepare(text: str) -> str:
+    # İki yol için de aynı (tokenizer dışı) hafif ön işleme; VNLP süresi ölçüme karışmasın
+    return re.sub(r"\s+", " ", text.lower()).strip()
+
+
+def _split(text: str) -> list:
+    parts = [p.strip() for p in SENTENCE_RE.split(text) if p.strip()]
+    return parts or [text]
+
+
+def legacy_sentiment(tok, text: str, max_length: int):
+    # encode -> son 512 -> decode -> cümle bölme -> pipeline'ın cümle başına yeniden encode'u
+    tokens = tok.encode(text, add_special_tokens=True)
+    if len(tokens) > 512:
+        text = tok.decode(tokens[-512:], skip_special_tokens=True)
+    sentences = _split(text)[-10:]
+    return [tok(s, truncation=True, max_length=max_length)['input_ids'] for s in sentences]
+
+
+def single_pass_sentiment(tok, text: str, max_length: int):
+    sentences = _split(text)
+    content_ids = tok(sentences, add_special_tokens=False)['input_ids']
+    sentences, content_ids = keep_last_tokens(sentences, content_ids, 511)
+    max_content = max_length - tok.num_special_tokens_to_add()
+    return [tok.build_inputs_with_special_tokens(ids[:max_content]) for ids in content_ids[-10:]]
+
+
+def legacy_theme(tok, text: str, max_length: int):
+    tokens = tok.encode(text, add_special_tokens=True)
+    if len(tokens) > 512:
+        text = tok.decode(tokens[:512], skip_special_tokens=True)
+    return tok(text, truncation=True, max_length=max_length)['input_ids']
+
+
+def single_pass_theme(tok, text: str, max_length: int):
+    enc = tok(text, add_special_tokens=False, return_offsets_mapping=tok.is_fast)
+    content_ids = enc['input_ids']
+    max_content = max_length - tok.num_special_tokens_to_add()
+    return tok.build_inputs_with_special_tokens(content_ids[:max_content])
+
+
+def _time_per_entry(fn, tok, texts, max_length, repeat):
+    latencies = []
+    for text in texts:
+        best = None
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn(tok, text, max_length)
+            elapsed = time.perf_counter() - t0
+            best = elapsed if best is None else min(best, elapsed)
+        latencies.append(best)
+    return summarize_latencies(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tokenizer time per entry: legacy round trip vs single pass")
+    parser.add_argument('--limit', type=int, default=500, help='Dataset örnek sayısı')
+    parser.add_argument('--repeat', type=int, default=3, help='Entry başına tekrar (en iyisi alınır)')
+    parser.add_argument('--sentiment-model', default=os.getenv(
+        'SENTIMENT_MODEL_NAME', 'incidelen/xlm-roberta-base-turkish-sentiment-analysis'))
+    parser.add_argument('--topic-model', default='savasy/bert-turkish-text-classification')
+    parser.add_argument('--json', dest='json_path', help='Sonuçları JSON olarak kaydet')
+    args = parser.parse_args()
+
+    hf_logging.set_verbosity_error()
+    cache_dir = os.path.join(ANALYZER_ROOT, 'models')
+    sentiment_tok = AutoTokenizer.from_pretrained(args.sentiment_model, cache_dir=cache_dir, use_fast=False)
+    topic_tok = AutoTokenizer.from_pretrained(args.topic_model, cache_dir=cache_dir)
+    sentiment_max = int(os.getenv('SENTIMENT_MAX_LEN', '256'))
+    topic_max = int(os.getenv('TOPIC_MAX_LEN', '256'))
+
+    texts = [_prepare(t) for t in load_sample_texts(args.limit)]
+    print(f"📖 {len(texts)} sample entries")
+
+    results = {
+        'sentiment': {
+            'legacy': _time_per_entry(legacy_sentiment, sentiment_tok, texts, sentiment_max, args.repeat),
+            'single_pass': _time_per_entry(single_pass_sentiment, sentiment_tok, texts, sentiment_max, args.repeat),
+        },
+        'theme': {
+            'legacy': _time_per_entry(legacy_theme, topic_tok, texts, topic_max, args.repeat),
+            'single_pass': _time_per_entry(single_pass_theme, topic_tok, texts, topic_max, args.repeat),
+        },
+    }
+
+    for model, res in results.items():
+        legacy, single = res['legacy'], res['single_pass']
+        speedup = legacy['mean_ms'] / single['mean_ms'] if single['mean_ms'] else 0.0
+        res['speedup'] = round(speedup, 2)
+        print(f"\n🔤 {model} tokenizer time per entry")
+        print(f"   {'path':<12} {'mean ms':>10} {'p50 ms':>10} {'p95 ms':>10}")
+        for name, r in (('legacy', legacy), ('single_pass', single)):
+            print(f"   {name:<12} {r['mean_ms']:>10.3f} {r['p50_ms']:>10.3f} {r['p95_ms']:>10.3f}")
+        print(f"   Speedup: {speedup:.2f}x")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ Results saved to: {args.json_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Toplanan eksisozluk_dataset_*.json dosyalarından anahtar kelime IDF indeksini oluşturan script.
+Entry'ler json_to_csv.py ile aynı şekilde temizlenir, aynı entry id'si birden fazla dosyada geçse de
+bir kez sayılır. Çıktı (idf.npy + vocab.json) NLPService tarafından KEYWORD_IDF_INDEX klasöründen
+(varsayılan: models/keyword_idf) mmap ile okunur.
+
+Kullanım:
+    python build_idf_index.py
+    python build_idf_index.py ../eksisozluk-api-master/eksisozluk_dataset_*.json --min-df 3
+"""
+
+import argparse
+import glob
+import json
+import os
+
+from json_to_csv import clean_text
+from services.keywords import DEFAULT_INDEX_DIR, build_idf_index
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATTERNS = [
+    os.path.join(BASE_DIR, 'eksisozluk_dataset_*.json'),
+    os.path.normpath(os.path.join(BASE_DIR, '..', 'eksisozluk-api-master', 'eksisozluk_dataset_*.json')),
+]
+
+
+def iter_entries(paths: list):
+    """Dosyalardaki temizlenmiş entry metinleri (entry id'sine göre tekilleştirilmiş)."""
+    seen = set()
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            entries = json.load(f).get('entries', [])
+        print(f"   {path}: {len(entries)} entries")
+        for entry in entries:
+            key = entry.get('id') or entry.get('body')
+            if key in seen:
+                continue
+            seen.add(key)
+            body = clean_text(entry.get('body', ''))
+            if body:
+                yield body
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the keyword IDF index from collected eksisozluk datasets")
+    parser.add_argument('inputs', nargs='*', help='JSON dosyaları veya glob desenleri (varsayılan: eksisozluk_dataset_*.json)')
+    parser.add_argument('--out', default=DEFAULT_INDEX_DIR, help='İndeks klasörü (varsayılan: models/keyword_idf)')
+    parser.add_argument('--min-df', type=int, default=2, help='Tabloya girmek için en az kaç entry\'de geçmeli')
+    parser.add_argument('--max-features', type=int, default=200000, help='En fazla kelime sayısı (0: sınırsız)')
+    args = parser.parse_args()
+
+    paths = sorted({p for pattern in (args.inputs or DEFAULT_PATTERNS) for p in glob.glob(pattern)})
+    if not paths:
+        print("❌ No eksisozluk_dataset_*.json files found. Run collect_data.py first or pass the files explicitly.")
+        return
+
+    print(f"📖 Reading {len(paths)} dataset file(s)")
+    meta = build_idf_index(iter_entries(paths), args.out, min_df=args.min_df,
+                           max_features=args.max_features or None, sources=paths)
+    print(f"\n✅ IDF index: {meta['num_terms']} terms from {meta['num_docs']} entries (min_df={meta['min_df']})")
+    print(f"   Saved to {os.path.abspath(args.out)}")
+    print("💡 NLPService loads it automatically from models/keyword_idf (or set KEYWORD_IDF_INDEX)")
+
+
+if __name__ == '__main__':
+    main()
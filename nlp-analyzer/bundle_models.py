@@ -0,0 +1,58 @@
+"""
+Sentiment (PEFT adapter'ı gömülü) ve tema modellerini offline bir pakete yazan script.
+Modeller NLPService ile aynı şekilde (SENTIMENT_MODEL_NAME / SENTIMENT_ADAPTER_NAME dahil) yüklenir,
+safetensors olarak kaydedilir ve manifest.json oluşturulur.
+Ardından NLP_MODEL_BUNDLE=<klasör> ile servis hub'a gitmeden, ağırlıkları mmap ile okuyarak bu paketten yüklenir.
+
+Kullanım:
+    python bundle_models.py
+    python bundle_models.py --out models/bundle-v2
+"""
+
+import argparse
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+# Paket her zaman fp32 PyTorch ağırlıklarından, CPU üzerinde oluşturulur; önbellekler gereksiz
+os.environ['NLP_BACKEND'] = 'torch'
+os.environ['NLP_DEVICE'] = 'cpu'
+os.environ['NLP_PRECISION'] = 'fp32'
+os.environ['NLP_CACHE_ENABLE'] = 'false'
+os.environ['SENTENCE_CACHE_ENABLE'] = 'false'
+os.environ.pop('NLP_MODEL_BUNDLE', None)
+
+from services.model_bundle import save_bundle_model, write_manifest
+from services.nlp_service import NLPService
+
+DEFAULT_OUT = os.path.join(os.path.dirname(__file__), 'models', 'bundle')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bundle the sentiment and topic models as local safetensors")
+    parser.add_argument('--out', default=DEFAULT_OUT, help='Paket klasörü (varsayılan: models/bundle)')
+    args = parser.parse_args()
+
+    nlp_service = NLPService()
+    import torch
+    import transformers
+
+    models = {}
+    for name, model, tokenizer, source, adapter in (
+        ('sentiment', nlp_service.sentiment_model, nlp_service.sentiment_tokenizer,
+         nlp_service.sentiment_model_name, nlp_service.sentiment_adapter_name),
+        ('topic', nlp_service.topic_model, nlp_service.topic_tokenizer, nlp_service.topic_model_name, ''),
+    ):
+        print(f"\n📦 Bundling {name} model ({source}{' + ' + adapter if adapter else ''})")
+        models[name] = save_bundle_model(args.out, name, model, tokenizer, source, adapter)
+        size_mb = sum(f['bytes'] for f in models[name]['files'].values()) / (1024 * 1024)
+        print(f"   ✅ {os.path.join(args.out, name)} ({size_mb:.1f} MB)")
+
+    path = write_manifest(args.out, models, transformers=transformers.__version__, torch=torch.__version__)
+    print(f"\n✅ Manifest: {path}")
+    print(f"💡 Set NLP_MODEL_BUNDLE={os.path.abspath(args.out)} to load from this bundle")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Sentiment ve tema modellerini ONNX'e aktaran script.
+Modeller NLPService ile aynı şekilde (SENTIMENT_MODEL_NAME / SENTIMENT_ADAPTER_NAME dahil) yüklenir,
+grafik optimizasyonları uygulanır ve sonuç models/onnx/ altına yazılır.
+Ardından NLP_BACKEND=onnx ile servis bu modelleri ONNX Runtime üzerinden çalıştırır.
+
+Kullanım:
+    python export_onnx.py
+    python export_onnx.py --models topic --no-optimize
+"""
+
+import argparse
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+# Export her zaman fp32 PyTorch ağırlıklarından, CPU üzerinde yapılır; önbellekler gereksiz
+os.environ['NLP_BACKEND'] = 'torch'
+os.environ['NLP_DEVICE'] = 'cpu'
+os.environ['NLP_PRECISION'] = 'fp32'
+os.environ['NLP_CACHE_ENABLE'] = 'false'
+os.environ['SENTENCE_CACHE_ENABLE'] = 'false'
+
+from services.nlp_service import NLPService
+from services.onnx_backend import export_classifier, onnx_model_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the sentiment and topic models to ONNX")
+    parser.add_argument('--models', default='sentiment,topic', help="Virgülle: sentiment, topic")
+    parser.add_argument('--opset', type=int, default=17)
+    parser.add_argument('--no-optimize', action='store_true', help='Grafik optimizasyonlarını atla')
+    args = parser.parse_args()
+    wanted = {m.strip() for m in args.models.split(',') if m.strip()}
+
+    nlp_service = NLPService()
+    targets = []
+    if 'sentiment' in wanted:
+        targets.append((
+            'sentiment', nlp_service.sentiment_model, nlp_service.sentiment_tokenizer,
+            onnx_model_dir(nlp_service.model_cache_dir, nlp_service.sentiment_model_name,
+                           nlp_service.sentiment_adapter_name)
+        ))
+    if 'topic' in wanted:
+        targets.append((
+            'topic', nlp_service.topic_model, nlp_service.topic_tokenizer,
+            onnx_model_dir(nlp_service.model_cache_dir, nlp_service.topic_model_name)
+        ))
+
+    for name, model, tokenizer, out_dir in targets:
+        print(f"\n📦 Exporting {name} model -> {os.path.abspath(out_dir)}")
+        path = export_classifier(model, tokenizer, out_dir, opset=args.opset, optimize=not args.no_optimize)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        print(f"   ✅ {path} ({size_mb:.1f} MB)")
+
+    print("\n💡 Set NLP_BACKEND=onnx to serve from ONNX Runtime")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+analyze_test_data.py --dump-probs ile kaydedilen cümle olasılıklarını model yüklemeden
+yeniden oylayıp LAST_WEIGHT_*, eşitlik marjı ve neutral eşiklerini RDuygu'ya göre tarayan script
+
+Kullanım:
+    python analyze_test_data.py test2.xlsx Sonuc.xlsx all --dump-probs probs.npz
+    python rescore_sentiment.py probs.npz --last-short 1.0,1.1,1.5 --tie-margin 0.2,0.35,0.5
+"""
+
+import argparse
+import itertools
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from services.sentiment_voting import NEGATIVE, NEUTRAL, POSITIVE, VotingParams, precompute, vote
+
+# SENTIMENTS sırası (pos, neg, neu) -> RDuygu kodları (0=negative, 1=neutral, 2=positive)
+TO_RDUYGU = np.zeros(3, dtype=np.int64)
+TO_RDUYGU[[POSITIVE, NEGATIVE, NEUTRAL]] = [2, 0, 1]
+
+
+def _floats(value: str) -> list:
+    return [float(v) for v in value.split(',') if v.strip()]
+
+
+def _bools(value: str) -> list:
+    return [v.strip().lower() in ('1', 'true', 'yes', 'on') for v in value.split(',') if v.strip()]
+
+
+def macro_f1(true: np.ndarray, pred: np.ndarray) -> float:
+    scores = []
+    for c in (0, 1, 2):
+        tp = np.sum((pred == c) & (true == c))
+        fp = np.sum((pred == c) & (true != c))
+        fn = np.sum((pred != c) & (true == c))
+        denom = 2 * tp + fp + fn
+        scores.append(2 * tp / denom if denom else 0.0)
+    return float(np.mean(scores))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grid-search sentiment voting parameters over dumped probabilities")
+    parser.add_argument('dump', help='analyze_test_data.py --dump-probs çıktısı (.npz)')
+    parser.add_argument('--last-short', type=_floats, help='LAST_WEIGHT_SHORT adayları (virgülle)')
+    parser.add_argument('--last-medium', type=_floats, help='LAST_WEIGHT_MEDIUM adayları')
+    parser.add_argument('--last-long', type=_floats, help='LAST_WEIGHT_LONG adayları')
+    parser.add_argument('--tie-margin', type=_floats, help='SENTIMENT_TIE_MARGIN adayları')
+    parser.add_argument('--neutral-min-conf', type=_floats, help='SENTIMENT_NEUTRAL_MIN_CONF adayları')
+    parser.add_argument('--neutral-runner-up', type=_floats, help='SENTIMENT_NEUTRAL_RUNNERUP_MIN adayları')
+    parser.add_argument('--lexicon', type=_bools, help='SENTIMENT_LEXICON_ENABLE adayları (örn. false,true)')
+    parser.add_argument('--metric', choices=('accuracy', 'macro_f1'), default='accuracy')
+    parser.add_argument('--top', type=int, default=10, help='Yazdırılacak en iyi kombinasyon sayısı')
+    parser.add_argument('--csv', help='Tüm kombinasyonların sonuçlarını CSV olarak kaydet')
+    args = parser.parse_args()
+
+    data = np.load(args.dump)
+    baseline = VotingParams(**json.loads(str(data['voting'])))
+    rduygu = data['rduygu']
+    tduygu = data['tduygu']
+    lexicon = data['lexicon']
+    print(f"📖 {len(rduygu)} entries, {data['probs'].shape[0]} sentences, model: {data['model']}")
+
+    pre = precompute(data['probs'], data['offsets'], data['class_to_sentiment'], data['class_known'])
+    # Değerlendirme: RDuygu'su olan ve analizi başarılı (cümlesi olan) entry'ler
+    mask = (rduygu >= 0) & pre['live']
+    true = rduygu[mask]
+    print(f"   Labeled entries used for scoring: {int(mask.sum())}")
+
+    def evaluate(params: VotingParams) -> dict:
+        sent, _ = vote(pre, params, lexicon)
+        pred = TO_RDUYGU[sent][mask]
+        return {'accuracy': float(np.mean(pred == true)) if len(true) else 0.0,
+                'macro_f1': macro_f1(true, pred)}
+
+    # Parite kontrolü: dump'taki ayarlarla kernel, servisin yazdığı Tduygu'yu üretmeli
+    sent, _ = vote(pre, baseline, lexicon)
+    served = (tduygu >= 0) & pre['live']
+    if served.any():
+        agreement = np.mean(TO_RDUYGU[sent][served] == tduygu[served])
+        print(f"   Kernel vs Tduygu agreement (dump params): {agreement:.2%}")
+    base_scores = evaluate(baseline)
+    print(f"   Baseline accuracy: {base_scores['accuracy']:.2%}  macro-F1: {base_scores['macro_f1']:.4f}")
+
+    grid = {
+        'last_weight_short': args.last_short or [baseline.last_weight_short],
+        'last_weight_medium': args.last_medium or [baseline.last_weight_medium],
+        'last_weight_long': args.last_long or [baseline.last_weight_long],
+        'tie_margin': args.tie_margin or [baseline.tie_margin],
+        'neutral_min_conf': args.neutral_min_conf or [baseline.neutral_min_conf],
+        'neutral_runner_up_min': args.neutral_runner_up or [baseline.neutral_runner_up_min],
+        'lexicon': args.lexicon or [baseline.lexicon],
+    }
+    names = list(grid)
+    combos = list(itertools.product(*grid.values()))
+    print(f"\n🔬 Scoring {len(combos)} parameter combinations...")
+
+    t0 = time.perf_counter()
+    rows = []
+    for values in combos:
+        params = VotingParams(**dict(zip(names, values)))
+        rows.append({**dict(zip(names, values)), **evaluate(params)})
+    elapsed = time.perf_counter() - t0
+    print(f"   Done in {elapsed:.2f}s ({elapsed / len(combos) * 1000:.2f} ms per combination)")
+
+    results = pd.DataFrame(rows).sort_values(args.metric, ascending=False, kind='stable')
+    print(f"\n🏆 Top {args.top} by {args.metric}:")
+    print(results.head(args.top).to_string(index=False))
+
+    best = results.iloc[0]
+    print("\n💡 Suggested .env settings:")
+    print(f"   LAST_WEIGHT_SHORT={best['last_weight_short']}")
+    print(f"   LAST_WEIGHT_MEDIUM={best['last_weight_medium']}")
+    print(f"   LAST_WEIGHT_LONG={best['last_weight_long']}")
+    print(f"   SENTIMENT_TIE_MARGIN={best['tie_margin']}")
+    print(f"   SENTIMENT_NEUTRAL_MIN_CONF={best['neutral_min_conf']}")
+    print(f"   SENTIMENT_NEUTRAL_RUNNERUP_MIN={best['neutral_runner_up_min']}")
+    print(f"   SENTIMENT_LEXICON_ENABLE={'true' if best['lexicon'] else 'false'}")
+
+    if args.csv:
+        results.to_csv(args.csv, index=False)
+        print(f"\n✅ All results saved to: {args.csv}")
+
+
+if __name__ == '__main__':
+    main()
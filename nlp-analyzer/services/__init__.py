@@ -1,5 +1,9 @@
 """Services package"""
-from .nlp_service import NLPService
+from .nlp_service import NLPService, PreparedText
 from .eksisozluk_service import EksiSozlukService
+from .micro_batcher import MicroBatcher
+from .inference_workers import InferenceWorkerPool
+from .result_cache import ResultCache
+from .sentiment_voting import VotingParams
 
-__all__ = ['NLPService', 'EksiSozlukService']
+__all__ = ['NLPService', 'PreparedText', 'EksiSozlukService', 'MicroBatcher', 'InferenceWorkerPool', 'ResultCache', 'VotingParams']
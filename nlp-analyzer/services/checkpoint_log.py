@@ -0,0 +1,93 @@
+"""
+Checkpoint Günlüğü
+Toplu analiz tahminlerini satır satır, sadece ekleme yapılan bir JSONL dosyasına yazar.
+Her kayıt satır id'si ve metin özeti (hash) ile anahtarlanır; --resume ile yeniden başlatılan bir çalışma
+girdisi değişmemiş satırları atlayıp nihai çıktıyı günlükten kurar. --resume olmadan başlatılan bir çalışma
+dolu bir günlüğün üzerine yazmaz; eski günlük zaman damgalı bir isme taşınır.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+
+def text_hash(text: str) -> str:
+    """Satırın hâlâ aynı metni taşıdığını doğrulamak için kısa sha1 özeti."""
+    return hashlib.sha1(str(text).encode('utf-8')).hexdigest()[:16]
+
+
+class CheckpointLog:
+    """Satır id'si -> tahmin kaydı tutan, sadece ekleme yapılan JSONL günlüğü"""
+
+    def __init__(self, path: str, resume: bool = False):
+        """
+        Args:
+            path (str): Günlük dosyası
+            resume (bool): True ise mevcut kayıtlar okunur ve dosyaya eklenir; False ise boş olmayan mevcut
+                           günlük zaman damgalı isme taşınır (bkz. rotated_to) ve yeni günlük açılır
+        """
+        self.path = path
+        self.records = {}
+        self.appended = 0  # bu çalışmada eklenen kayıt sayısı (geri yüklenenler hariç)
+        self.rotated_to = None
+        if resume and os.path.exists(path):
+            self._drop_partial_line(path)
+            self.records = self._read(path)
+        elif not resume and os.path.exists(path) and os.path.getsize(path) > 0:
+            self.rotated_to = self._rotate(path)
+        self._file = open(path, 'a' if resume else 'w', encoding='utf-8')
+
+    @staticmethod
+    def _rotate(path: str) -> str:
+        # Önceki çalışmanın ilerlemesi silinmesin: <ad>.<zaman damgası><uzantı>
+        base, ext = os.path.splitext(path)
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        target = f"{base}.{stamp}{ext}"
+        n = 1
+        while os.path.exists(target):
+            target = f"{base}.{stamp}-{n}{ext}"
+            n += 1
+        os.replace(path, target)
+        return target
+
+    @staticmethod
+    def _drop_partial_line(path: str):
+        # Çökme anında yarım kalan son satırı kes; yoksa sonraki kayıt ona yapışır
+        with open(path, 'rb+') as f:
+            data = f.read()
+            if data and not data.endswith(b'\n'):
+                f.truncate(data.rfind(b'\n') + 1)
+
+    @staticmethod
+    def _read(path: str) -> dict:
+        records = {}
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                records[str(record['row'])] = record  # aynı satır tekrar yazıldıysa sonuncusu geçerli
+        return records
+
+    def get(self, row_id, text: str):
+        """Satır daha önce aynı metinle işlendiyse kaydını, değilse None döndür."""
+        record = self.records.get(str(row_id))
+        if record is not None and record.get('hash') == text_hash(text):
+            return record
+        return None
+
+    def append(self, row_id, text: str, **values):
+        record = {'row': row_id, 'hash': text_hash(text), **values}
+        self.records[str(row_id)] = record
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+        self.appended += 1
+
+    def flush(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self.flush()
+        self._file.close()
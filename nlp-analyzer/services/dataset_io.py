@@ -0,0 +1,181 @@
+"""
+Parça Parça Veri Okuma / Yazma
+Toplu analiz scriptleri için tüm dosyayı belleğe almadan CSV, JSONL, Parquet ve xlsx (openpyxl read-only)
+okuyucular; tahminleri geldikçe ekleyen JSONL / Parquet yazıcılar ve isteğe bağlı son adım Excel dışa aktarımı.
+Parquet için pyarrow gerekir (pip install pyarrow).
+"""
+
+import json
+import math
+import os
+from typing import Iterator, Optional
+
+import pandas as pd
+
+READ_FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.parquet': 'parquet',
+                '.xlsx': 'xlsx', '.xlsm': 'xlsx'}
+SINK_FORMATS = {'.jsonl': 'jsonl', '.ndjson': 'jsonl', '.parquet': 'parquet'}
+
+
+def _format(path: str, formats: dict) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in formats:
+        raise ValueError(f"Unsupported file type '{ext}' for {path} (supported: {', '.join(sorted(formats))})")
+    return formats[ext]
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet support needs pyarrow. Please run 'pip install pyarrow'.")
+    return pq
+
+
+def iter_chunks(path: str, chunk_rows: int = 1000) -> Iterator[pd.DataFrame]:
+    """
+    Dosyayı chunk_rows satırlık DataFrame'ler halinde oku (uzantıya göre biçim seçilir).
+
+    Yields:
+        pd.DataFrame: Sıralı parçalar; index dosyadaki satır numarasıdır (başlık hariç, 0'dan)
+    """
+    fmt = _format(path, READ_FORMATS)
+    offset = 0
+    if fmt == 'csv':
+        chunks = pd.read_csv(path, chunksize=chunk_rows)
+    elif fmt == 'jsonl':
+        chunks = pd.read_json(path, lines=True, chunksize=chunk_rows)
+    elif fmt == 'parquet':
+        pq = _require_pyarrow()
+        chunks = (batch.to_pandas() for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows))
+    else:
+        chunks = _iter_xlsx(path, chunk_rows)
+
+    for chunk in chunks:
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+        offset += len(chunk)
+        yield chunk
+
+
+def _iter_xlsx(path: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    # read_only modunda openpyxl satırları diskten akıtır; ilk sayfanın ilk satırı başlıktır
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(c) if c is not None else f"Unnamed: {i}" for i, c in enumerate(header)]
+        buffer = []
+        for row in rows:
+            if row is None or all(v is None for v in row):
+                continue
+            buffer.append(row[:len(columns)])
+            if len(buffer) >= chunk_rows:
+                yield pd.DataFrame.from_records(buffer, columns=columns)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame.from_records(buffer, columns=columns)
+    finally:
+        workbook.close()
+
+
+class JsonlSink:
+    """Her write() çağrısında satırları JSONL dosyasına ekler ve diske boşaltır"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows = 0
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def write(self, df: pd.DataFrame):
+        if len(df):
+            text = df.to_json(orient='records', lines=True, force_ascii=False, date_format='iso')
+            self._file.write(text if text.endswith('\n') else text + '\n')
+            self._file.flush()
+            self.rows += len(df)
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetSink:
+    """Her write() çağrısını aynı şemayla yeni bir row group olarak Parquet dosyasına ekler"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows = 0
+        self._pq = _require_pyarrow()
+        self._writer = None
+
+    def write(self, df: pd.DataFrame):
+        import pyarrow as pa
+
+        if not len(df):
+            return
+        if self._writer is None:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            self._writer = self._pq.ParquetWriter(self.path, table.schema)
+        else:
+            # Şema ilk parçadan gelir; sonraki parçalar ona göre dönüştürülür
+            table = pa.Table.from_pandas(df, schema=self._writer.schema, preserve_index=False)
+        self._writer.write_table(table)
+        self.rows += len(df)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def open_sink(path: str):
+    """Uzantıya göre JSONL veya Parquet yazıcı döndür (with bloğu ile kullanılabilir)."""
+    return _SinkContext(JsonlSink(path) if _format(path, SINK_FORMATS) == 'jsonl' else ParquetSink(path))
+
+
+class _SinkContext:
+    def __init__(self, sink):
+        self.sink = sink
+
+    def __enter__(self):
+        return self.sink
+
+    def __exit__(self, *exc):
+        self.sink.close()
+        return False
+
+
+def export_excel(source_path: str, excel_path: str, chunk_rows: int = 5000) -> int:
+    """
+    JSONL / Parquet çıktısını openpyxl write-only modunda satır satır Excel'e aktar.
+
+    Returns:
+        int: Yazılan satır sayısı
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    rows = 0
+    header: Optional[list] = None
+    for chunk in iter_chunks(source_path, chunk_rows):
+        if header is None:
+            header = list(chunk.columns)
+            sheet.append(header)
+        for values in chunk.reindex(columns=header).itertuples(index=False, name=None):
+            sheet.append([_excel_value(v) for v in values])
+        rows += len(chunk)
+    workbook.save(excel_path)
+    return rows
+
+
+def _excel_value(value):
+    if value is None or value is pd.NA or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    if hasattr(value, 'item'):  # numpy skalerleri
+        return value.item()
+    return value
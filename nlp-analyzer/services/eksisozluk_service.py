@@ -11,6 +11,14 @@ from typing import Optional, Dict, List
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from . import tracing
+from .metrics import Counter, Histogram
+
+UPSTREAM_SECONDS = Histogram('eksi_api_request_duration_seconds', 'Ekşi Sözlük API çağrı süresi (retry dahil)',
+                             ('operation',))
+UPSTREAM_REQUESTS = Counter('eksi_api_requests_total', 'Ekşi Sözlük API çağrıları (outcome: ok, error, offline)',
+                            ('operation', 'outcome'))
+
 
 class EksiSozlukService:
     """Ekşi Sözlük API ile iletişim için servis sınıfı"""
@@ -62,11 +70,10 @@ class EksiSozlukService:
             list: Bulunan başlıklar
         """
         try:
-            if self._is_offline():
+            if self._is_offline('search'):
                 return []
             url = f"{self.api_endpoint}/ara/{query}"
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
+            response = self._get('search', url, self.timeout)
             
             data = response.json()
             # API { thread_count, threads } formatında döndürüyor
@@ -89,11 +96,10 @@ class EksiSozlukService:
             list: Önerilen başlıklar
         """
         try:
-            if self._is_offline():
+            if self._is_offline('autocomplete'):
                 return []
             url = f"{self.api_endpoint}/autocomplete/{query}"
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
+            response = self._get('autocomplete', url, self.timeout)
             
             data = response.json()
             return data if data else []
@@ -114,7 +120,7 @@ class EksiSozlukService:
             dict: Başlık bilgileri ve entry'ler
         """
         try:
-            if self._is_offline():
+            if self._is_offline('topic'):
                 return None
             # Sayfa numarasını URL'e ekle
             if page > 1:
@@ -122,8 +128,7 @@ class EksiSozlukService:
             else:
                 url = f"{self.api_endpoint}/baslik/{slug}"
             
-            response = self.session.get(url, timeout=max(self.timeout, 30))
-            response.raise_for_status()
+            response = self._get('topic', url, max(self.timeout, 30))
             
             data = response.json()
             
@@ -247,11 +252,10 @@ class EksiSozlukService:
             dict: Entry bilgileri
         """
         try:
-            if self._is_offline():
+            if self._is_offline('entry'):
                 return None
             url = f"{self.api_endpoint}/entry/{entry_id}"
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
+            response = self._get('entry', url, self.timeout)
             
             return response.json()
         except requests.RequestException as e:
@@ -267,11 +271,10 @@ class EksiSozlukService:
             list: Gündem başlıkları
         """
         try:
-            if self._is_offline():
+            if self._is_offline('trending'):
                 return []
             url = f"{self.api_endpoint}/basliklar"
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
+            response = self._get('trending', url, self.timeout)
             
             data = response.json()
             return data if isinstance(data, list) else []
@@ -288,11 +291,10 @@ class EksiSozlukService:
             dict: Debe bilgileri
         """
         try:
-            if self._is_offline():
+            if self._is_offline('debe'):
                 return None
             url = f"{self.api_endpoint}/debe"
-            response = self.session.get(url, timeout=max(self.timeout, 30))  # Debe yavaş olabilir
-            response.raise_for_status()
+            response = self._get('debe', url, max(self.timeout, 30))  # Debe yavaş olabilir
             
             return response.json()
         except requests.RequestException as e:
@@ -311,11 +313,10 @@ class EksiSozlukService:
             dict: Kullanıcı bilgileri
         """
         try:
-            if self._is_offline():
+            if self._is_offline('user'):
                 return None
             url = f"{self.api_endpoint}/biri/{username}"
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
+            response = self._get('user', url, self.timeout)
             
             return response.json()
         except requests.RequestException as e:
@@ -331,16 +332,38 @@ class EksiSozlukService:
             str: 'online' veya 'offline'
         """
         try:
-            response = self.session.get(self.api_endpoint, timeout=5)
+            response = self._get('status', self.api_endpoint, 5, check=False)
             return 'online' if response.status_code == 200 else 'offline'
         except:
             return 'offline'
 
+    def _get(self, operation: str, url: str, timeout: float, check: bool = True):
+        """GET isteği (check=True ise HTTP hata kodunda raise); süre ve sonuç metriklere yazılır."""
+        started = time.perf_counter()
+        headers = {tracing.REQUEST_ID_HEADER: tracing.current_request_id()} if tracing.current() else None
+        try:
+            response = self.session.get(url, timeout=timeout, headers=headers)
+            if check:
+                response.raise_for_status()
+        except Exception:
+            UPSTREAM_REQUESTS.labels(operation, 'error').inc()
+            tracing.add(eksi_api_errors=1)
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            UPSTREAM_SECONDS.labels(operation).observe(elapsed)
+            tracing.record(f"eksi_api.{operation}", elapsed)
+        UPSTREAM_REQUESTS.labels(operation, 'ok').inc()
+        return response
+
     # ---- Circuit breaker helpers ----
-    def _is_offline(self) -> bool:
+    def _is_offline(self, operation: str = None) -> bool:
         """Devre kesici: geçici olarak offline ise talepleri reddet."""
         now = time.time()
-        return now < self._offline_until
+        offline = now < self._offline_until
+        if offline and operation:
+            UPSTREAM_REQUESTS.labels(operation, 'offline').inc()
+        return offline
 
     def _trip_offline(self):
         """Bir hata sonrası offline durumuna geç."""
@@ -0,0 +1,551 @@
+"""
+Inference Worker Havuzu
+Her biri kendi NLPService kopyasını ve sabit torch thread sayısını tutan N ayrı süreç.
+Flask thread'leri sadece metinleri kuyruğa yazar; ön/son işleme ve forward pass worker süreçlerinde
+çalıştığı için GIL ve tek model nesnesi üzerindeki çekişme ortadan kalkar.
+NLPService ile aynı analiz / hazırlık arayüzünü sunar (app.py hangisinin kullanıldığını bilmez).
+call(..., timeout=...) süreyi görevin worker'da başladığı andan ölçer; süre aşılırsa takılan worker
+öldürülüp aynı id ile yeniden başlatılır (recycle). NLPService arayüzü çağrıları da NLP_TIMEOUT_SEC
+(entry başına, varsayılan 45) ile sınırlıdır.
+İstatistik istekleri (cache_stats, stage_timings, metrics_snapshot) ayrı bir kontrol kuyruğundan worker'daki
+ayrı bir thread tarafından yanıtlanır; çalışan bir batch'in arkasında beklemez ve yük dağılımına sayılmaz.
+"""
+
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FuturesTimeout
+from typing import Dict, Optional
+
+from . import tracing
+from .metrics import merge_families, with_labels
+from .sentiment_voting import VotingParams
+
+# Worker'da çağrılabilecek NLPService metodları
+ALLOWED_METHODS = {
+    'analyze_sentiment', 'analyze_sentiment_batch',
+    'analyze_theme', 'analyze_theme_batch',
+    'analyze_combined', 'analyze_combined_batch',
+    'sentiment_probs_batch', 'sentiment_label_map',
+}
+# Kontrol kuyruğundan çağrılabilecek, sadece sayaç / istatistik okuyan metodlar
+CONTROL_METHODS = {'cache_stats', 'stage_timings', 'metrics_snapshot'}
+ANALYSES = ('sentiment', 'theme', 'combined')
+STATE_POLL_SEC = 0.2
+WORKER_CHECK_SEC = 1.0
+# Hazır olmadan ölen worker'lar üstel bekleme ile (NLP_WORKER_RESPAWN_SEC, 2x, 4x, ...) yeniden başlatılır;
+# art arda NLP_WORKER_RESPAWN_MAX denemeden sonra vazgeçilir (worker 'failed' kalır)
+RESPAWN_MIN_INTERVAL_SEC = float(os.getenv('NLP_WORKER_RESPAWN_SEC', '5'))
+RESPAWN_MAX_ATTEMPTS = int(os.getenv('NLP_WORKER_RESPAWN_MAX', '5'))
+
+
+def _serve_control(service, worker_id: int, control_queue, result_queue):
+    """Worker içindeki kontrol thread'i: istatistik isteklerini inference'tan bağımsız yanıtlar."""
+    while True:
+        request = control_queue.get()
+        if request is None:
+            return
+        request_id, method = request
+        try:
+            result = getattr(service, method)()
+        except Exception as e:
+            result_queue.put(('control', worker_id, request_id, False, f"{type(e).__name__}: {e}"))
+        else:
+            result_queue.put(('control', worker_id, request_id, True, result))
+
+
+def _worker_main(worker_id: int, torch_threads: int, task_queue, control_queue, result_queue):
+    """Worker süreci: modelleri yükler, görev kuyruğunu tüketir, sonuçları result_queue'ya yazar."""
+    # torch / ONNX Runtime import edilmeden önce ayarlanmalı (NLPService bunları gecikmeli import eder)
+    for var in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'ORT_NUM_THREADS'):
+        os.environ[var] = str(torch_threads)
+
+    from .nlp_service import NLPService
+
+    service = NLPService(load=False)
+    if service.backend != 'onnx':
+        import torch
+
+        torch.set_num_threads(torch_threads)
+        torch.set_num_interop_threads(1)
+    load_thread = service.start_background_load()
+
+    def _report_state():
+        # Bileşen hazır oldukça ana sürece bildir (tema modeli duygudan önce hazır olabilir)
+        last = None
+        while True:
+            done = not load_thread.is_alive()
+            state = service.readiness()
+            key = (state['status'], tuple(sorted(state['analyses'].items())))
+            if key != last:
+                result_queue.put(('state', worker_id, state))
+                last = key
+            if done:
+                return
+            time.sleep(STATE_POLL_SEC)
+
+    threading.Thread(target=_report_state, name='worker-state', daemon=True).start()
+    threading.Thread(
+        target=_serve_control, args=(service, worker_id, control_queue, result_queue),
+        name='worker-control', daemon=True,
+    ).start()
+
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        task_id, method, args, kwargs = task
+        load_thread.join()
+        # Zaman aşımı model yükleme / kuyruk beklemesini değil sadece çalışmayı kapsasın
+        result_queue.put(('start', worker_id, task_id))
+        try:
+            result = getattr(service, method)(*args, **kwargs)
+        except Exception as e:
+            result_queue.put(('result', worker_id, task_id, False, f"{type(e).__name__}: {e}"))
+        else:
+            result_queue.put(('result', worker_id, task_id, True, result))
+
+
+class InferenceWorkerPool:
+    """NLPService yerine kullanılan, görevleri worker süreçlerine dağıtan havuz"""
+
+    def __init__(self, num_workers: int = None, torch_threads: int = None):
+        """
+        Havuz başlatıcı (süreçler start() / start_background_load() ile başlar)
+
+        Args:
+            num_workers (int): Worker süreci sayısı (varsayılan: NLP_WORKERS)
+            torch_threads (int): Worker başına torch thread sayısı
+                                 (varsayılan: NLP_WORKER_THREADS, yoksa çekirdek sayısı / worker)
+        """
+        self.num_workers = max(1, num_workers or int(os.getenv('NLP_WORKERS', '1')))
+        default_threads = max(1, (os.cpu_count() or 1) // self.num_workers)
+        self.torch_threads = torch_threads or int(os.getenv('NLP_WORKER_THREADS', str(default_threads)))
+        # NLPService arayüzü (Flask) çağrılarında entry başına zaman aşımı; aşılırsa worker recycle edilir (0: kapalı)
+        self.call_timeout = float(os.getenv('NLP_TIMEOUT_SEC', '45'))
+        # Worker'lar aynı ortam değişkenlerini okur; oylama ayarları burada da aynıdır
+        self.voting = VotingParams.from_env()
+
+        # Worker'lar modelleri yeniden yükler; fork torch/CUDA durumunu kopyalayacağı için spawn
+        self._ctx = mp.get_context('spawn')
+        self._result_queue = self._ctx.Queue()
+        self._workers: Dict[int, dict] = {}
+        self._pending: Dict[int, tuple] = {}  # task_id -> (worker_id, Future)
+        self._started: Dict[int, float] = {}  # task_id -> worker'da başlama zamanı (monotonic)
+        self._control: Dict[int, tuple] = {}  # kontrol isteği id'si -> (worker_id, Future)
+        self._task_ids = itertools.count()
+        self._lock = threading.Lock()
+        self._collector: Optional[threading.Thread] = None
+        self._closed = False
+
+    # ------------------------------------------------------------------ yaşam döngüsü
+
+    def start(self):
+        """Worker süreçlerini başlat (model yükleme her worker'da arka planda sürer)."""
+        if mp.parent_process() is not None:
+            # spawn, `python app.py` ile çalışırken app.py'yi worker'da yeniden import eder; orada havuz açılmaz
+            return
+        with self._lock:
+            if self._collector is not None:
+                return
+            for worker_id in range(self.num_workers):
+                self._spawn(worker_id)
+            self._collector = threading.Thread(target=self._collect, name='inference-collector', daemon=True)
+            self._collector.start()
+        print(f"Started {self.num_workers} inference workers ({self.torch_threads} torch threads each)")
+
+    def start_background_load(self):
+        """NLPService ile aynı isim: worker'ları başlatır, beklemez."""
+        self.start()
+
+    def load(self, timeout: float = None):
+        """Worker'ları başlat ve hepsi hazır olana kadar bekle; yükleme başarısızsa hata yükselt."""
+        self.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            state = self.readiness()
+            if state['status'] == 'ready':
+                return
+            if state['status'] == 'failed':
+                raise RuntimeError(f"Inference workers failed to load: {state['workers']}")
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError("Inference workers did not become ready in time")
+            time.sleep(STATE_POLL_SEC)
+
+    def close(self, timeout: float = 10.0):
+        """Worker'lara durma sinyali gönder ve sonlanmalarını bekle."""
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers.values())
+        for worker in workers:
+            for channel in ('tasks', 'control'):
+                try:
+                    worker[channel].put(None)
+                except (OSError, ValueError):
+                    pass
+        for worker in workers:
+            worker['process'].join(timeout)
+            if worker['process'].is_alive():
+                worker['process'].terminate()
+        self._fail_pending(lambda _: True, RuntimeError("Inference worker pool closed"))
+
+    def _spawn(self, worker_id: int):
+        previous = self._workers.get(worker_id, {})
+        tasks = self._ctx.Queue()
+        control = self._ctx.Queue()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(worker_id, self.torch_threads, tasks, control, self._result_queue),
+            name=f"nlp-worker-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        self._workers[worker_id] = {
+            'process': process,
+            'tasks': tasks,
+            'control': control,
+            'state': None,
+            'in_flight': 0,
+            'completed': previous.get('completed', 0),
+            'errors': previous.get('errors', 0),
+            'timeouts': previous.get('timeouts', 0),
+            'restarts': previous.get('restarts', 0),
+            # Hazır olmadan art arda ölme sayısı (başlangıçta çöken worker için üstel bekleme / vazgeçme)
+            'crashes': previous.get('crashes', 0),
+            'died_at': None,
+            'gave_up': False,
+        }
+
+    def recycle(self, worker_id: int, reason: str = 'recycled'):
+        """
+        Worker sürecini öldürüp aynı id ile yeniden başlat (modeller arka planda yeniden yüklenir).
+        Worker'a atanmış bekleyen görevler RuntimeError ile düşürülür.
+        """
+        with self._lock:
+            worker = self._workers[worker_id]
+            if self._closed or worker.get('recycling'):
+                return  # zaman aşımı ve ölüm kontrolü aynı worker'ı iki kez başlatmasın
+            worker['recycling'] = True
+            worker['restarts'] += 1
+        process = worker['process']
+        process.terminate()
+        process.join(5)
+        if process.is_alive():
+            process.kill()
+            process.join()
+        self._fail_pending(lambda wid: wid == worker_id, RuntimeError(f"Inference worker {worker_id} {reason}"))
+        for channel in ('tasks', 'control'):
+            worker[channel].cancel_join_thread()
+            worker[channel].close()
+        with self._lock:
+            if not self._closed:
+                self._spawn(worker_id)
+        print(f"♻️ Inference worker {worker_id} restarted ({reason})")
+
+    # ------------------------------------------------------------------ görev dağıtımı
+
+    def submit(self, method: str, *args, analysis: str = None, **kwargs) -> Future:
+        """
+        Metodu en az meşgul (ve analiz için hazır) worker'a gönder.
+
+        Returns:
+            Future: Worker'ın döndürdüğü sonuç; worker hatası RuntimeError olarak iletilir
+        """
+        if method not in ALLOWED_METHODS:
+            raise ValueError(f"Unsupported worker method: {method}")
+        if self._collector is None:
+            self.start()
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Inference worker pool closed")
+            worker_id = self._pick_worker(analysis)
+            task_id = next(self._task_ids)
+            future.task_id, future.worker_id, future.run_sec = task_id, worker_id, None
+            self._pending[task_id] = (worker_id, future)
+            self._workers[worker_id]['in_flight'] += 1
+            self._workers[worker_id]['tasks'].put((task_id, method, args, kwargs))
+        return future
+
+    def wait(self, future: Future, timeout: float = None):
+        """
+        submit() ile alınan Future'ın sonucunu bekle.
+
+        Args:
+            timeout (float): Görevin worker'da başlamasından itibaren izin verilen süre (saniye);
+                             aşılırsa worker recycle edilir ve TimeoutError yükseltilir
+
+        Returns:
+            Worker'ın döndürdüğü sonuç
+        """
+        if timeout is None:
+            return future.result()
+        while True:
+            with self._lock:
+                started = self._started.get(future.task_id)
+            remaining = STATE_POLL_SEC if started is None else started + timeout - time.monotonic()
+            try:
+                return future.result(timeout=max(0.0, min(remaining, STATE_POLL_SEC)))
+            except FuturesTimeout:
+                if started is None or time.monotonic() < started + timeout or future.done():
+                    continue
+            with self._lock:
+                self._workers[future.worker_id]['timeouts'] += 1
+            self.recycle(future.worker_id, reason=f"timed out after {timeout}s")
+            raise TimeoutError(f"Inference task timeout > {timeout}s on worker {future.worker_id}")
+
+    def call(self, method: str, *args, timeout: float = None, analysis: str = None, **kwargs):
+        """submit() + wait(): WatchdogExecutor.call ile aynı imza."""
+        return self.wait(self.submit(method, *args, analysis=analysis, **kwargs), timeout)
+
+    def _pick_worker(self, analysis: Optional[str]) -> int:
+        # Önce analiz için hazır olan canlı worker'lar; hiçbiri hazır değilse yüklenen bir worker'da sıraya girer
+        alive = [wid for wid, w in self._workers.items() if w['process'].is_alive()]
+        if not alive:
+            raise RuntimeError("No live inference workers")
+        ready = [wid for wid in alive if self._worker_ready(wid, analysis or 'combined')]
+        candidates = ready or alive
+        return min(candidates, key=lambda wid: self._workers[wid]['in_flight'])
+
+    def _worker_ready(self, worker_id: int, analysis: str) -> bool:
+        state = self._workers[worker_id]['state']
+        return bool(state and state['analyses'].get(analysis))
+
+    def _call(self, analysis: Optional[str], method: str, *args, **kwargs):
+        # Worker içindeki aşamalar bu süreçten görünmez; iz tek bir worker span'i olarak kaydeder.
+        # Takılan worker istek thread'ini sonsuza kadar bekletmesin: süre entry sayısıyla ölçeklenir
+        timeout = None
+        if self.call_timeout > 0:
+            entries = len(args[0]) if args and isinstance(args[0], list) else 1
+            timeout = self.call_timeout * max(1, entries)
+        with tracing.span(f"worker.{method}"):
+            return self.wait(self.submit(method, *args, analysis=analysis, **kwargs), timeout)
+
+    def _collect(self):
+        """Sonuç kuyruğunu okuyup Future'ları tamamlar; ölen worker'ları yeniden başlatır."""
+        last_check = time.monotonic()
+        while True:
+            if time.monotonic() - last_check >= WORKER_CHECK_SEC:
+                # Sonuçlar sürekli akarken de ölen worker'lar fark edilsin
+                self._check_workers()
+                last_check = time.monotonic()
+            try:
+                message = self._result_queue.get(timeout=WORKER_CHECK_SEC)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                return
+            kind, worker_id = message[0], message[1]
+            if kind == 'state':
+                with self._lock:
+                    worker = self._workers[worker_id]
+                    worker['state'] = message[2]
+                    if message[2]['status'] == 'ready':
+                        worker['crashes'] = 0
+                continue
+            if kind == 'start':
+                with self._lock:
+                    if message[2] in self._pending:
+                        self._started[message[2]] = time.monotonic()
+                continue
+            if kind == 'control':
+                _, _, request_id, ok, payload = message
+                with self._lock:
+                    entry = self._control.pop(request_id, None)
+                if entry is not None:
+                    entry[1].set_result(payload if ok else {'error': payload})
+                continue
+
+            _, _, task_id, ok, payload = message
+            with self._lock:
+                entry = self._pending.pop(task_id, None)
+                started = self._started.pop(task_id, None)
+                if entry is None:
+                    continue  # _fail_pending ile zaten düşürüldü
+                if started is not None:
+                    entry[1].run_sec = time.monotonic() - started
+                worker = self._workers[worker_id]
+                worker['in_flight'] -= 1
+                worker['completed'] += 1
+                if not ok:
+                    worker['errors'] += 1
+            if ok:
+                entry[1].set_result(payload)
+            else:
+                entry[1].set_exception(RuntimeError(payload))
+
+    def _check_workers(self):
+        """
+        Beklenmedik şekilde ölen worker'ların görevlerini düşür ve worker'ı aynı id ile yeniden başlat.
+        Hazır olmadan ölen worker üstel beklemeyle yeniden denenir; RESPAWN_MAX_ATTEMPTS aşılınca bırakılır.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._closed:
+                return
+            dead = []
+            for wid, w in self._workers.items():
+                if w['process'].is_alive() or w.get('recycling') or w['gave_up']:
+                    continue
+                if w['died_at'] is None:
+                    # İlk fark edildiği an: hazır olamadan öldüyse art arda çökme sayılır
+                    w['died_at'] = now
+                    if not (w['state'] and w['state']['status'] == 'ready'):
+                        w['crashes'] += 1
+                    if w['crashes'] > RESPAWN_MAX_ATTEMPTS:
+                        w['gave_up'] = True
+                dead.append((wid, w['process'].exitcode, w['crashes'], w['died_at'], w['gave_up']))
+        for wid, exitcode, crashes, died_at, gave_up in dead:
+            self._fail_pending(
+                lambda w, wid=wid: w == wid,
+                RuntimeError(f"Inference worker {wid} exited unexpectedly (exit code {exitcode})"),
+            )
+            if gave_up:
+                print(f"❌ Inference worker {wid} keeps exiting before it is ready (exit code {exitcode}); "
+                      f"giving up after {RESPAWN_MAX_ATTEMPTS} restarts")
+                continue
+            delay = RESPAWN_MIN_INTERVAL_SEC * 2 ** (crashes - 1) if crashes else 0.0
+            if now - died_at < delay:
+                continue  # üstel bekleme dolmadı; sonraki kontrolde tekrar bakılır
+            self.recycle(wid, reason=f"exited unexpectedly (exit code {exitcode})")
+
+    def _fail_pending(self, predicate, error: Exception):
+        with self._lock:
+            failed = [(task_id, entry) for task_id, entry in self._pending.items() if predicate(entry[0])]
+            for task_id, (worker_id, _) in failed:
+                del self._pending[task_id]
+                self._started.pop(task_id, None)
+                self._workers[worker_id]['in_flight'] -= 1
+            control = [(rid, entry) for rid, entry in self._control.items() if predicate(entry[0])]
+            for rid, _ in control:
+                del self._control[rid]
+        for _, (_, future) in failed + control:
+            future.set_exception(error)
+
+    # ------------------------------------------------------------------ NLPService arayüzü
+
+    def analyze_sentiment(self, text: str) -> dict:
+        return self._call('sentiment', 'analyze_sentiment', text)
+
+    def analyze_sentiment_batch(self, texts: list, batch_size: int = None) -> list:
+        return self._call('sentiment', 'analyze_sentiment_batch', texts, batch_size)
+
+    def sentiment_probs_batch(self, texts: list, batch_size: int = None) -> list:
+        return self._call('sentiment', 'sentiment_probs_batch', texts, batch_size)
+
+    def sentiment_label_map(self):
+        return self._call('sentiment', 'sentiment_label_map')
+
+    @property
+    def sentiment_model_id(self) -> Optional[str]:
+        with self._lock:
+            states = [w['state'] for w in self._workers.values() if w['state']]
+        return next((s.get('sentiment_model_id') for s in states if s.get('sentiment_model_id')), None)
+
+    def analyze_theme(self, text: str, threshold: float = 0.15) -> dict:
+        return self._call('theme', 'analyze_theme', text, threshold)
+
+    def analyze_theme_batch(self, texts: list, threshold: float = 0.15, batch_size: int = None) -> list:
+        return self._call('theme', 'analyze_theme_batch', texts, threshold, batch_size)
+
+    def analyze_combined(self, text: str) -> dict:
+        return self._call('combined', 'analyze_combined', text)
+
+    def analyze_combined_batch(self, texts: list, threshold: float = 0.15) -> list:
+        return self._call('combined', 'analyze_combined_batch', texts, threshold)
+
+    def is_ready(self, analysis: str = 'combined') -> bool:
+        """En az bir canlı worker analiz için hazırsa True."""
+        with self._lock:
+            return any(
+                w['process'].is_alive() and self._worker_ready(wid, analysis)
+                for wid, w in self._workers.items()
+            )
+
+    def readiness(self) -> dict:
+        """Genel durum ve worker bazında yükleme durumu, bekleyen / tamamlanan görev sayıları."""
+        with self._lock:
+            workers = {}
+            for wid, w in self._workers.items():
+                state = w['state'] or {'status': 'loading', 'analyses': {a: False for a in ANALYSES}}
+                alive = w['process'].is_alive()
+                workers[wid] = {
+                    'pid': w['process'].pid,
+                    'alive': alive,
+                    'status': state['status'] if alive else 'failed',
+                    'in_flight': w['in_flight'],
+                    'completed': w['completed'],
+                    'errors': w['errors'],
+                    'timeouts': w['timeouts'],
+                    'restarts': w['restarts'],
+                    'respawn_exhausted': w['gave_up'],
+                    **{k: v for k, v in state.items() if k not in ('status',)},
+                }
+        statuses = {w['status'] for w in workers.values()}
+        if not workers:
+            status = 'pending'
+        elif statuses == {'ready'}:
+            status = 'ready'
+        elif statuses == {'failed'}:
+            status = 'failed'
+        elif statuses == {'ready', 'failed'}:
+            status = 'degraded'  # kalan worker'lar istek almaya devam eder
+        else:
+            status = 'loading'
+        return {
+            'status': status,
+            'num_workers': self.num_workers,
+            'torch_threads': self.torch_threads,
+            'analyses': {a: any(w['alive'] and w['analyses'].get(a) for w in workers.values()) for a in ANALYSES},
+            'workers': workers,
+        }
+
+    def _broadcast(self, method: str, timeout: float = 5) -> dict:
+        """
+        Kontrol metodunu yüklemesi bitmiş her worker'da çalıştır; worker_<id> -> sonuç (veya hata).
+        İstekler kontrol kuyruğundan gider: inference görevlerinin arkasında beklemez, in_flight'a sayılmaz.
+        """
+        if method not in CONTROL_METHODS:
+            raise ValueError(f"Unsupported control method: {method}")
+        with self._lock:
+            targets = [
+                wid for wid, w in self._workers.items()
+                if w['process'].is_alive() and w['state'] and w['state']['status'] == 'ready'
+            ]
+            futures = {}
+            for wid in targets:
+                request_id = next(self._task_ids)
+                future = Future()
+                self._control[request_id] = (wid, future)
+                self._workers[wid]['control'].put((request_id, method))
+                futures[request_id] = (wid, future)
+        results = {}
+        deadline = time.monotonic() + timeout
+        for request_id, (wid, future) in futures.items():
+            try:
+                results[f"worker_{wid}"] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except Exception as e:
+                with self._lock:
+                    self._control.pop(request_id, None)
+                results[f"worker_{wid}"] = {'error': str(e) or type(e).__name__}
+        return results
+
+    def cache_stats(self) -> dict:
+        """Her worker'ın kendi önbellek istatistikleri (yüklemesi bitmemiş worker'lar atlanır)."""
+        stats = self._broadcast('cache_stats')
+        return {'enabled': any(s.get('enabled') for s in stats.values()), 'workers': stats}
+
+    def stage_timings(self) -> dict:
+        """Her worker'ın istek zamanı aşama süreleri (NLPService.stage_timings)."""
+        return {'workers': self._broadcast('stage_timings')}
+
+    def metrics_snapshot(self) -> list:
+        """Worker'ların metrikleri worker etiketiyle tek family listesinde (yanıt vermeyenler atlanır)."""
+        snapshots = [
+            with_labels(families, worker=key.split('_', 1)[1])
+            for key, families in self._broadcast('metrics_snapshot').items() if isinstance(families, list)
+        ]
+        return merge_families(*snapshots)
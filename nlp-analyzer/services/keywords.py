@@ -0,0 +1,183 @@
+"""
+Anahtar Kelime Çıkarımı (TF-IDF)
+Toplanan eksisozluk_dataset_*.json korpusundan build_idf_index.py ile bir kez üretilen IDF tablosu
+(mmap ile okunan float32 .npy + kelime listesi) kullanılarak entry'lerdeki kelimeler TF-IDF ile sıralanır.
+Skorlama bir batch'teki tüm metinler için tek seferde NumPy ile yapılır.
+İndeks yoksa IDF 1 kabul edilir, yani sıralama eski davranıştaki gibi entry içi frekansa göre olur.
+"""
+
+import json
+import os
+import re
+from collections import Counter
+from datetime import datetime
+from typing import Iterable, Optional
+
+import numpy as np
+
+INDEX_FORMAT = 1
+IDF_FILE = 'idf.npy'
+VOCAB_FILE = 'vocab.json'
+DEFAULT_INDEX_DIR = os.path.join(os.path.dirname(__file__), '..', 'models', 'keyword_idf')
+
+# Genişletilmiş Türkçe stop-words
+STOP_WORDS = frozenset({
+    'bir', 've', 'bu', 'da', 'de', 'için', 'ile', 'mi', 'mı', 'mu', 'mü',
+    'daha', 'çok', 'ama', 'ya', 'gibi', 'şu', 'o', 'ki', 'her', 'ne',
+    'var', 'yok', 'ben', 'sen', 'biz', 'siz', 'onlar', 'şey', 'kadar',
+    'sonra', 'önce', 'artık', 'henüz', 'bile', 'sadece', 'ancak', 'veya',
+    'ise', 'eğer', 'nasıl', 'neden', 'niçin', 'nerede', 'ne zaman',
+    'hiç', 'bazen', 'belki', 'mutlaka', 'kesinlikle', 'zaten', 'aslında',
+    'yani', 'mesela', 'örneğin', 'şimdi', 'böyle', 'şöyle', 'benim',
+    'senin', 'onun', 'bizim', 'sizin', 'diye', 'demek', 'olmak',
+    'etmek', 'yapmak', 'vermek', 'almak', 'görmek', 'buna', 'şunu',
+    'bunu', 'bunun', 'şunun', 'olan', 'oldu', 'olur', 'olarak'
+})
+# 3 harften kısa kelimeler regex'te elenir
+TOKEN_RE = re.compile(r'\b[a-zçğıöşü]{4,}\b')
+
+
+def tokenize(text: str) -> list:
+    """Anahtar kelime adayları: küçük harfli, 3 harften uzun, stop-word olmayan kelimeler (metin sırasıyla)."""
+    return [w for w in TOKEN_RE.findall(str(text).lower()) if w not in STOP_WORDS]
+
+
+def _idf(num_docs: int, doc_freq):
+    # Düzleştirilmiş IDF: ln((1 + N) / (1 + df)) + 1 (her kelime en az 1 ağırlık alır)
+    return np.log((1.0 + num_docs) / (1.0 + np.asarray(doc_freq, dtype=np.float64))) + 1.0
+
+
+def build_idf_index(texts: Iterable[str], out_dir: str, min_df: int = 2, max_features: int = None,
+                    sources: list = None) -> dict:
+    """
+    Metinlerin belge frekanslarından IDF tablosunu oluşturup out_dir'e yaz.
+
+    Args:
+        texts: Korpus metinleri (her biri bir belge)
+        out_dir (str): idf.npy ve vocab.json'un yazılacağı klasör
+        min_df (int): Tabloya girmek için gereken en az belge sayısı
+        max_features (int): En sık geçen bu kadar kelimeyle sınırla (None: sınırsız)
+        sources (list): Manifest'e yazılacak kaynak dosyalar
+
+    Returns:
+        dict: vocab.json içeriği (kelime listesi hariç)
+    """
+    min_df = max(1, min_df)
+    doc_freq = Counter()
+    num_docs = 0
+    for text in texts:
+        num_docs += 1
+        doc_freq.update(set(tokenize(text)))
+
+    kept = [(w, c) for w, c in doc_freq.items() if c >= min_df]
+    if max_features:
+        kept = sorted(kept, key=lambda item: (-item[1], item[0]))[:max_features]
+    kept.sort()
+    words = [w for w, _ in kept]
+
+    os.makedirs(out_dir, exist_ok=True)
+    np.save(os.path.join(out_dir, IDF_FILE), _idf(num_docs, [c for _, c in kept]).astype(np.float32))
+    meta = {
+        'format': INDEX_FORMAT,
+        'num_docs': num_docs,
+        'num_terms': len(words),
+        'min_df': min_df,
+        # Tabloda olmayan kelimeler en az min_df'ten nadirdir; yazım hatalarının öne geçmemesi için
+        # en nadir indekslenen kelimenin ağırlığını alırlar
+        'oov_idf': float(_idf(num_docs, min_df)),
+        'sources': [os.path.basename(s) for s in (sources or [])],
+        'built_at': datetime.now().isoformat(timespec='seconds'),
+    }
+    with open(os.path.join(out_dir, VOCAB_FILE), 'w', encoding='utf-8') as f:
+        json.dump({**meta, 'vocab': words}, f, ensure_ascii=False)
+    return meta
+
+
+class KeywordExtractor:
+    """IDF indeksiyle (varsa) TF-IDF anahtar kelime çıkarıcı"""
+
+    def __init__(self, index_dir: Optional[str] = None):
+        """
+        Args:
+            index_dir (str): build_idf_index çıktısı; None ise frekans sıralaması kullanılır
+        """
+        self.index_dir = index_dir
+        self.meta = {}
+        self.vocab = {}
+        self.idf = None
+        self.oov_idf = 1.0
+        if index_dir:
+            with open(os.path.join(index_dir, VOCAB_FILE), encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('format') != INDEX_FORMAT:
+                raise ValueError(f"Unsupported keyword index format {meta.get('format')} in {index_dir}")
+            self.vocab = {w: i for i, w in enumerate(meta.pop('vocab'))}
+            self.meta = meta
+            # Tablo süreçler arasında paylaşılan sayfa önbelleğinden okunur, belleğe kopyalanmaz
+            self.idf = np.load(os.path.join(index_dir, IDF_FILE), mmap_mode='r')
+            self.oov_idf = meta['oov_idf']
+            if len(self.idf) != len(self.vocab):
+                raise ValueError(f"Keyword index in {index_dir} is inconsistent ({len(self.idf)} != {len(self.vocab)})")
+
+    @classmethod
+    def from_env(cls) -> 'KeywordExtractor':
+        """KEYWORD_IDF_INDEX (varsayılan: models/keyword_idf) klasöründeki indeksle oluştur; yoksa frekans modu."""
+        path = os.getenv('KEYWORD_IDF_INDEX', '').strip()
+        explicit = bool(path)
+        path = path or DEFAULT_INDEX_DIR
+        if not os.path.exists(os.path.join(path, VOCAB_FILE)):
+            if explicit:
+                print(f"  ⚠️ Keyword IDF index not found in {path}, ranking keywords by frequency")
+            return cls()
+        try:
+            extractor = cls(path)
+        except Exception as e:
+            print(f"  ⚠️ Could not load keyword IDF index ({e}), ranking keywords by frequency")
+            return cls()
+        print(f"  Keyword IDF index: {len(extractor.vocab)} terms from {extractor.meta['num_docs']} entries")
+        return extractor
+
+    @property
+    def signature(self) -> tuple:
+        """Sonuç önbelleği anahtarı için indeks kimliği (indeks değişince eski anahtarlar kullanılmaz)."""
+        if self.idf is None or not self.vocab:
+            return ('tf',)
+        return ('tfidf', self.meta['num_docs'], len(self.vocab), self.meta['built_at'])
+
+    def extract(self, text: str, n: int = 8) -> list:
+        return self.extract_batch([text], n)[0]
+
+    def extract_batch(self, texts: list, n: int = 8) -> list:
+        """
+        Her metin için TF-IDF skoru en yüksek n kelime (eşitlikte metinde önce geçen önce).
+
+        Returns:
+            list: Giriş sırasıyla anahtar kelime listeleri
+        """
+        docs = [tokenize(text) for text in texts]
+        lengths = np.fromiter((len(d) for d in docs), dtype=np.int64, count=len(docs))
+        if not lengths.sum():
+            return [[] for _ in texts]
+
+        # Batch içi kelime id'leri; (belge, kelime) çiftleri tek bir np.unique ile sayılır
+        local = {}
+        term_ids = np.array([local.setdefault(w, len(local)) for d in docs for w in d], dtype=np.int64)
+        doc_ids = np.repeat(np.arange(len(docs)), lengths)
+        num_terms = len(local)
+        pairs, first_pos, counts = np.unique(doc_ids * num_terms + term_ids, return_index=True, return_counts=True)
+        pair_doc, pair_term = pairs // num_terms, pairs % num_terms
+
+        words = list(local)
+        if self.idf is None or not self.vocab:
+            # İndeks yok veya sözlüğü boş: entry içi frekans (TF) sıralaması
+            idf = np.ones(num_terms)
+        else:
+            idx = np.array([self.vocab.get(w, -1) for w in words], dtype=np.int64)
+            idf = np.where(idx >= 0, self.idf[np.maximum(idx, 0)], self.oov_idf)
+        scores = counts / lengths[pair_doc] * idf[pair_term]
+
+        order = np.lexsort((first_pos, -scores, pair_doc))
+        ranked_doc, ranked_term = pair_doc[order], pair_term[order]
+        starts = np.searchsorted(ranked_doc, np.arange(len(docs)), side='left')
+        ends = np.searchsorted(ranked_doc, np.arange(len(docs)), side='right')
+        return [[words[t] for t in ranked_term[s:min(e, s + n)]] for s, e in zip(starts, ends)]
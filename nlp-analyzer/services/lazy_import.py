@@ -0,0 +1,47 @@
+"""
+Gecikmeli Import
+Ağır kütüphaneleri (torch, transformers, vnlp) modül yüklenirken değil ilk kullanımda import eder.
+Sadece Excel okuyan scriptler ve Flask'ın port açması bu kütüphanelerin yükleme süresini ödemez.
+"""
+
+import importlib
+import threading
+import time
+
+# Modül adı -> ilk import süresi (saniye); başlangıç profili için (bkz. benchmarks/startup.py)
+IMPORT_TIMES = {}
+
+
+class LazyModule:
+    """İlk attribute erişiminde gerçek modülü import eden vekil nesne"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    started = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    IMPORT_TIMES.setdefault(self._name, time.perf_counter() - started)
+                    self._module = module
+        return self._module
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """`torch = lazy_import('torch')` şeklinde modül seviyesinde kullanılır."""
+    return LazyModule(name)
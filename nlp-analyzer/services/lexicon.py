@@ -0,0 +1,155 @@
+"""
+Duygu Sözlüğü Eşleştirici
+Pozitif / negatif sözlük terimlerini başlangıçta bir kez Aho-Corasick otomatına derler; metin, sözlük
+boyutundan bağımsız olarak tek geçişte taranır. Eşleşmeler kelime başından başlamalıdır (Türkçe ekler için
+kelime sonu varsayılan olarak serbesttir: 'güzel' -> 'güzeldi'; SENTIMENT_LEXICON_WHOLE_WORDS=true ile
+sadece tam kelimeler sayılır).
+Harici sözlükler SENTIMENT_LEXICON_POSITIVE / SENTIMENT_LEXICON_NEGATIVE ile verilir (satır başına bir terim,
+'#' ile başlayan satırlar yorum) ve yerleşik terimlere eklenir.
+"""
+
+import hashlib
+import os
+from collections import deque
+from typing import Iterable
+
+# Basit Türkçe duygu sözlüğü + domain ifadeleri
+DEFAULT_POSITIVE = frozenset({
+    'tebrik', 'tebrikler', 'tebrik ederim', 'tebrik ediyorum', 'harika', 'mükemmel', 'süper',
+    'başarılı', 'şahane', 'muhteşem', 'beğendim', 'memnun', 'iyi', 'güzel', 'takdir', 'takdir ediyorum',
+    'olumlu', 'pozitif', 'seyirlik', 'efsane', 'kaliteli',
+    'memnun kaldım', 'tavsiye ederim', 'çok iyi', 'olumlu izlenim', 'fiyat/performans iyi',
+    'beklediğim gibi', 'sorunsuz', 'iyi çalışıyor', 'hızlı', 'dayanıklı', 'stabil'
+})
+DEFAULT_NEGATIVE = frozenset({
+    'rezalet', 'berbat', 'kötü', 'feci', 'iğrenç', 'nefret', 'beğenmedim', 'pişman', 'yetersiz',
+    'olumsuz', 'negatif', 'vasat', 'saçma', 'korkunç', 'problem', 'sorun', 'arızalı', 'şikayet',
+    'ısınma sorunu', 'ısınma problemi', 'şarjı çabuk bitiyor', 'batarya kötü', 'donuyor', 'takılıyor',
+    'yavaş', 'geri iade', 'iade ettim', 'hatalı', 'kusurlu', 'servis kötü', 'garanti sorunlu',
+    'memnun değilim', 'beklentiyi karşılamadı'
+})
+
+
+def load_terms(path: str) -> set:
+    """Sözlük dosyasındaki terimler (satır başına bir terim, boş ve '#' satırları atlanır)."""
+    terms = set()
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            term = line.strip()
+            if term and not term.startswith('#'):
+                terms.add(term.lower())
+    return terms
+
+
+class LexiconMatcher:
+    """Pozitif / negatif terimleri tek bir Aho-Corasick otomatında tutan, tek geçişli eşleştirici"""
+
+    def __init__(self, positive: Iterable[str], negative: Iterable[str], whole_words: bool = False):
+        """
+        Args:
+            positive: Pozitif terimler
+            negative: Negatif terimler (bir terim iki listede de varsa iki tarafa da sayılır)
+            whole_words (bool): True ise terim sonunda da kelime sınırı aranır (ekli biçimler sayılmaz)
+        """
+        self.positive = frozenset(t.lower().strip() for t in positive if t and t.strip())
+        self.negative = frozenset(t.lower().strip() for t in negative if t and t.strip())
+        self.whole_words = whole_words
+        self.terms = sorted(self.positive | self.negative)
+        # terim id'si -> (uzunluk, pozitif mi, negatif mi)
+        self._info = [(len(t), t in self.positive, t in self.negative) for t in self.terms]
+        self._goto, self._fail, self._out = self._build(self.terms)
+
+    @classmethod
+    def from_env(cls) -> 'LexiconMatcher':
+        """Yerleşik sözlük + SENTIMENT_LEXICON_POSITIVE / SENTIMENT_LEXICON_NEGATIVE dosyaları."""
+        positive, negative = set(DEFAULT_POSITIVE), set(DEFAULT_NEGATIVE)
+        for env, terms in (('SENTIMENT_LEXICON_POSITIVE', positive), ('SENTIMENT_LEXICON_NEGATIVE', negative)):
+            path = os.getenv(env, '').strip()
+            if not path:
+                continue
+            try:
+                loaded = load_terms(path)
+            except OSError as e:
+                print(f"  ⚠️ Could not read {env}={path} ({e}), using the built-in lexicon")
+                continue
+            terms.update(loaded)
+            print(f"  Sentiment lexicon: {len(loaded)} terms loaded from {path}")
+        whole_words = os.getenv('SENTIMENT_LEXICON_WHOLE_WORDS', 'false').lower() in ('1', 'true', 'yes')
+        return cls(positive, negative, whole_words=whole_words)
+
+    @staticmethod
+    def _build(terms: list):
+        # goto: durum -> {karakter: durum}; fail: en uzun uygun sonek durumu;
+        # out: durumda biten terim id'leri (fail zincirindekiler dahil, tarama sırasında zincir izlenmez)
+        goto, out = [{}], [[]]
+        for term_id, term in enumerate(terms):
+            state = 0
+            for ch in term:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(term_id)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())  # kökün çocuklarının fail'i köktür
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+        return goto, fail, [tuple(o) for o in out]
+
+    @property
+    def signature(self) -> str:
+        """Sonuç önbelleği anahtarı için sözlük kimliği (terimler veya eşleşme modu değişince değişir)."""
+        digest = hashlib.sha1()
+        for side in (self.positive, self.negative):
+            digest.update('\n'.join(sorted(side)).encode('utf-8') + b'\x00')
+        digest.update(b'whole' if self.whole_words else b'prefix')
+        return digest.hexdigest()[:16]
+
+    def find(self, text: str) -> set:
+        """Metinde kelime sınırlarına uyan terimlerin id'leri (her terim bir kez)."""
+        t = text.lower()
+        goto, fail, out, info = self._goto, self._fail, self._out, self._info
+        whole_words = self.whole_words
+        found = set()
+        state = 0
+        for end, ch in enumerate(t):
+            nxt = goto[state].get(ch)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto[state].get(ch)
+            state = nxt or 0
+            if not out[state]:
+                continue
+            for term_id in out[state]:
+                start = end - info[term_id][0] + 1
+                if start > 0 and t[start - 1].isalnum():
+                    continue
+                if whole_words and end + 1 < len(t) and t[end + 1].isalnum():
+                    continue
+                found.add(term_id)
+        return found
+
+    def counts(self, text: str):
+        """
+        Metindeki farklı pozitif ve negatif terim sayıları.
+
+        Returns:
+            tuple: (pozitif, negatif)
+        """
+        pos = neg = 0
+        for term_id in self.find(text):
+            _, is_pos, is_neg = self._info[term_id]
+            pos += is_pos
+            neg += is_neg
+        return pos, neg
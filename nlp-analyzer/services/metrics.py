@@ -0,0 +1,211 @@
+"""
+Prometheus Metrikleri
+Bağımlılıksız sayaç / histogram kayıt defteri ve Prometheus metin formatı (text/plain; version=0.0.4).
+Her etiket kombinasyonunun hücresi ilk kullanımda bir kez oluşturulur; kayıt (inc / observe) kilit almaz,
+önceden ayrılmış listedeki bir hücreyi artırır. CPython'da `+=` atomik olmadığından çok yoğun
+eşzamanlılıkta nadiren bir artış kaybolabilir; izleme için kabul edilebilir bir maliyettir.
+Önbellek sayaçları gibi zaten tutulan değerler kayıt sırasında değil, scrape anında collector
+fonksiyonlarıyla okunur. Worker süreçlerinin metrikleri snapshot olarak toplanıp merge_families ile birleşir.
+"""
+
+import math
+import threading
+from bisect import bisect_left
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+# Saniye cinsinden varsayılan gecikme kovaları (100 µs - 30 s)
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+
+class _CounterCell:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+
+class _HistogramCell:
+    __slots__ = ('bounds', 'counts', 'sum')
+
+    def __init__(self, bounds: tuple):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # son hücre +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._cells = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self._cells[()] = self._new_cell()
+        (REGISTRY if registry is None else registry).register(self)
+
+    def _new_cell(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        """Etiket değerlerinin hücresi (ilk çağrıda oluşturulur, sonra sözlükten okunur)."""
+        cell = self._cells.get(values)
+        if cell is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            with self._lock:
+                cell = self._cells.setdefault(values, self._new_cell())
+        return cell
+
+    def _label_dict(self, values: tuple) -> dict:
+        return dict(zip(self.labelnames, (str(v) for v in values)))
+
+
+class Counter(_Metric):
+    """Artan sayaç (<name>_total önerilir)"""
+    kind = 'counter'
+
+    def _new_cell(self):
+        return _CounterCell()
+
+    def inc(self, amount: float = 1.0):
+        self._default.value += amount
+
+    def collect(self) -> dict:
+        samples = [(self.name, self._label_dict(values), cell.value) for values, cell in list(self._cells.items())]
+        return {'name': self.name, 'type': self.kind, 'help': self.documentation, 'samples': samples}
+
+
+class Histogram(_Metric):
+    """Sabit kovalı histogram (kovalar kümülatif olarak yazılır)"""
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS,
+                 registry=None):
+        self.bounds = tuple(sorted(float(b) for b in buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_cell(self):
+        return _HistogramCell(self.bounds)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def collect(self) -> dict:
+        samples = []
+        for values, cell in list(self._cells.items()):
+            labels = self._label_dict(values)
+            counts = list(cell.counts)
+            cumulative = 0
+            for bound, count in zip(self.bounds + (math.inf,), counts):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", {**labels, 'le': _format_value(bound)}, cumulative))
+            samples.append((f"{self.name}_count", labels, cumulative))
+            samples.append((f"{self.name}_sum", labels, cell.sum))
+        return {'name': self.name, 'type': self.kind, 'help': self.documentation, 'samples': samples}
+
+
+class Registry:
+    """Metriklerin ve scrape anında çalışan collector fonksiyonlarının kaydı"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+
+    def register_collector(self, fn):
+        """fn() scrape anında family listesi döndürür (bkz. family)."""
+        with self._lock:
+            self._collectors.append(fn)
+        return fn
+
+    def collect(self) -> list:
+        """JSON'a serileştirilebilir family listesi (worker süreçlerinden snapshot olarak da taşınır)."""
+        with self._lock:
+            metrics, collectors = list(self._metrics.values()), list(self._collectors)
+        families = [m.collect() for m in metrics]
+        for fn in collectors:
+            try:
+                families.extend(fn())
+            except Exception as e:
+                print(f"⚠️ Metrics collector failed: {e}")
+        return families
+
+
+REGISTRY = Registry()
+
+
+def family(name: str, kind: str, documentation: str, samples: list) -> dict:
+    """
+    Collector'lar için family; samples: (etiket sözlüğü, değer) çiftleri.
+    kind: 'counter' veya 'gauge'.
+    """
+    return {'name': name, 'type': kind, 'help': documentation,
+            'samples': [(name, dict(labels), value) for labels, value in samples]}
+
+
+def with_labels(families: list, **labels) -> list:
+    """Tüm örneklere sabit etiket ekle (örn. worker='0')."""
+    labels = {k: str(v) for k, v in labels.items()}
+    return [
+        {**f, 'samples': [(name, {**labels, **sample_labels}, value) for name, sample_labels, value in f['samples']]}
+        for f in families
+    ]
+
+
+def merge_families(*family_lists) -> list:
+    """Aynı isimli family'lerin örneklerini birleştir (Prometheus her family'yi bir kez bekler)."""
+    merged = {}
+    for families in family_lists:
+        for f in families:
+            if f['name'] in merged:
+                merged[f['name']]['samples'].extend(f['samples'])
+            else:
+                merged[f['name']] = {**f, 'samples': list(f['samples'])}
+    return list(merged.values())
+
+
+def _format_value(value) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return f"{value:.1f}"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def render(families: list) -> str:
+    """Family listesini Prometheus metin formatına çevir."""
+    lines = []
+    for f in families:
+        lines.append(f"# HELP {f['name']} {_escape(f['help'])}")
+        lines.append(f"# TYPE {f['name']} {f['type']}")
+        for name, labels, value in f['samples']:
+            if labels:
+                label_str = ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                lines.append(f"{name}{{{label_str}}} {_format_value(value)}")
+            else:
+                lines.append(f"{name} {_format_value(value)}")
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,160 @@
+"""
+Mikro-batch Dağıtıcısı
+Eşzamanlı tekil analiz isteklerini kısa bir pencere boyunca toplayıp tek batch inference'a çevirir.
+Gönderen isteğin izi (services.tracing) kuyruğa birlikte konur; batch çalışırken batch'teki tüm izler aktiftir.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Dict, List
+
+from . import tracing
+from .metrics import SIZE_BUCKETS, Counter, Histogram
+
+BATCH_SIZE = Histogram('microbatch_size', 'Mikro-batch başına metin sayısı', ('batcher',), buckets=SIZE_BUCKETS)
+QUEUE_WAIT_SECONDS = Histogram('microbatch_queue_wait_seconds', 'İsteğin kuyrukta batch bekleme süresi', ('batcher',))
+BATCH_RUN_SECONDS = Histogram('microbatch_run_duration_seconds', 'Batch fonksiyonunun çalışma süresi', ('batcher',))
+BATCH_ERRORS = Counter('microbatch_errors_total', 'Hata ile biten batch sayısı', ('batcher',))
+
+
+class MicroBatcher:
+    """Tekil metin isteklerini toplayıp bir batch fonksiyonuna ileten dağıtıcı"""
+
+    def __init__(self, batch_fn: Callable[[List[str]], list], name: str = 'batch',
+                 window_ms: float = None, max_batch_size: int = None, concurrency: int = 1):
+        """
+        Dağıtıcı başlatıcı
+
+        Args:
+            batch_fn (callable): Metin listesi alıp aynı sırada sonuç listesi döndüren fonksiyon
+                                 (örn. NLPService.analyze_sentiment_batch)
+            name (str): Metriklerde ve thread adında kullanılacak isim
+            window_ms (float): İlk istekten sonra diğer isteklerin bekleneceği süre
+                               (varsayılan: MICROBATCH_WINDOW_MS, 10 ms)
+            max_batch_size (int): Pencere dolmadan batch'i kapatan üst sınır
+                                  (varsayılan: MICROBATCH_MAX_SIZE, 32)
+            concurrency (int): Aynı anda çalışabilecek batch sayısı; batch_fn ayrı worker süreçlerine
+                               dağıtıyorsa (InferenceWorkerPool) worker sayısı kadar verilir
+        """
+        self.batch_fn = batch_fn
+        self.name = name
+        if window_ms is None:
+            window_ms = float(os.getenv('MICROBATCH_WINDOW_MS', '10'))
+        self.window_ms = window_ms
+        self.max_batch_size = max_batch_size or int(os.getenv('MICROBATCH_MAX_SIZE', '32'))
+        self.concurrency = max(1, concurrency)
+
+        self._queue = deque()
+        self._cond = threading.Condition()
+        # Prometheus hücreleri bir kez alınır; kayıt kilitsizdir
+        self._size_metric = BATCH_SIZE.labels(name)
+        self._wait_metric = QUEUE_WAIT_SECONDS.labels(name)
+        self._run_metric = BATCH_RUN_SECONDS.labels(name)
+        self._error_metric = BATCH_ERRORS.labels(name)
+
+        # Metrikler (dağıtıcı thread'ler kilitle yazar, okuma da kilitle yapılır)
+        self._batches = 0
+        self._items = 0
+        self._errors = 0
+        self._max_seen = 0
+        self._size_histogram: Dict[int, int] = {}
+        self._wait_total = 0.0
+        self._run_total = 0.0
+
+        self._threads = [
+            threading.Thread(target=self._run, name=f"microbatch-{name}-{i}", daemon=True)
+            for i in range(self.concurrency)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, text: str) -> Future:
+        """Metni kuyruğa ekle; sonucu taşıyacak Future döndür."""
+        future = Future()
+        with self._cond:
+            self._queue.append((text, future, time.perf_counter(), tracing.current()))
+            self._cond.notify()
+        return future
+
+    def __call__(self, text: str, timeout: float = None):
+        """Metni kuyruğa ekle ve kendi sonucunu bekle."""
+        return self.submit(text).result(timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                # Pencere ilk isteğin kuyruğa girdiği andan itibaren sayılır
+                deadline = self._queue[0][2] + self.window_ms / 1000.0
+                while len(self._queue) < self.max_batch_size:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if not self._queue:
+                    continue  # başka bir dağıtıcı thread kuyruğu boşalttı
+                size = min(len(self._queue), self.max_batch_size)
+                batch = [self._queue.popleft() for _ in range(size)]
+
+            started = time.perf_counter()
+            traces = [trace for _, _, _, trace in batch if trace is not None]
+            for _, _, enqueued, trace in batch:
+                if trace is not None:
+                    trace.record(f"microbatch_wait.{self.name}", started - enqueued)
+                    trace.peak(microbatch_size=size)
+            try:
+                with tracing.activate(traces), tracing.span(f"microbatch_run.{self.name}", size):
+                    results = self.batch_fn([text for text, _, _, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(
+                        f"{self.name} batch returned {len(results)} results for {len(batch)} inputs"
+                    )
+            except Exception as e:
+                self._error_metric.inc()
+                with self._cond:
+                    self._errors += 1
+                for _, future, _, _ in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future, _, _), result in zip(batch, results):
+                    future.set_result(result)
+            finished = time.perf_counter()
+            self._size_metric.observe(size)
+            self._run_metric.observe(finished - started)
+            for _, _, enqueued, _ in batch:
+                self._wait_metric.observe(started - enqueued)
+
+            with self._cond:
+                self._batches += 1
+                self._items += size
+                self._max_seen = max(self._max_seen, size)
+                bucket = 1 << (size - 1).bit_length()  # 1, 2, 4, 8, ...
+                self._size_histogram[bucket] = self._size_histogram.get(bucket, 0) + 1
+                self._wait_total += sum(started - enqueued for _, _, enqueued, _ in batch)
+                self._run_total += finished - started
+
+    def stats(self) -> dict:
+        """Pencere ayarını yapmak için kuyruk ve batch metriklerini döndür."""
+        with self._cond:
+            batches = self._batches
+            items = self._items
+            return {
+                'window_ms': self.window_ms,
+                'max_batch_size': self.max_batch_size,
+                'concurrency': self.concurrency,
+                'queue_depth': len(self._queue),
+                'batches': batches,
+                'items': items,
+                'errors': self._errors,
+                'avg_batch_size': round(items / batches, 2) if batches else 0.0,
+                'max_batch_size_seen': self._max_seen,
+                'batch_size_histogram': {
+                    f"<={k}": v for k, v in sorted(self._size_histogram.items())
+                },
+                'avg_queue_wait_ms': round(self._wait_total / items * 1000, 2) if items else 0.0,
+                'avg_batch_run_ms': round(self._run_total / batches * 1000, 2) if batches else 0.0,
+            }
@@ -0,0 +1,89 @@
+"""
+Offline Model Paketi
+bundle_models.py sentiment (PEFT adapter'ı gömülü) ve tema modellerini tek klasöre safetensors olarak yazar.
+NLP_MODEL_BUNDLE bu klasörü gösterdiğinde NLPService hub'a / models/ cache'ine gitmeden,
+ağırlıkları mmap ile okuyarak buradan yükler; aynı makinedeki süreçler dosyaları page cache üzerinden paylaşır.
+
+Klasör yapısı:
+    <bundle>/manifest.json
+    <bundle>/sentiment/{config.json, model.safetensors, tokenizer dosyaları}
+    <bundle>/topic/{...}
+"""
+
+import hashlib
+import json
+import os
+import time
+
+MANIFEST_FILE = "manifest.json"
+BUNDLE_FORMAT = 1
+# Paketten yükleme: sadece yerel dosyalar, safetensors (mmap) ve ağırlıkları ikinci kez kopyalamadan oluşturma
+BUNDLE_LOAD_KWARGS = {'local_files_only': True, 'use_safetensors': True, 'low_cpu_mem_usage': True}
+
+
+def _sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def save_bundle_model(bundle_dir: str, name: str, model, tokenizer, source: str, adapter: str = '') -> dict:
+    """
+    Modeli (adapter varsa birleştirip) <bundle>/<name> altına safetensors olarak kaydet.
+
+    Returns:
+        dict: Manifest'e yazılacak model kaydı
+    """
+    if hasattr(model, 'merge_and_unload'):
+        model = model.merge_and_unload()
+    out_dir = os.path.join(bundle_dir, name)
+    os.makedirs(out_dir, exist_ok=True)
+    model.cpu().save_pretrained(out_dir, safe_serialization=True)
+    tokenizer.save_pretrained(out_dir)
+    return {
+        'path': name,
+        'source': source,
+        'adapter': adapter,
+        'num_labels': model.config.num_labels,
+        'tokenizer_fast': bool(getattr(tokenizer, 'is_fast', False)),
+        'files': {
+            fname: {'bytes': os.path.getsize(os.path.join(out_dir, fname)),
+                    'sha256': _sha256(os.path.join(out_dir, fname))}
+            for fname in sorted(os.listdir(out_dir)) if fname.endswith('.safetensors')
+        },
+    }
+
+
+def write_manifest(bundle_dir: str, models: dict, **extra) -> str:
+    manifest = {
+        'format': BUNDLE_FORMAT,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'models': models,
+        **extra,
+    }
+    path = os.path.join(bundle_dir, MANIFEST_FILE)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def load_manifest(bundle_dir: str) -> dict:
+    """
+    Manifest'i oku ve model klasörlerini mutlak yola çevir.
+
+    Raises:
+        FileNotFoundError: manifest.json veya bir model klasörü yoksa
+        ValueError: Manifest formatı desteklenmiyorsa
+    """
+    path = os.path.join(bundle_dir, MANIFEST_FILE)
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('format') != BUNDLE_FORMAT:
+        raise ValueError(f"Unsupported model bundle format in {path}: {manifest.get('format')}")
+    for name, entry in manifest['models'].items():
+        entry['dir'] = os.path.abspath(os.path.join(bundle_dir, entry['path']))
+        if not os.path.isdir(entry['dir']):
+            raise FileNotFoundError(f"Model bundle is missing '{name}' at {entry['dir']}")
+    return manifest
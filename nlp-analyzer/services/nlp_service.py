@@ -4,81 +4,427 @@ Gerçek transformer modelleriyle duygu ve tema analizi
 """
 
 import os
-import torch
-from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
-from transformers.utils import logging as hf_logging
-from vnlp import SentenceSplitter, Normalizer
+import re
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import astuple, dataclass, field
+from typing import Optional
+
+from . import tracing
+from .keywords import KeywordExtractor
+from .lazy_import import lazy_import
+from .lexicon import LexiconMatcher
+from .metrics import REGISTRY, Counter, Histogram, family
+from .model_bundle import BUNDLE_LOAD_KWARGS, load_manifest
+from .onnx_backend import OnnxClassifier, onnx_available, onnx_model_dir
+from .result_cache import LRUCache, ResultCache, make_key
+from .sentence_splitter import RuleSentenceSplitter, splitter_settings_from_env
+from .sentiment_voting import SENTIMENTS, VotingParams
+
+# Ağır kütüphaneler ilk kullanımda (model yüklemede) import edilir; servis modülünü import etmek ucuzdur
+torch = lazy_import('torch')
+transformers = lazy_import('transformers')
+vnlp = lazy_import('vnlp')
+
+# stage_timings'te toplam duygu süresini oluşturan istek zamanı aşamaları ve bunların alt aşamaları
+SENTIMENT_STAGES = ('sentiment_preprocess', 'sentiment_prepare', 'sentiment_inference')
+SENTIMENT_SUBSTAGES = ('normalize', 'deasciify', 'split', 'tokenize', 'forward', 'vote')
+# Duygu ön işleme akışı değişince artırılır (kalıcı sonuç önbelleğindeki eski kayıtlar kullanılmasın)
+SENTIMENT_PIPELINE_VERSION = 3
+
+# Prometheus metrikleri (/api/metrics); NLP_WORKERS > 0 iken her worker kendi sürecinde kaydeder
+STAGE_SECONDS = Histogram('nlp_stage_duration_seconds', 'NLPService aşama süresi (çağrı başına)', ('stage',))
+TOKENS_TOTAL = Counter('nlp_tokens_total', 'Modele hazırlanan token sayısı', ('model',))
+SENTENCES_PER_ENTRY = Histogram('nlp_sentences_per_entry', 'Duygu analizinde entry başına cümle sayısı',
+                                buckets=(1, 2, 3, 4, 5, 7, 10, 15, 20, 30, 50))
+
+
+@dataclass
+class PreparedText:
+    """
+    Bir metin için tek seferde hesaplanan ön işleme çıktıları.
+    Duygu ve tema modelleri aynı nesneyi paylaşır; temizleme, cümle bölme,
+    tokenizasyon ve anahtar kelime çıkarımı metin başına bir kez yapılır.
+    """
+    raw: str
+    # Duygu tarafı
+    sentiment_text: Optional[str] = None    # normalize edilmiş metin
+    sentences: Optional[list] = None        # sentiment modeline verilecek cümleler (son 10)
+    sentiment_ids: Optional[list] = None    # cümle başına model girdisi (özel token'lar dahil)
+    # Tema tarafı
+    topic_text: Optional[str] = None        # ilk 511 içerik token'ına denk gelen metin (keyword kaynağı)
+    topic_ids: Optional[list] = None        # topic modeli girdisi (özel token'lar dahil, max_len'e kesilmiş)
+    keywords: Optional[list] = None
+    # Hazırlık hataları ('sentiment' / 'theme' -> Exception)
+    errors: dict = field(default_factory=dict)
+
+
+def keep_last_tokens(sentences: list, content_ids: list, budget: int):
+    """
+    Cümle listesini sondan toplam `budget` içerik token'ına sığacak şekilde kes.
+    Kısmen sığan ilk cümlenin sadece son token'ları tutulur (metin decode edilmez).
+
+    Returns:
+        tuple: (sentences, content_ids) - kesilmiş cümleler ve token id listeleri
+    """
+    keep = 0
+    for ids in reversed(content_ids):
+        if budget <= 0:
+            break
+        keep += 1
+        budget -= len(ids)
+    sentences = sentences[-keep:] if keep else []
+    content_ids = [list(ids) for ids in content_ids[-keep:]] if keep else []
+    if budget < 0:
+        # İlk cümle kısmen sığıyor: sadece son token'larını tut
+        content_ids[0] = content_ids[0][-budget:]
+    return sentences, content_ids
+
 
 class NLPService:
-    def __init__(self):
-        try:
-            print("Loading NLP models...")
+    # Bileşenler ve hangi analizin hangilerine ihtiyaç duyduğu
+    COMPONENTS = ('vnlp', 'sentiment', 'topic')
+    REQUIREMENTS = {
+        'sentiment': ('vnlp', 'sentiment'),
+        'theme': ('topic',),
+        'combined': ('vnlp', 'sentiment', 'topic'),
+    }
+
+    def __init__(self, load: bool = True):
+        """
+        Ayarları oku; load=True ise modelleri hemen (eşzamanlı thread'lerle) yükle.
+        load=False ile oluşturulan servis start_background_load() ile arka planda yüklenir;
+        bileşen durumları readiness() ile izlenir.
+        """
+        # Model cache
+        self.model_cache_dir = os.path.join(os.path.dirname(__file__), "..", "models")
+        os.makedirs(self.model_cache_dir, exist_ok=True)
+
+        # Cihaz ve hassasiyet torch gerektirdiği için load() başında belirlenir (_configure_runtime)
+        self.device = None
+        self.torch_device = None
+        self.precision = None
+        self.requested_precision = os.getenv('NLP_PRECISION', 'fp32').strip().lower()
+        # Oylama ayarları: LAST_WEIGHT_*, SENTIMENT_TIE_MARGIN, SENTIMENT_NEUTRAL_*, SENTIMENT_LEXICON_ENABLE
+        self.voting = VotingParams.from_env()
+
+        # Sentiment modeli (env ile seçilebilir)
+        self.sentiment_model_name = os.getenv(
+            "SENTIMENT_MODEL_NAME",
+            "incidelen/xlm-roberta-base-turkish-sentiment-analysis"
+        ).strip()
+        self.trust_remote = os.getenv('HF_TRUST_REMOTE_CODE', 'true').lower() in ('1','true','yes')
+        self.sentiment_adapter_name = os.getenv('SENTIMENT_ADAPTER_NAME') or ''
+        self.sentiment_num_labels = int(os.getenv('SENTIMENT_NUM_LABELS', '3'))
+        self.sentiment_max_length = int(os.getenv('SENTIMENT_MAX_LEN', '256'))
+        # Tema/Konu analizi modeli - Türkçe haber sınıflandırma (savasy)
+        self.topic_model_name = "savasy/bert-turkish-text-classification"
+        self.topic_max_length = int(os.getenv('TOPIC_MAX_LEN', '256'))
+        # Toplu analizde forward pass başına cümle sayısı
+        self.sentiment_batch_size = int(os.getenv('SENTIMENT_BATCH_SIZE', '32'))
+        # Toplu tema analizinde forward pass başına metin sayısı
+        self.topic_batch_size = int(os.getenv('TOPIC_BATCH_SIZE', '16'))
+
+        # Offline model paketi (bundle_models.py): adapter gömülü safetensors ağırlıkları, hub'a gidilmez.
+        # Önbellek anahtarları ve ONNX klasörü değişmesin diye kaynak model adları manifest'ten alınır.
+        self.model_bundle_dir = os.getenv('NLP_MODEL_BUNDLE', '').strip()
+        self.model_bundle = None
+        if self.model_bundle_dir:
+            self.model_bundle = load_manifest(self.model_bundle_dir)['models']
+            bundled = self.model_bundle['sentiment']
+            if (bundled['source'], bundled['adapter']) != (self.sentiment_model_name, self.sentiment_adapter_name):
+                print(f"  \u26a0\ufe0f Model bundle contains {bundled['source']} (adapter: {bundled['adapter'] or '-'}), "
+                      f"ignoring SENTIMENT_MODEL_NAME / SENTIMENT_ADAPTER_NAME")
+            self.sentiment_model_name = bundled['source']
+            self.sentiment_adapter_name = bundled['adapter']
+            self.topic_model_name = self.model_bundle['topic']['source']
+
+        # Inference backend: torch (varsayılan) veya onnx (export_onnx.py ile üretilmiş modeller)
+        self.backend = os.getenv('NLP_BACKEND', 'torch').strip().lower()
+        self.sentiment_onnx_dir = onnx_model_dir(
+            self.model_cache_dir, self.sentiment_model_name, self.sentiment_adapter_name
+        )
+        if self.backend == 'onnx' and not onnx_available(self.sentiment_onnx_dir):
+            print(f"  \u26a0\ufe0f ONNX model not found at {self.sentiment_onnx_dir} "
+                  f"(run export_onnx.py), falling back to torch")
+            self.backend = 'torch'
+        self.topic_code_to_label = {
+            "LABEL_0": "Dünya",
+            "LABEL_1": "Ekonomi",
+            "LABEL_2": "Kültür",
+            "LABEL_3": "Sağlık",
+            "LABEL_4": "Siyaset",
+            "LABEL_5": "Spor",
+            "LABEL_6": "Teknoloji",
+        }
+        self.english_to_turkish = {
+            "world": "Dünya",
+            "economy": "Ekonomi",
+            "culture": "Kültür",
+            "health": "Sağlık",
+            "politics": "Siyaset",
+            "sport": "Spor",
+            "technology": "Teknoloji"
+        }
+
+        # Cümle bölücü: SENTENCE_SPLITTER=vnlp|rules|auto (auto: SENTENCE_SPLITTER_AUTO_CHARS'tan kısa metinler kurallı)
+        self.sentence_splitter_mode, self.sentence_splitter_auto_chars = splitter_settings_from_env()
+        self.rule_splitter = RuleSentenceSplitter()
+        self.sentence_splitter = None
+        # Duygu sözlüğü: yerleşik terimler + SENTIMENT_LEXICON_POSITIVE / _NEGATIVE dosyaları, tek otomat
+        self.lexicon = LexiconMatcher.from_env()
+        # Sonuç önbelleği: normalize metin + model + oylama ayarları ile anahtarlanır
+        cache_enabled = os.getenv('NLP_CACHE_ENABLE', 'true').lower() in ('1', 'true', 'yes')
+        self.result_cache = ResultCache() if cache_enabled else None
+
+        # Cümle olasılık önbelleği: alıntı, (bkz) artığı, kopyala-yapıştır cümleler tekrar modele gitmez
+        sentence_cache_enabled = os.getenv('SENTENCE_CACHE_ENABLE', 'true').lower() in ('1', 'true', 'yes')
+        self.sentence_cache = (
+            LRUCache(int(os.getenv('SENTENCE_CACHE_SIZE', '50000'))) if sentence_cache_enabled else None
+        )
+        # Token bazlı deasciify önbelleği: Ekşi kelime dağılımı Zipf'e uyduğu için sık token'lar VNLP'ye tekrar gitmez
+        deasciify_cache_size = int(os.getenv('DEASCIIFY_CACHE_SIZE', '200000'))
+        self.deasciify_cache = LRUCache(deasciify_cache_size) if deasciify_cache_size > 0 else None
+        self.sentiment_model_id = None
+        # Anahtar kelimeler: KEYWORD_IDF_INDEX'teki (build_idf_index.py) korpus IDF'i ile TF-IDF sıralaması
+        self.keyword_extractor = KeywordExtractor.from_env()
+
+        # Bileşen yükleme durumları: pending -> loading -> ready | failed
+        # stages: aşama bazında süreler (import, tokenizer, weights, device) - başlangıç profili için
+        self._state_lock = threading.Lock()
+        self._load_thread = None
+        self.runtime_stages = {}
+        # İstek zamanı aşama süreleri: aşama -> [çağrı, öğe, toplam saniye] (stage_timings);
+        # Flask istek thread'leri ve mikro-batch thread'leri aynı anda yazdığı için kilitle güncellenir
+        self.stage_totals = {}
+        self._stage_lock = threading.Lock()
+        self.load_state = {
+            name: {'status': 'pending', 'load_sec': None, 'error': None, 'stages': {}}
+            for name in self.COMPONENTS
+        }
+
+        if load:
+            self.load()
+
+    def load(self):
+        """
+        VNLP, sentiment ve tema modellerini eşzamanlı thread'lerde yükle ve hepsini bekle.
+        Herhangi bir bileşen yüklenemezse ilk hatayı yükseltir.
+        """
+        print("Loading NLP models...")
+        print(f"  Model cache directory: {os.path.abspath(self.model_cache_dir)}")
+        started = time.perf_counter()
+        self._configure_runtime()
+
+        loaders = {'vnlp': self._load_vnlp, 'sentiment': self._load_sentiment, 'topic': self._load_topic}
+        # Tekrar çağrıldığında sadece hazır olmayan bileşenler yüklenir
+        loaders = {name: fn for name, fn in loaders.items() if self.load_state[name]['status'] != 'ready'}
+        if not loaders:
+            return
+        with ThreadPoolExecutor(max_workers=len(loaders), thread_name_prefix='nlp-load') as pool:
+            futures = [pool.submit(self._load_component, name, fn) for name, fn in loaders.items()]
+            errors = [f.exception() for f in futures if f.exception() is not None]
+        if errors:
+            print(f"Error loading models: {errors[0]}")
+            raise errors[0]
+        print(f"All NLP models loaded successfully in {time.perf_counter() - started:.1f}s!\n")
+
+    def _configure_runtime(self):
+        """torch/transformers import'u, cihaz ve hassasiyet seçimi (bir kez, yükleyici thread'lerden önce)."""
+        if self.device is not None:
+            return
+        with self._timed(None, 'import_torch'):
+            torch.cuda  # noqa: B018  (import'u tetikler)
+        with self._timed(None, 'import_transformers'):
             # HF logging seviyesini azalt
-            hf_logging.set_verbosity_error()
-            
-            # VNLP araçları
-            print("  Loading VNLP tools...")
-            self.sentence_splitter = SentenceSplitter()
-            self.normalizer = Normalizer()
-            print("  VNLP tools loaded")
-            
-            # Model cache
-            self.model_cache_dir = os.path.join(os.path.dirname(__file__), "..", "models")
-            os.makedirs(self.model_cache_dir, exist_ok=True)
-            print(f"  Model cache directory: {os.path.abspath(self.model_cache_dir)}")
-
-            # Device seçimi (env ile override: NLP_DEVICE=cpu|cuda)
-            env_dev = os.getenv("NLP_DEVICE", "").strip().lower()
-            if env_dev in ("cpu", "cuda"):
-                device = 0 if env_dev == "cuda" and torch.cuda.is_available() else -1
-            else:
-                device = 0 if torch.cuda.is_available() else -1
-            self.device = device
-            # Dinamik son cümle ağırlıkları (env ile konfigüre)
-            def _env_float(name: str, default: float) -> float:
-                try:
-                    return float(os.getenv(name, str(default)).strip())
-                except Exception:
-                    return default
-            self.last_weight_short = _env_float('LAST_WEIGHT_SHORT', 1.1)   # 1–3 cümle
-            self.last_weight_medium = _env_float('LAST_WEIGHT_MEDIUM', 2.0) # 4–7 cümle
-            self.last_weight_long = _env_float('LAST_WEIGHT_LONG', 3.0)     # 8+ cümle
-            if device == 0:
-                print("  Using GPU:", torch.cuda.get_device_name(0))
-            else:
-                print("  Using CPU")
-
-            # Sentiment modeli (env ile seçilebilir)
-            self.sentiment_model_name = os.getenv(
-                "SENTIMENT_MODEL_NAME",
-                "incidelen/xlm-roberta-base-turkish-sentiment-analysis"
-            ).strip()
-            print(f"  Loading sentiment model: {self.sentiment_model_name}")
-
-            trust_remote = os.getenv('HF_TRUST_REMOTE_CODE', 'true').lower() in ('1','true','yes')
-            sentiment_adapter = os.getenv('SENTIMENT_ADAPTER_NAME')
-            sentiment_num_labels = int(os.getenv('SENTIMENT_NUM_LABELS', '3'))
-            self.sentiment_max_length = int(os.getenv('SENTIMENT_MAX_LEN', '256'))
-            self.topic_max_length = int(os.getenv('TOPIC_MAX_LEN', '256'))
-
-            # Adapter varsa: base=sentiment_model_name üzerinden yükle ve adapter'ı bağla
-            if sentiment_adapter:
-                print(f"  Using PEFT adapter: {sentiment_adapter}")
+            transformers.logging.set_verbosity_error()
+
+        # Device seçimi (env ile override: NLP_DEVICE=cpu|cuda)
+        env_dev = os.getenv("NLP_DEVICE", "").strip().lower()
+        if env_dev in ("cpu", "cuda"):
+            device = 0 if env_dev == "cuda" and torch.cuda.is_available() else -1
+        else:
+            device = 0 if torch.cuda.is_available() else -1
+        self.device = device
+        # Pipeline yerine doğrudan tokenizer + model: metin bir kez tokenize edilir,
+        # input_ids/attention_mask tensörleri doğrudan modele verilir
+        self.torch_device = torch.device("cuda:0" if device == 0 else "cpu")
+        if device == 0:
+            print("  Using GPU:", torch.cuda.get_device_name(0))
+        else:
+            print("  Using CPU")
+
+        # Düşük hassasiyetli CPU inference: NLP_PRECISION=fp32 (varsayılan) | int8 | bf16
+        self.precision = self._resolve_precision(self.requested_precision)
+        self.sentiment_model_id = (
+            f"{self.sentiment_model_name}+{self.sentiment_adapter_name}@{self.backend}/{self.precision}"
+        )
+
+    @contextmanager
+    def _timed(self, component: Optional[str], stage: str):
+        # Aşama süresini load_state[component]['stages'] (component=None: runtime_stages) altına yaz
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = round(time.perf_counter() - started, 3)
+            with self._state_lock:
+                target = self.runtime_stages if component is None else self.load_state[component]['stages']
+                target[stage] = round(target.get(stage, 0.0) + elapsed, 3)
+
+    @contextmanager
+    def _stage(self, name: str, items: int = 1):
+        """İstek zamanı bir aşamanın süresini, çağrı ve öğe sayısını biriktir (stage_timings + metrikler)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._stage_lock:
+                total = self.stage_totals.get(name)
+                if total is None:
+                    total = self.stage_totals[name] = [0, 0, 0.0]
+                total[0] += 1
+                total[1] += items
+                total[2] += elapsed
+            STAGE_SECONDS.labels(name).observe(elapsed)
+            tracing.record(name, elapsed, items)
+
+    def stage_timings(self) -> dict:
+        """
+        İstek zamanı aşama süreleri (çağrı, öğe, toplam / öğe başına ms).
+        Duygu aşamaları ve deasciify için toplam duygu süresindeki payları da verilir.
+        """
+        with self._stage_lock:
+            totals = {name: list(total) for name, total in self.stage_totals.items()}
+        sentiment_sec = sum(totals[name][2] for name in SENTIMENT_STAGES if name in totals)
+        stages = {}
+        for name, (calls, items, sec) in sorted(totals.items()):
+            stages[name] = {
+                'calls': calls,
+                'items': items,
+                'total_ms': round(sec * 1000, 2),
+                'ms_per_item': round(sec * 1000 / items, 4) if items else 0.0,
+            }
+            # Alt aşamalar (normalize, deasciify, split, ...) üst aşamaların içinde ölçülür
+            if sentiment_sec and (name in SENTIMENT_STAGES or name in SENTIMENT_SUBSTAGES):
+                stages[name]['sentiment_share'] = round(sec / sentiment_sec, 4)
+        return stages
+
+    def start_background_load(self) -> threading.Thread:
+        """load()'u daemon thread'de başlat; hatalar load_state'e yazılır, yükseltilmez."""
+        def _run():
+            try:
+                self.load()
+            except Exception:
+                pass  # ayrıntı load_state[...]['error'] içinde
+
+        self._load_thread = threading.Thread(target=_run, name='nlp-background-load', daemon=True)
+        self._load_thread.start()
+        return self._load_thread
+
+    def _load_component(self, name: str, fn):
+        self._set_state(name, status='loading')
+        started = time.perf_counter()
+        try:
+            fn()
+        except Exception as e:
+            self._set_state(name, status='failed', load_sec=round(time.perf_counter() - started, 2), error=str(e))
+            print(f"  \u274c {name} failed to load: {e}")
+            raise
+        self._set_state(name, status='ready', load_sec=round(time.perf_counter() - started, 2))
+
+    def _set_state(self, name: str, **fields):
+        with self._state_lock:
+            self.load_state[name].update(fields)
+
+    def is_ready(self, analysis: str = 'combined') -> bool:
+        """Analiz türünün (sentiment / theme / combined) ihtiyaç duyduğu bileşenler hazır mı."""
+        with self._state_lock:
+            return all(self.load_state[c]['status'] == 'ready' for c in self.REQUIREMENTS[analysis])
+
+    def readiness(self) -> dict:
+        """Genel durum (loading / ready / failed) ve bileşen bazında yükleme durumu + süresi."""
+        with self._state_lock:
+            components = {
+                name: {**state, 'stages': dict(state['stages'])} for name, state in self.load_state.items()
+            }
+            runtime = dict(self.runtime_stages)
+        statuses = {c['status'] for c in components.values()}
+        if 'failed' in statuses:
+            status = 'failed'
+        elif statuses == {'ready'}:
+            status = 'ready'
+        else:
+            status = 'loading'
+        return {
+            'status': status,
+            'sentiment_model_id': self.sentiment_model_id,
+            'runtime': runtime,
+            'components': components,
+            'analyses': {analysis: self.is_ready(analysis) for analysis in self.REQUIREMENTS},
+        }
+
+    def _load_vnlp(self):
+        # VNLP araçları
+        print("  Loading VNLP tools...")
+        with self._timed('vnlp', 'import'):
+            vnlp.SentenceSplitter  # noqa: B018  (import'u tetikler)
+        with self._timed('vnlp', 'weights'):
+            # rules modunda VNLP sadece normalizasyon için gerekir
+            if self.sentence_splitter_mode != 'rules':
+                self.sentence_splitter = vnlp.SentenceSplitter()
+            self.normalizer = vnlp.Normalizer()
+        print("  VNLP tools loaded")
+
+    def _load_sentiment(self):
+        print(f"  Loading sentiment model: {self.sentiment_model_name}")
+        sentiment_adapter = self.sentiment_adapter_name
+        trust_remote = self.trust_remote
+        AutoTokenizer = transformers.AutoTokenizer
+        AutoModelForSequenceClassification = transformers.AutoModelForSequenceClassification
+
+        if self.backend == 'onnx':
+            print(f"  Using ONNX Runtime: {self.sentiment_onnx_dir}")
+            with self._timed('sentiment', 'tokenizer'):
+                tok = AutoTokenizer.from_pretrained(self.sentiment_onnx_dir, use_fast=False)
+            with self._timed('sentiment', 'weights'):
+                model = OnnxClassifier(self.sentiment_onnx_dir, use_cuda=self.device == 0)
+        elif self.model_bundle:
+            bundled = self.model_bundle['sentiment']
+            print(f"  Using model bundle: {bundled['dir']}")
+            with self._timed('sentiment', 'tokenizer'):
+                tok = AutoTokenizer.from_pretrained(
+                    bundled['dir'], local_files_only=True, use_fast=bundled['tokenizer_fast']
+                )
+            with self._timed('sentiment', 'weights'):
+                model = AutoModelForSequenceClassification.from_pretrained(
+                    bundled['dir'], trust_remote_code=trust_remote, **BUNDLE_LOAD_KWARGS
+                )
+        # Adapter varsa: base=sentiment_model_name üzerinden yükle ve adapter'ı bağla
+        elif sentiment_adapter:
+            print(f"  Using PEFT adapter: {sentiment_adapter}")
+            with self._timed('sentiment', 'import'):
                 try:
                     from peft import PeftModel, PeftConfig
                 except ImportError:
                     raise RuntimeError("PEFT not installed. Please run 'pip install peft'.")
 
+            with self._timed('sentiment', 'tokenizer'):
                 tok = AutoTokenizer.from_pretrained(
                     self.sentiment_model_name,
                     cache_dir=self.model_cache_dir,
                     trust_remote_code=trust_remote
                 )
+            with self._timed('sentiment', 'weights'):
                 base_cls = AutoModelForSequenceClassification.from_pretrained(
                     self.sentiment_model_name,
                     cache_dir=self.model_cache_dir,
                     trust_remote_code=trust_remote,
-                    num_labels=sentiment_num_labels
+                    num_labels=self.sentiment_num_labels
                 )
                 try:
                     _ = PeftConfig.from_pretrained(sentiment_adapter)
@@ -89,278 +435,456 @@ class NLPService:
                     sentiment_adapter,
                     cache_dir=self.model_cache_dir
                 )
-                model.eval()
-                self.sentiment_pipeline = pipeline(
-                    "text-classification",
-                    model=model,
-                    tokenizer=tok,
-                    device=device,
-                    top_k=None
-                )
-            else:
-                # Doğrudan pipeline ile dene (trust_remote_code destekli)
+        else:
+            # Önce slow tokenizer ile dene (eski pipeline davranışı), olmazsa varsayılan tokenizer
+            with self._timed('sentiment', 'tokenizer'):
                 try:
-                    self.sentiment_pipeline = pipeline(
-                        "sentiment-analysis",
-                        model=self.sentiment_model_name,
-                        tokenizer=self.sentiment_model_name,
-                        device=device,
-                        use_fast=False,
-                        cache_dir=self.model_cache_dir,
-                        trust_remote_code=trust_remote
-                    )
-                except Exception as e1:
-                    print(f"  \u26a0\ufe0f Pipeline load failed, trying Auto* loaders: {e1}")
                     tok = AutoTokenizer.from_pretrained(
                         self.sentiment_model_name,
                         cache_dir=self.model_cache_dir,
+                        use_fast=False,
                         trust_remote_code=trust_remote
                     )
-                    mdl = AutoModelForSequenceClassification.from_pretrained(
+                except Exception as e1:
+                    print(f"  \u26a0\ufe0f Slow tokenizer load failed, trying default tokenizer: {e1}")
+                    tok = AutoTokenizer.from_pretrained(
                         self.sentiment_model_name,
                         cache_dir=self.model_cache_dir,
                         trust_remote_code=trust_remote
                     )
-                    self.sentiment_pipeline = pipeline(
-                        "text-classification",
-                        model=mdl,
-                        tokenizer=tok,
-                        device=device,
-                        top_k=None
-                    )
-            print("  Sentiment model loaded")
-
-            # Tema/Konu analizi modeli - Türkçe haber sınıflandırma (savasy)
-            print("  Loading topic model: savasy/bert-turkish-text-classification")
-            self.topic_model_name = "savasy/bert-turkish-text-classification"
-            self.topic_tokenizer = AutoTokenizer.from_pretrained(
-                self.topic_model_name,
-                cache_dir=self.model_cache_dir
-            )
-            self.topic_model = AutoModelForSequenceClassification.from_pretrained(
-                self.topic_model_name,
-                cache_dir=self.model_cache_dir
-            )
-            # top_k=None kullanarak tüm skorları al (return_all_scores yerine)
-            self.topic_pipeline = pipeline(
-                "text-classification",
-                model=self.topic_model,
-                tokenizer=self.topic_tokenizer,
-                device=device,
-                top_k=None
-            )
+            with self._timed('sentiment', 'weights'):
+                model = AutoModelForSequenceClassification.from_pretrained(
+                    self.sentiment_model_name,
+                    cache_dir=self.model_cache_dir,
+                    trust_remote_code=trust_remote
+                )
+        self.sentiment_tokenizer = tok
+        if self.backend == 'onnx':
+            self.sentiment_model = model
+        else:
+            with self._timed('sentiment', 'device'):
+                self.sentiment_model = self._apply_precision(model.to(self.torch_device).eval())
+        print("  Sentiment model loaded")
 
-            self.topic_code_to_label = {
-                "LABEL_0": "Dünya",
-                "LABEL_1": "Ekonomi",
-                "LABEL_2": "Kültür",
-                "LABEL_3": "Sağlık",
-                "LABEL_4": "Siyaset",
-                "LABEL_5": "Spor",
-                "LABEL_6": "Teknoloji",
-            }
-            self.english_to_turkish = {
-                "world": "Dünya",
-                "economy": "Ekonomi",
-                "culture": "Kültür",
-                "health": "Sağlık",
-                "politics": "Siyaset",
-                "sport": "Spor",
-                "technology": "Teknoloji"
-            }
+    def _load_topic(self):
+        print(f"  Loading topic model: {self.topic_model_name}")
+        topic_onnx_dir = onnx_model_dir(self.model_cache_dir, self.topic_model_name)
+        if self.backend == 'onnx' and onnx_available(topic_onnx_dir):
+            with self._timed('topic', 'tokenizer'):
+                self.topic_tokenizer = transformers.AutoTokenizer.from_pretrained(topic_onnx_dir)
+            with self._timed('topic', 'weights'):
+                self.topic_model = OnnxClassifier(topic_onnx_dir, use_cuda=self.device == 0)
+        else:
+            if self.backend == 'onnx':
+                print(f"  \u26a0\ufe0f ONNX topic model not found at {topic_onnx_dir}, using torch")
+            if self.model_bundle:
+                source = self.model_bundle['topic']['dir']
+                tokenizer_kwargs, model_kwargs = {'local_files_only': True}, BUNDLE_LOAD_KWARGS
+            else:
+                source = self.topic_model_name
+                tokenizer_kwargs = model_kwargs = {'cache_dir': self.model_cache_dir}
+            with self._timed('topic', 'tokenizer'):
+                self.topic_tokenizer = transformers.AutoTokenizer.from_pretrained(source, **tokenizer_kwargs)
+            with self._timed('topic', 'weights'):
+                model = transformers.AutoModelForSequenceClassification.from_pretrained(source, **model_kwargs)
+            with self._timed('topic', 'device'):
+                self.topic_model = self._apply_precision(model.to(self.torch_device).eval())
+        print("  Topic model loaded")
+
+    def analyze_sentiment(self, text: str) -> dict:
+        """XLM-RoBERTa tabanlı duygu analizi gerçekleştir."""
+        return self.analyze_sentiment_batch([text])[0]
 
-            print("  Topic model loaded")
-            print("All NLP models loaded successfully!\n")
+    def analyze_sentiment_batch(self, texts: list, batch_size: int = None) -> list:
+        """
+        Birden fazla metin için toplu duygu analizi.
+
+        Tüm entry'lerin cümleleri tek listede toplanır, uzunluğa göre sıralanıp
+        mini-batch'ler halinde modele verilir; çıktılar entry bazında geri
+        bölünerek son cümle ağırlıklı oylamadan geçirilir. analyze_sentiment
+        da aynı yolu tek elemanlı liste ile kullanır.
+
+        Args:
+            texts (list): Analiz edilecek metinler
+            batch_size (int): Forward pass başına cümle sayısı (varsayılan: SENTIMENT_BATCH_SIZE)
+
+        Returns:
+            list: Her metin için analyze_sentiment ile aynı formatta sonuç (giriş sırasıyla)
+        """
+        return self._analyze_cached(texts, theme=False, sentiment_batch_size=batch_size)[0]
+
+    def sentiment_probs_batch(self, texts: list, batch_size: int = None) -> list:
+        """
+        Oylamadan önceki cümle bazlı olasılıkları döndür (offline yeniden puanlama için).
+        Sonuç önbelleğini atlar; cümle önbelleği kullanıldığından analiz sonrası çağrı modele gitmez.
+
+        Returns:
+            list: Her metin için {'probs': [[...], ...], 'lexicon': (pozitif, negatif)} veya {'error': str}
+        """
+        batch_size = batch_size or self.sentiment_batch_size
+        prepared = self.prepare_batch(texts, theme=False)
+        results = []
+        for p in prepared:
+            if p.sentiment_ids is None:
+                results.append({'error': str(p.errors.get('sentiment', 'not prepared'))})
+                continue
+            try:
+                probs = self._sentence_probs(p.sentiment_ids, batch_size)
+                results.append({'probs': probs, 'lexicon': self._lexicon_counts(p.sentences[-1])})
+            except Exception as e:
+                results.append({'error': str(e)})
+        return results
+
+    def sentiment_label_map(self):
+        """
+        Model sınıf indekslerinin oylama sınıflarına eşlemesi (bkz. sentiment_voting.SENTIMENTS).
+
+        Returns:
+            tuple: (etiket adları, sınıf -> sentiment indeksi, etiket tanınıyor mu)
+        """
+        id2label = self.sentiment_model.config.id2label
+        labels, mapping, known = [], [], []
+        for k in range(self.sentiment_model.config.num_labels):
+            label = id2label.get(k, f"LABEL_{k}")
+            sent, conf = self._normalize_sentiment_label({'label': label, 'score': -1.0})
+            labels.append(label)
+            mapping.append(SENTIMENTS.index(sent))
+            known.append(conf == -1.0)  # tanınmayan etiket neutral / 0.5 döner
+        return labels, mapping, known
 
+    def prepare_text(self, text: str, sentiment: bool = True, theme: bool = True,
+                     preprocessed: Optional[list] = None) -> PreparedText:
+        """
+        Metni her iki model için bir kez hazırla.
+
+        Args:
+            text (str): Ham metin
+            sentiment (bool): Duygu tarafı (cümle bölme, normalize, kesme) hazırlansın mı
+            theme (bool): Tema tarafı (tokenizasyon, kesme, anahtar kelimeler) hazırlansın mı
+            preprocessed (list): _preprocess_for_sentiment_batch ile önceden bölünüp temizlenmiş duygu cümleleri
+                                 (opsiyonel)
+
+        Returns:
+            PreparedText: Hazırlık çıktıları; başarısız taraf için hata errors sözlüğündedir
+        """
+        prepared = PreparedText(raw=text if isinstance(text, str) else ("" if text is None else str(text)))
+        if sentiment:
+            try:
+                if preprocessed is None:
+                    preprocessed = self._preprocess_for_sentiment(prepared.raw)
+                with self._stage('sentiment_prepare'):
+                    self._prepare_sentiment(prepared, preprocessed)
+            except Exception as e:
+                prepared.errors['sentiment'] = e
+        if theme:
+            try:
+                with self._stage('theme_prepare'):
+                    self._prepare_theme(prepared)
+            except Exception as e:
+                prepared.errors['theme'] = e
+        return prepared
+
+    def prepare_batch(self, texts: list, sentiment: bool = True, theme: bool = True) -> list:
+        """Metin listesini prepare_text ile hazırla (duygu normalizasyonu tüm liste için bir kez)."""
+        preprocessed = self._preprocess_for_sentiment_batch(texts) if sentiment and texts else [None] * len(texts)
+        return [
+            self.prepare_text(text, sentiment=sentiment, theme=theme, preprocessed=pre)
+            for text, pre in zip(texts, preprocessed)
+        ]
+
+    def _prepare_sentiment(self, prepared: PreparedText, sentences: list):
+        """
+        Bölünmüş ve temizlenmiş cümlelerin tek seferlik tokenizasyonu.
+
+        Cümleler bir kez tokenize edilir; 512 token sınırı (son token'lar korunur)
+        cümle token sayıları üzerinden uygulanır, decode -> yeniden encode yapılmaz.
+        """
+        text = " ".join(sentences)
+        SENTENCES_PER_ENTRY.observe(len(sentences))
+        tracing.add(sentences=len(sentences))
+
+        tok = self.sentiment_tokenizer
+        with self._stage('tokenize'):
+            content_ids = tok(sentences, add_special_tokens=False)['input_ids']
+
+        # Token bazlı kesme: metnin son 511 içerik token'ı (eski encode[-512:] ile aynı bütçe)
+        sentences, content_ids = keep_last_tokens(sentences, content_ids, 511)
+
+        # Son 10 cümleyi kullan (daha geniş bağlam)
+        if len(sentences) > 10:
+            sentences = sentences[-10:]
+            content_ids = content_ids[-10:]
+
+        # Cümle başına max_length kesmesi (baştan) + özel token'lar
+        max_content = self.sentiment_max_length - tok.num_special_tokens_to_add()
+        prepared.sentiment_text = text
+        prepared.sentences = sentences
+        prepared.sentiment_ids = [
+            tok.build_inputs_with_special_tokens(ids[:max_content]) for ids in content_ids
+        ]
+        tokens = sum(map(len, prepared.sentiment_ids))
+        TOKENS_TOTAL.labels('sentiment').inc(tokens)
+        tracing.add(sentiment_tokens=tokens)
+
+    def _sentiment_from_prepared(self, prepared: list, batch_size: int = None) -> list:
+        """Hazırlanmış metinlerin cümlelerini tek sıralı batch'te çalıştırıp entry bazında oyla."""
+        batch_size = batch_size or self.sentiment_batch_size
+        results = [None] * len(prepared)
+
+        live = []
+        for i, p in enumerate(prepared):
+            if p.sentiment_ids is None:
+                results[i] = self._sentiment_error(p.errors.get('sentiment', RuntimeError('not prepared')))
+            else:
+                live.append(i)
+
+        flat_ids = [ids for i in live for ids in prepared[i].sentiment_ids]
+        if not flat_ids:
+            return results
+
+        try:
+            with self._stage('forward', len(flat_ids)):
+                flat_probs = self._sentence_probs(flat_ids, batch_size)
         except Exception as e:
-            print(f"Error loading models: {e}")
+            if len(live) == 1:
+                results[live[0]] = self._sentiment_error(e)
+                return results
+            # Bir entry tüm batch'i düşürmesin: entry'leri tek tek tekrar dene
+            print(f"⚠️ Batched sentiment failed ({e}), retrying entries one by one")
+            for i in live:
+                results[i] = self._sentiment_from_prepared([prepared[i]], batch_size)[0]
+            return results
+
+        # Çıktıları entry bazında geri böl ve oylamayı uygula
+        offset = 0
+        with self._stage('vote', len(live)):
+            for i in live:
+                inputs = prepared[i].sentences
+                n = len(inputs)
+                try:
+                    results[i] = self._vote_sentiment(flat_probs[offset:offset + n], inputs)
+                except Exception as e:
+                    results[i] = self._sentiment_error(e)
+                offset += n
+
+        return results
+
+    def _sentence_probs(self, id_lists: list, batch_size: int) -> list:
+        """
+        Cümle olasılıklarını önbellekten al; sadece daha önce görülmemiş cümleleri modelden geçir.
+
+        Anahtar model kimliği + cümlenin model girdisidir (normalize edilmiş, kesilmiş token id'leri);
+        böylece 512 bütçesinde kısmen kesilen ilk cümle tam haliyle karışmaz.
+        Aynı batch içinde tekrarlanan cümleler de bir kez hesaplanır.
+        """
+        if self.sentence_cache is None:
+            return self._forward_probs(self.sentiment_model, self.sentiment_tokenizer, id_lists, batch_size)
+
+        keys = [(self.sentiment_model_id, tuple(ids)) for ids in id_lists]
+        probs = {}
+        missing = {}
+        for key, ids in zip(keys, id_lists):
+            if key in probs or key in missing:
+                continue
+            cached = self.sentence_cache.get(key)
+            if cached is not None:
+                probs[key] = cached
+            else:
+                missing[key] = ids
+
+        if missing:
+            fresh = self._forward_probs(
+                self.sentiment_model, self.sentiment_tokenizer, list(missing.values()), batch_size
+            )
+            for key, row in zip(missing, fresh):
+                self.sentence_cache.put(key, row)
+                probs[key] = row
+
+        return [probs[key] for key in keys]
+
+    def _forward_probs(self, model, tokenizer, id_lists: list, batch_size: int) -> list:
+        """
+        Token id listelerini uzunluk sıralı, pad edilmiş mini-batch'lerle modelden geçir.
+        Giriş sırasıyla satır başına sınıf olasılıkları (list[float]) döndürür.
+        """
+        # Uzunluğa göre sırala: benzer uzunluktakiler aynı batch'e düşer, padding azalır
+        order = sorted(range(len(id_lists)), key=lambda k: len(id_lists[k]))
+        probs = [None] * len(id_lists)
+        for b in range(0, len(order), batch_size):
+            idxs = order[b:b + batch_size]
+            batch = tokenizer.pad(
+                {'input_ids': [id_lists[k] for k in idxs]},
+                padding=True,
+                return_tensors='pt'
+            )
+            logits = self._model_logits(model, batch)
+            for k, row in zip(idxs, self._logits_to_probs(logits, model.config)):
+                probs[k] = row
+        return probs
+
+    def _model_logits(self, model, batch):
+        """Forward pass; CUDA hatasında modeli CPU'ya taşıyıp tekrar dene."""
+        if isinstance(model, OnnxClassifier):
+            return model.logits(batch)
+        device = next(model.parameters()).device
+        try:
+            with torch.no_grad(), torch.autocast('cpu', dtype=torch.bfloat16,
+                                                 enabled=self.precision == 'bf16' and device.type == 'cpu'):
+                return model(**{k: v.to(device) for k, v in batch.items()}).logits
+        except RuntimeError as re:
+            msg = str(re).lower()
+            if 'device-side assert' in msg or 'cuda error' in msg:
+                print("⚠️ CUDA error in model forward, retrying on CPU")
+                tracing.add(cuda_fallbacks=1)
+                model.cpu()
+                with torch.no_grad(), tracing.span('cpu_fallback_forward'):
+                    return model(**{k: v.cpu() for k, v in batch.items()}).logits
             raise
 
-        # Basit Türkçe duygu sözlüğü + domain ifadeleri
-        self.positive_lexicon = {
-            'tebrik', 'tebrikler', 'tebrik ederim', 'tebrik ediyorum', 'harika', 'mükemmel', 'süper',
-            'başarılı', 'şahane', 'muhteşem', 'beğendim', 'memnun', 'iyi', 'güzel', 'takdir', 'takdir ediyorum',
-            'olumlu', 'pozitif', 'seyirlik', 'efsane', 'kaliteli',
-            'memnun kaldım', 'tavsiye ederim', 'çok iyi', 'olumlu izlenim', 'fiyat/performans iyi',
-            'beklediğim gibi', 'sorunsuz', 'iyi çalışıyor', 'hızlı', 'dayanıklı', 'stabil'
-        }
-        self.negative_lexicon = {
-            'rezalet', 'berbat', 'kötü', 'feci', 'iğrenç', 'nefret', 'beğenmedim', 'pişman', 'yetersiz',
-            'olumsuz', 'negatif', 'vasat', 'saçma', 'korkunç', 'problem', 'sorun', 'arızalı', 'şikayet',
-            'ısınma sorunu', 'ısınma problemi', 'şarjı çabuk bitiyor', 'batarya kötü', 'donuyor', 'takılıyor',
-            'yavaş', 'geri iade', 'iade ettim', 'hatalı', 'kusurlu', 'servis kötü', 'garanti sorunlu',
-            'memnun değilim', 'beklentiyi karşılamadı'
-        }
+    def _resolve_precision(self, precision: str) -> str:
+        """İstenen hassasiyeti ortamın desteklediğine indir (desteklenmiyorsa fp32)."""
+        if precision not in ('fp32', 'int8', 'bf16'):
+            print(f"  \u26a0\ufe0f Unknown NLP_PRECISION={precision}, using fp32")
+            return 'fp32'
+        if precision == 'fp32':
+            return precision
+        if self.backend == 'onnx' or self.device == 0:
+            # Dinamik quantization ve bf16 autocast sadece PyTorch CPU yolunda uygulanır
+            print(f"  \u26a0\ufe0f NLP_PRECISION={precision} is only applied to the torch CPU backend, using fp32")
+            return 'fp32'
+        if precision == 'bf16' and not self._cpu_supports_bf16():
+            print("  \u26a0\ufe0f CPU has no native bf16 support (AVX512-BF16/AMX), using fp32")
+            return 'fp32'
+        print(f"  Precision: {precision}")
+        return precision
 
-    def analyze_sentiment(self, text: str) -> dict:
-        """XLM-RoBERTa tabanlı duygu analizi gerçekleştir."""
+    @staticmethod
+    def _cpu_supports_bf16() -> bool:
         try:
-            # Ön işleme: bkz referansları, URL'ler, tekrarlı boşluklar
-            text = self._preprocess_for_sentiment(text)
+            return bool(torch.ops.mkldnn._is_mkldnn_bf16_supported())
+        except Exception:
+            return False
 
-            # Token bazlı kesme (sentiment tokenizer kullan)
-            try:
-                tok = self.sentiment_pipeline.tokenizer
-                tokens = tok.encode(text, add_special_tokens=True)
-                if len(tokens) > 512:
-                    tokens = tokens[-512:]
-                    text = tok.decode(tokens, skip_special_tokens=True)
-            except Exception:
-                # Her ihtimale karşı karakter kesme
-                if len(text) > 1024:
-                    text = text[-1024:]
+    def _apply_precision(self, model):
+        # int8: Linear katmanlarının ağırlıkları int8'e, aktivasyonlar çalışma anında dinamik quantize edilir
+        if self.precision == 'int8':
+            return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        # bf16: ağırlıklar fp32 kalır, forward pass _model_logits içinde autocast ile bf16 çalışır
+        return model
 
-            # Cümle bazlı değerlendirme (çoğunluk + son cümleye ağırlık)
-            sentences = self._split_sentences(text)
-            # Son 10 cümleyi kullan (daha geniş bağlam)
-            sentences = sentences[-10:] if len(sentences) > 10 else sentences
-            inputs = sentences if sentences else [text]
+    @staticmethod
+    def _logits_to_probs(logits, config) -> list:
+        # Pipeline ile aynı aktivasyon: çok etiketli / tek çıktılı modelde sigmoid, aksi halde softmax
+        logits = logits.float()
+        if config.problem_type == "multi_label_classification" or config.num_labels == 1:
+            probs = torch.sigmoid(logits)
+        else:
+            probs = torch.softmax(logits, dim=-1)
+        return probs.cpu().tolist()
 
+    @staticmethod
+    def _normalize_sentiment_label(res: dict):
+        # Normalize etiket
+        lbl_raw = res.get('label', 'neutral')
+        lbl = str(lbl_raw).lower().strip()
+        conf = float(res.get('score', 0.5))
+        # Map LABEL_0/1/2 to neg/neu/pos (common for 3-class Turkish models)
+        if lbl.startswith('label_'):
             try:
-                pipe_out = self.sentiment_pipeline(
-                    inputs,
-                    truncation=True,
-                    max_length=self.sentiment_max_length,
-                    padding=True
-                )
-            except RuntimeError as re:
-                msg = str(re).lower()
-                if 'device-side assert' in msg or 'cuda error' in msg:
-                    print("⚠️ CUDA error in sentiment pipeline, retrying on CPU with truncation")
-                    try:
-                        # CPU fallback reuses same model/tokenizer
-                        cpu_pipe = pipeline(
-                            "text-classification",
-                            model=self.sentiment_pipeline.model.cpu(),
-                            tokenizer=self.sentiment_pipeline.tokenizer,
-                            device=-1,
-                            top_k=None
-                        )
-                        pipe_out = cpu_pipe(
-                            inputs,
-                            truncation=True,
-                            max_length=self.sentiment_max_length,
-                            padding=True
-                        )
-                    except Exception:
-                        raise re
-                else:
-                    raise
-
-            # Normalize outputs: pipeline may return list or list-of-lists
-            def to_dict(res):
-                # If already dict with 'label' and 'score'
-                if isinstance(res, dict) and 'label' in res and 'score' in res:
-                    return {'label': res['label'], 'score': float(res['score'])}
-                # If list of candidates, pick max score
-                if isinstance(res, list) and res and isinstance(res[0], dict):
-                    best = max(res, key=lambda x: float(x.get('score', 0.0)))
-                    return {'label': best.get('label', 'neutral'), 'score': float(best.get('score', 0.0))}
-                # Fallback neutral
-                return {'label': 'neutral', 'score': 0.5}
-
-            # Normalize etiket
-            def norm(res):
-                lbl_raw = res.get('label', 'neutral')
-                lbl = str(lbl_raw).lower().strip()
-                conf = float(res.get('score', 0.5))
-                # Map LABEL_0/1/2 to neg/neu/pos (common for 3-class Turkish models)
-                if lbl.startswith('label_'):
-                    try:
-                        idx = int(lbl.split('_')[-1])
-                        if idx == 0:
-                            return 'negative', conf
-                        if idx == 1:
-                            return 'neutral', conf
-                        if idx == 2:
-                            return 'positive', conf
-                    except Exception:
-                        pass
-                if 'pos' in lbl or 'olumlu' in lbl or 'positive' in lbl:
-                    return 'positive', conf
-                if 'neg' in lbl or 'olumsuz' in lbl or 'negative' in lbl:
+                idx = int(lbl.split('_')[-1])
+                if idx == 0:
                     return 'negative', conf
-                if 'neutral' in lbl or 'nötr' in lbl:
+                if idx == 1:
                     return 'neutral', conf
-                return 'neutral', 0.5
-
-            # Oylama: her cümle için skor topla, son cümleye 2.0x ağırlık (nötr kaymayı azaltmak için)
-            votes = {'positive': 0.0, 'negative': 0.0, 'neutral': 0.0}
-            best_res = None
-            best_sent = 'neutral'
-            best_conf = 0.5
-            # Dinamik son cümle ağırlığı: kısa metinlerde düşük, uzunlarda yüksek
-            total_sentences = len(pipe_out)
-            if total_sentences <= 3:
-                last_weight = self.last_weight_short
-            elif total_sentences <= 7:
-                last_weight = self.last_weight_medium
-            else:
-                last_weight = self.last_weight_long
-
-            for i, res in enumerate(pipe_out):
-                res_norm = to_dict(res)
-                s, c = norm(res_norm)
-                w = last_weight if i == total_sentences - 1 and total_sentences > 1 else 1.0
-                votes[s] += c * w
-                # En güçlü tek karar adayı
-                if (best_res is None) or (c > best_conf):
-                    best_res = res_norm
-                    best_sent = s
-                    best_conf = c
-
-            # Oy toplamına göre nihai duygu
-            final_sent = max(votes.items(), key=lambda kv: kv[1])[0]
-            # Eğer oy toplamı ile en güçlü tek karar çelişirse ve fark küçükse son cümleyi tercih et
-            if final_sent != best_sent and (abs(votes[final_sent] - votes[best_sent]) < 0.35):
-                final_sent = best_sent
-                final_conf = best_conf
+                if idx == 2:
+                    return 'positive', conf
+            except Exception:
+                pass
+        if 'pos' in lbl or 'olumlu' in lbl or 'positive' in lbl:
+            return 'positive', conf
+        if 'neg' in lbl or 'olumsuz' in lbl or 'negative' in lbl:
+            return 'negative', conf
+        if 'neutral' in lbl or 'nötr' in lbl:
+            return 'neutral', conf
+        return 'neutral', 0.5
+
+    def _vote_sentiment(self, probs: list, inputs: list) -> dict:
+        """Cümle bazlı sınıf olasılıklarını son cümle ağırlıklı oylama ile tek karara indir."""
+        id2label = self.sentiment_model.config.id2label
+        # Oylama: her cümle için skor topla, son cümleye 2.0x ağırlık (nötr kaymayı azaltmak için)
+        votes = {'positive': 0.0, 'negative': 0.0, 'neutral': 0.0}
+        best_res = None
+        best_sent = 'neutral'
+        best_conf = 0.5
+        # Dinamik son cümle ağırlığı: kısa metinlerde düşük, uzunlarda yüksek
+        params = self.voting
+        total_sentences = len(probs)
+        last_weight = params.last_weight(total_sentences)
+
+        for i, row in enumerate(probs):
+            top = max(range(len(row)), key=row.__getitem__)
+            res_norm = {'label': id2label.get(top, f"LABEL_{top}"), 'score': float(row[top])}
+            s, c = self._normalize_sentiment_label(res_norm)
+            w = last_weight if i == total_sentences - 1 and total_sentences > 1 else 1.0
+            votes[s] += c * w
+            # En güçlü tek karar adayı
+            if (best_res is None) or (c > best_conf):
+                best_res = res_norm
+                best_sent = s
+                best_conf = c
+
+        # Oy toplamına göre nihai duygu
+        final_sent = max(votes.items(), key=lambda kv: kv[1])[0]
+        # Eğer oy toplamı ile en güçlü tek karar çelişirse ve fark küçükse son cümleyi tercih et
+        if final_sent != best_sent and (abs(votes[final_sent] - votes[best_sent]) < params.tie_margin):
+            final_sent = best_sent
+            final_conf = best_conf
+        else:
+            # Nötr'e aşırı kaymayı azalt: pozitif/negatif kazandıysa minimum güveni artır
+            base_conf = votes[final_sent] / max(1.0, len(probs))
+            if final_sent in ('positive', 'negative'):
+                final_conf = min(0.99, max(0.65, base_conf))  # pos/neg minimum 0.65
             else:
-                # Nötr'e aşırı kaymayı azalt: pozitif/negatif kazandıysa minimum güveni artır
-                base_conf = votes[final_sent] / max(1.0, len(pipe_out))
-                if final_sent in ('positive', 'negative'):
-                    final_conf = min(0.99, max(0.65, base_conf))  # pos/neg minimum 0.65
-                else:
-                    # Neutral için daha sıkı kontrol: sadece gerçekten belirsiz durumlarda
-                    if base_conf < 0.55:  # Düşük güvenli neutral'ı en yüksek skorlu karar lehine çevir
-                        alternatives = sorted(votes.items(), key=lambda kv: kv[1], reverse=True)
-                        if len(alternatives) > 1 and alternatives[1][1] > 0.3:
-                            final_sent = alternatives[1][0]  # İkinci en yüksek skoru al
-                            final_conf = min(0.85, max(0.60, alternatives[1][1] / max(1.0, len(pipe_out))))
-                        else:
-                            final_conf = min(0.85, max(0.45, base_conf))
+                # Neutral için daha sıkı kontrol: sadece gerçekten belirsiz durumlarda
+                if base_conf < params.neutral_min_conf:  # Düşük güvenli neutral'ı en yüksek skorlu karar lehine çevir
+                    alternatives = sorted(votes.items(), key=lambda kv: kv[1], reverse=True)
+                    if len(alternatives) > 1 and alternatives[1][1] > params.neutral_runner_up_min:
+                        final_sent = alternatives[1][0]  # İkinci en yüksek skoru al
+                        final_conf = min(0.85, max(0.60, alternatives[1][1] / max(1.0, len(probs))))
                     else:
-                        final_conf = min(0.85, max(0.50, base_conf))
-
-            # Sözlük tabanlı düzeltme (opsiyonel, çok kuvvetli ipuçlarında)
-            lexicon_enabled = os.getenv('SENTIMENT_LEXICON_ENABLE', 'false').lower() in ('1','true','yes')
-            if lexicon_enabled:
-                lex_p, lex_n = self._lexicon_counts(inputs[-1] if inputs else text)
-                if final_sent == 'negative' and lex_p >= 2 and lex_n == 0 and final_conf >= 0.75:
-                    final_sent = 'positive'
-                    final_conf = max(0.6, min(0.85, final_conf - 0.05))
-
-                if final_sent == 'positive' and lex_n >= 2 and lex_p == 0 and final_conf >= 0.75:
-                    final_sent = 'negative'
-                    final_conf = max(0.6, min(0.85, final_conf - 0.05))
-
-            score = final_conf if final_sent == 'positive' else (-final_conf if final_sent == 'negative' else 0.0)
-
-            return {
-                'sentiment': final_sent,
-                'score': round(score, 2),
-                'confidence': round(final_conf, 2),
-                'label': best_res['label'] if best_res else 'N/A'
-            }
+                        final_conf = min(0.85, max(0.45, base_conf))
+                else:
+                    final_conf = min(0.85, max(0.50, base_conf))
 
-        except Exception as e:
-            print(f"❌ Sentiment analysis error: {e}")
-            return {
-                'sentiment': 'neutral',
-                'score': 0.0,
-                'confidence': 0.0,
-                'error': str(e)
-            }
+        # Sözlük tabanlı düzeltme (opsiyonel, çok kuvvetli ipuçlarında)
+        if params.lexicon:
+            lex_p, lex_n = self._lexicon_counts(inputs[-1])
+            if final_sent == 'negative' and lex_p >= 2 and lex_n == 0 and final_conf >= 0.75:
+                final_sent = 'positive'
+                final_conf = max(0.6, min(0.85, final_conf - 0.05))
+
+            if final_sent == 'positive' and lex_n >= 2 and lex_p == 0 and final_conf >= 0.75:
+                final_sent = 'negative'
+                final_conf = max(0.6, min(0.85, final_conf - 0.05))
+
+        score = final_conf if final_sent == 'positive' else (-final_conf if final_sent == 'negative' else 0.0)
+
+        return {
+            'sentiment': final_sent,
+            'score': round(score, 2),
+            'confidence': round(final_conf, 2),
+            'label': best_res['label'] if best_res else 'N/A'
+        }
+
+    @staticmethod
+    def _sentiment_error(e: Exception) -> dict:
+        print(f"❌ Sentiment analysis error: {e}")
+        return {
+            'sentiment': 'neutral',
+            'score': 0.0,
+            'confidence': 0.0,
+            'error': str(e)
+        }
     
     def analyze_theme(self, text: str, threshold: float = 0.15) -> dict:
         """
@@ -379,105 +903,171 @@ class NLPService:
                 'is_ambiguous': bool             # Birden fazla yüksek skorlu tema var mı?
             }
         """
-        try:
-            # Token bazlı kesme (daha akıllı)
-            tokens = self.topic_tokenizer.encode(text, add_special_tokens=True)
-            if len(tokens) > 512:
-                tokens = tokens[:512]
-                text = self.topic_tokenizer.decode(tokens, skip_special_tokens=True)
+        return self.analyze_theme_batch([text], threshold)[0]
 
+    def analyze_theme_batch(self, texts: list, threshold: float = 0.15, batch_size: int = None) -> list:
+        """
+        Birden fazla metin için toplu tema analizi.
+
+        Metinler bir kez tokenize edilir, uzunluğa göre sıralanıp batch_size'lık
+        pad edilmiş mini-batch'ler halinde topic modelinden geçirilir. Eşik / top-3 /
+        is_ambiguous mantığı her satıra ayrı uygulanır.
+
+        Args:
+            texts (list): Analiz edilecek metinler
+            threshold (float): Minimum tema skoru eşiği (varsayılan: 0.15)
+            batch_size (int): Forward pass başına metin sayısı (varsayılan: TOPIC_BATCH_SIZE)
+
+        Returns:
+            list: Her metin için analyze_theme ile aynı formatta sonuç (giriş sırasıyla)
+        """
+        return self._analyze_cached(
+            texts, sentiment=False, threshold=threshold, topic_batch_size=batch_size
+        )[1]
+
+    def _prepare_theme(self, prepared: PreparedText):
+        """Topic tokenizasyonu (tek sefer), 512 token kesmesi ve anahtar kelimeleri hazırla."""
+        tok = self.topic_tokenizer
+        if tok.is_fast:
+            enc = tok(prepared.raw, add_special_tokens=False, return_offsets_mapping=True)
+            content_ids = enc['input_ids']
+        else:
+            enc = None
+            content_ids = tok.encode(prepared.raw, add_special_tokens=False)
+
+        # Token bazlı kesme (özel token'lar dahil ilk 512): metin offset'lerle kesilir, decode yok
+        text = prepared.raw
+        if len(content_ids) > 511:
+            if enc is not None:
+                text = prepared.raw[:enc['offset_mapping'][510][1]]
+            else:
+                text = tok.decode(content_ids[:511], skip_special_tokens=True)
+
+        max_content = self.topic_max_length - tok.num_special_tokens_to_add()
+        prepared.topic_text = text
+        prepared.topic_ids = tok.build_inputs_with_special_tokens(content_ids[:max_content])
+        TOKENS_TOTAL.labels('topic').inc(len(prepared.topic_ids))
+        tracing.add(topic_tokens=len(prepared.topic_ids))
+        # Anahtar kelimeler _theme_from_prepared'da tüm batch için birlikte çıkarılır
+
+    def _theme_from_prepared(self, prepared: list, threshold: float = 0.15, batch_size: int = None) -> list:
+        """Hazırlanmış metinleri uzunluk sıralı mini-batch'lerle topic modelinden geçir."""
+        batch_size = batch_size or self.topic_batch_size
+        results = [None] * len(prepared)
+
+        live = []
+        for i, p in enumerate(prepared):
+            if p.topic_ids is None:
+                results[i] = self._theme_error(p.errors.get('theme', RuntimeError('not prepared')))
+            else:
+                live.append(i)
+
+        if not live:
+            return results
+
+        # TF-IDF skorlaması batch'teki tüm metinler için tek seferde
+        missing = [prepared[i] for i in live if prepared[i].keywords is None]
+        if missing:
             try:
-                raw_result = self.topic_pipeline(
-                    text,
-                    top_k=None,
-                    truncation=True,
-                    max_length=self.topic_max_length,
-                    padding=True
+                with self._stage('keywords', len(missing)):
+                    keywords = self.keyword_extractor.extract_batch([p.topic_text for p in missing], n=8)
+            except Exception as e:
+                # Anahtar kelimesi çıkarılamayan satırlar hata sonucu alır; diğerleri modelden geçer
+                for i in live:
+                    if prepared[i].keywords is None:
+                        results[i] = self._theme_error(e)
+                live = [i for i in live if prepared[i].keywords is not None]
+                if not live:
+                    return results
+            else:
+                for p, kw in zip(missing, keywords):
+                    p.keywords = kw
+
+        try:
+            with self._stage('theme_forward', len(live)):
+                probs = self._forward_probs(
+                    self.topic_model, self.topic_tokenizer,
+                    [prepared[i].topic_ids for i in live], batch_size
                 )
-            except RuntimeError as re:
-                msg = str(re).lower()
-                if 'device-side assert' in msg or 'cuda error' in msg:
-                    print("⚠️ CUDA error in topic pipeline, retrying on CPU with truncation")
-                    try:
-                        cpu_pipe = pipeline(
-                            "text-classification",
-                            model=self.topic_model.cpu(),
-                            tokenizer=self.topic_tokenizer,
-                            device=-1,
-                            top_k=None
-                        )
-                        raw_result = cpu_pipe(
-                            text,
-                            top_k=None,
-                            truncation=True,
-                            max_length=self.topic_max_length,
-                            padding=True
-                        )
-                    except Exception:
-                        raise re
-                else:
-                    raise
-            
-            # Skora göre sırala (azalan)
-            raw_result_sorted = sorted(raw_result, key=lambda x: x['score'], reverse=True)
-            
-            themes = []
-            scores = {}
+        except Exception as e:
+            if len(live) == 1:
+                results[live[0]] = self._theme_error(e)
+                return results
+            print(f"⚠️ Batched theme analysis failed ({e}), retrying rows one by one")
+            for i in live:
+                results[i] = self._theme_from_prepared([prepared[i]], threshold, batch_size)[0]
+            return results
+
+        id2label = self.topic_model.config.id2label
+        for i, row in zip(live, probs):
+            raw_result = [{'label': id2label[k], 'score': p} for k, p in enumerate(row)]
+            try:
+                results[i] = self._theme_from_scores(raw_result, prepared[i], threshold)
+            except Exception as e:
+                results[i] = self._theme_error(e)
+
+        return results
+
+    def _theme_from_scores(self, raw_result: list, prepared: PreparedText, threshold: float) -> dict:
+        """Model skorlarına eşik / top-3 / belirsizlik kurallarını uygula ve anahtar kelimeleri ekle."""
+        # Skora göre sırala (azalan)
+        raw_result_sorted = sorted(raw_result, key=lambda x: x['score'], reverse=True)
+        
+        themes = []
+        scores = {}
+        
+        # Threshold'u geçen temaları al (max 3)
+        for item in raw_result_sorted:
+            code = item['label']
+            score = float(item['score'])
             
-            # Threshold'u geçen temaları al (max 3)
-            for item in raw_result_sorted:
-                code = item['label']
-                score = float(item['score'])
+            # Eşik değerini geçenler
+            if score >= threshold:
+                # İngilizce veya LABEL_X formatını Türkçe'ye çevir
+                human_label = self._get_turkish_label(code)
+                themes.append(human_label)
+                scores[human_label] = round(score, 2)
                 
-                # Eşik değerini geçenler
-                if score >= threshold:
-                    # İngilizce veya LABEL_X formatını Türkçe'ye çevir
-                    human_label = self._get_turkish_label(code)
-                    themes.append(human_label)
-                    scores[human_label] = round(score, 2)
-                    
-                    if len(themes) >= 3:
-                        break
-            
-            # Hiç tema bulunamadıysa en yüksek skorluyu al
-            if not themes:
-                best = raw_result_sorted[0]
-                human_label = self._get_turkish_label(best['label'])
-                themes = [human_label]
-                scores = {human_label: round(float(best['score']), 2)}
-            
-            main_topic = themes[0] if themes else 'Genel'
-            
-            # Belirsizlik kontrolü (birden fazla yakın skorlu tema varsa)
-            is_ambiguous = False
-            if len(themes) >= 2:
-                top_score = scores[themes[0]]
-                second_score = scores[themes[1]]
-                # Fark 0.1'den küçükse belirsiz
-                is_ambiguous = (top_score - second_score) < 0.1
-            
-            # Gelişmiş keyword extraction
-            keywords = self._extract_keywords(text, n=8)
-            
-            return {
-                'themes': themes,
-                'keywords': keywords,
-                'main_topic': main_topic,
-                'scores': scores,
-                'is_ambiguous': is_ambiguous,
-                'threshold_used': threshold
-            }
-            
-        except Exception as e:
-            print(f"❌ Theme analysis error: {e}")
-            return {
-                'themes': ['Genel'],
-                'keywords': [],
-                'main_topic': 'Genel',
-                'scores': {},
-                'is_ambiguous': False,
-                'error': str(e)
-            }
+                if len(themes) >= 3:
+                    break
+        
+        # Hiç tema bulunamadıysa en yüksek skorluyu al
+        if not themes:
+            best = raw_result_sorted[0]
+            human_label = self._get_turkish_label(best['label'])
+            themes = [human_label]
+            scores = {human_label: round(float(best['score']), 2)}
+        
+        main_topic = themes[0] if themes else 'Genel'
+        
+        # Belirsizlik kontrolü (birden fazla yakın skorlu tema varsa)
+        is_ambiguous = False
+        if len(themes) >= 2:
+            top_score = scores[themes[0]]
+            second_score = scores[themes[1]]
+            # Fark 0.1'den küçükse belirsiz
+            is_ambiguous = (top_score - second_score) < 0.1
+        
+        return {
+            'themes': themes,
+            'keywords': prepared.keywords,
+            'main_topic': main_topic,
+            'scores': scores,
+            'is_ambiguous': is_ambiguous,
+            'threshold_used': threshold
+        }
+
+    @staticmethod
+    def _theme_error(e: Exception) -> dict:
+        print(f"❌ Theme analysis error: {e}")
+        return {
+            'themes': ['Genel'],
+            'keywords': [],
+            'main_topic': 'Genel',
+            'scores': {},
+            'is_ambiguous': False,
+            'error': str(e)
+        }
     
     def _get_turkish_label(self, label: str) -> str:
         # Model etiketini Türkçe karşılığına çevir
@@ -495,45 +1085,16 @@ class NLPService:
     
     def _extract_keywords(self, text: str, n: int = 8) -> list:
         """
-        Gelişmiş keyword extraction - Türkçe için optimize edilmiş
-        
+        Metnin TF-IDF skoru en yüksek anahtar kelimeleri (IDF indeksi yoksa frekansa göre)
+
         Args:
             text (str): Metin
             n (int): Kaç keyword çıkarılacak
-            
+
         Returns:
             list: Anahtar kelimeler
         """
-        # Genişletilmiş Türkçe stop-words
-        stop_words = {
-            'bir', 've', 'bu', 'da', 'de', 'için', 'ile', 'mi', 'mı', 'mu', 'mü',
-            'daha', 'çok', 'ama', 'ya', 'gibi', 'şu', 'o', 'ki', 'her', 'ne', 
-            'var', 'yok', 'ben', 'sen', 'biz', 'siz', 'onlar', 'şey', 'kadar',
-            'sonra', 'önce', 'artık', 'henüz', 'bile', 'sadece', 'ancak', 'veya',
-            'ise', 'eğer', 'nasıl', 'neden', 'niçin', 'nerede', 'ne zaman',
-            'hiç', 'bazen', 'belki', 'mutlaka', 'kesinlikle', 'zaten', 'aslında',
-            'yani', 'mesela', 'örneğin', 'şimdi', 'böyle', 'şöyle', 'benim',
-            'senin', 'onun', 'bizim', 'sizin', 'diye', 'demek', 'olmak',
-            'etmek', 'yapmak', 'vermek', 'almak', 'görmek', 'buna', 'şunu',
-            'bunu', 'bunun', 'şunun', 'onun', 'olan', 'oldu', 'olur', 'olarak'
-        }
-        
-        # Kelime ayırma ve temizleme
-        import re
-        words = re.findall(r'\b[a-zçğıöşü]+\b', text.lower())
-        
-        # Filtreleme
-        keywords = [w for w in words 
-                   if len(w) > 3 and w not in stop_words and not w.isdigit()]
-        
-        # Frekans analizi
-        from collections import Counter
-        keyword_counts = Counter(keywords)
-        
-        # En sık geçen n kelime
-        top_keywords = [word for word, count in keyword_counts.most_common(n)]
-        
-        return top_keywords
+        return self.keyword_extractor.extract(text, n)
 
     def _last_sentence(self, text: str) -> str:
         """Basit Türkçe cümle bölme ile son cümleyi döndür."""
@@ -543,78 +1104,258 @@ class NLPService:
         return parts[-1] if parts else ''
 
     def _split_sentences(self, text: str) -> list:
-        """Türkçe için VNLP ile yüksek doğruluklu cümle bölme."""
+        """Türkçe cümle bölme: SENTENCE_SPLITTER moduna göre VNLP veya kural tabanlı bölücü."""
+        mode = self.sentence_splitter_mode
+        if mode == 'rules' or (mode == 'auto' and len(text) <= self.sentence_splitter_auto_chars):
+            return self.rule_splitter.split(text)
         try:
             sentences = self.sentence_splitter.split(text)
             # Trim + boşluk temizliği
             return [s.strip() for s in sentences if s.strip()]
         except Exception:
-            # VNLP bir hata verirse regex fallback olsun
-            import re
-            parts = re.split(r"[\.\?!…\n]+", text)
-            return [p.strip() for p in parts if p.strip()]
+            # VNLP bir hata verirse kural tabanlı bölücü fallback olsun
+            return self.rule_splitter.split(text)
 
     def _lexicon_counts(self, text: str):
-        # Pozitif/negatif sözlük eşleşmelerini say
-        t = text.lower()
-        pos = sum(1 for w in self.positive_lexicon if w in t)
-        neg = sum(1 for w in self.negative_lexicon if w in t)
-        return pos, neg
-
-    def _preprocess_for_sentiment(self, text: str) -> str:
-        # Duygu analizi öncesi VNLP tabanlı metin temizliği
-        import re
-        s = text
-        
+        # Pozitif/negatif sözlük eşleşmelerini say (tek geçiş, kelime başı sınırlı)
+        return self.lexicon.counts(text)
+
+    def _preprocess_for_sentiment(self, text: str) -> list:
+        return self._preprocess_for_sentiment_batch([text])[0]
+
+    def _preprocess_for_sentiment_batch(self, texts: list) -> list:
+        """
+        Duygu analizi öncesi hazırlık. (bkz: ...) ve URL'ler önce ham metnin tamamından temizlenir (bölme bir
+        referansı ikiye ayırıp regex'in dışında bırakmasın). Sonra:
+            vnlp (varsayılan): metin VNLP ile normalize edilir ve normalize edilmiş metin bölünür
+                               (önceki davranış; tahminler değişmez)
+            rules / auto: ham metin bölünür, cümleler tek seferde normalize edilir; normalizasyon noktalamayı
+                          sildiği için bölücü kısaltma, üç nokta ve ifadeleri ancak bu sırayla görür
+
+        Returns:
+            list: Giriş sırasıyla metin başına cümle listesi (en az bir eleman; boş metin için [''])
+        """
+        texts = [t if isinstance(t, str) else ("" if t is None else str(t)) for t in texts]
+        with self._stage('sentiment_preprocess', len(texts)):
+            cleaned = [self._clean_for_sentiment(t) for t in texts]
+            if self.sentence_splitter_mode == 'vnlp':
+                normalized = [self._clean_for_sentiment(t) for t in self._normalize_for_sentiment(cleaned, len(texts))]
+                with self._stage('split', len(texts)):
+                    return [[s for s in (self._split_sentences(t) or [t]) if s] or [''] for t in normalized]
+
+            with self._stage('split', len(texts)):
+                parts = [self._split_sentences(t) or [t] for t in cleaned]
+            normalized = self._normalize_for_sentiment([s for sentences in parts for s in sentences], len(texts))
+            results, offset = [], 0
+            for sentences in parts:
+                chunk = normalized[offset:offset + len(sentences)]
+                offset += len(sentences)
+                results.append([s.strip() for s in chunk if s.strip()] or [''])
+            return results
+
+    def _normalize_for_sentiment(self, texts: list, entries: int) -> list:
+        # VNLP normalizasyonu; hata verirse küçük harfe indirip devam et
         try:
-            s = self._vnlp_normalize(s)
+            with self._stage('normalize', entries):
+                return self.normalize_batch(texts)
         except Exception as e:
             print(f"⚠️ Normalizer error: {e}, using basic preprocessing")
-            s = s.lower() if isinstance(s, str) else ""
-        
+            return [t.lower() for t in texts]
+
+    @staticmethod
+    def _clean_for_sentiment(s: str) -> str:
         # (bkz: ...) referanslarını kaldır
         s = re.sub(r"\(bkz:\s*[^\)]+\)", " ", s, flags=re.IGNORECASE)
-        # URL'leri kaldır
-        s = re.sub(r"https?://\S+", " ", s)
+        # URL'leri kaldır (sondaki noktalama cümle sınırı olarak kalsın)
+        s = re.sub(r"https?://\S+?(?=[.,;:!?…]*(?:\s|$))", " ", s)
         # Fazla boşluk
         s = re.sub(r"\s+", " ", s)
         return s.strip()
 
     def _vnlp_normalize(self, text: str) -> str:
-        # VNLP fonksiyonlarını tek tek çağırarak metni normalize et
-        import re
+        return self.normalize_batch([text])[0]
 
-        if not isinstance(text, str):
-            text = "" if text is None else str(text)
+    def normalize_batch(self, texts: list) -> list:
+        """
+        VNLP normalizasyonu (Türkçe küçük harf, deasciify, aksan ve noktalama temizliği) metin listesi için.
+        Batch'teki token'lar tekilleştirilir; önbellekte (DEASCIIFY_CACHE_SIZE) olmayanlar VNLP deasciify'a
+        tek çağrıda gönderilir. Deasciify token başına çalıştığı için önbellek sonucu değiştirmez.
 
-        # Lower-case (Türkçe karakter uyumlu)
-        s = Normalizer.lower_case(text)
+        Args:
+            texts (list): Ham metinler
 
-        # ASCII'ye kaymış karakterleri düzelt
-        tokens = s.split()
-        tokens = Normalizer.deasciify(tokens)
+        Returns:
+            list: Giriş sırasıyla normalize edilmiş metinler
+        """
+        Normalizer = vnlp.Normalizer
+        token_lists = [
+            Normalizer.lower_case(t if isinstance(t, str) else ("" if t is None else str(t))).split() for t in texts
+        ]
+
+        # ASCII'ye kaymış karakterleri düzelt (batch'te tekil, önbellekte olmayan token'lar)
+        mapping = {}
+        missing = []
+        for token in dict.fromkeys(token for tokens in token_lists for token in tokens):
+            cached = self.deasciify_cache.get(token) if self.deasciify_cache is not None else None
+            if cached is None:
+                missing.append(token)
+            else:
+                mapping[token] = cached
+        if missing:
+            with self._stage('deasciify', len(missing)):
+                converted = Normalizer.deasciify(missing)
+            for token, fixed in zip(missing, converted):
+                mapping[token] = fixed
+                if self.deasciify_cache is not None:
+                    self.deasciify_cache.put(token, fixed)
 
-        # Sayıları yazıya dönüştürme adımını tamamen devre dışı bırak
+        # Sayıları yazıya dönüştürme adımı devre dışı
         # (Duygu analizinde olası gecikmeleri ve sapmaları önlemek için)
-        # İstenirse bu adım yeniden eklenebilir.
+        results = []
+        for tokens in token_lists:
+            s = " ".join(mapping[token] for token in tokens)
+            # Aksan ve noktalama temizliği
+            s = Normalizer.remove_accent_marks(s)
+            s = Normalizer.remove_punctuations(s)
+            # Fazla boşlukları sadeleştir
+            results.append(re.sub(r"\s+", " ", s).strip())
+        return results
 
-        # Listeyi yeniden stringe çevir
-        s = " ".join(tokens)
+    def analyze_combined(self, text: str) -> dict:
+        # Hem duygu hem tema analizini birlikte döndür (ön işleme bir kez yapılır)
+        return self.analyze_combined_batch([text])[0]
 
-        # Aksan ve noktalama temizliği
-        s = Normalizer.remove_accent_marks(s)
-        s = Normalizer.remove_punctuations(s)
+    def analyze_combined_batch(self, texts: list, threshold: float = 0.15) -> list:
+        """
+        Metin listesi için duygu + tema analizi.
+        Önbellekte olmayan her metin prepare_text ile bir kez hazırlanır ve iki model aynı hazırlığı kullanır.
 
-        # Fazla boşlukları sadeleştir
-        s = re.sub(r"\s+", " ", s)
-        return s.strip()
-    
-    def analyze_combined(self, text: str) -> dict:
-        # Hem duygu hem tema analizini birlikte döndür
-        sentiment = self.analyze_sentiment(text)
-        theme = self.analyze_theme(text)
-        
-        return {
-            'sentiment': sentiment,
-            'theme': theme
+        Returns:
+            list: [{'sentiment': {...}, 'theme': {...}}, ...] (giriş sırasıyla)
+        """
+        sentiments, themes = self._analyze_cached(texts, threshold=threshold)
+        return [
+            {'sentiment': sentiment, 'theme': theme}
+            for sentiment, theme in zip(sentiments, themes)
+        ]
+
+    def _analyze_cached(self, texts: list, sentiment: bool = True, theme: bool = True,
+                        threshold: float = 0.15, sentiment_batch_size: int = None,
+                        topic_batch_size: int = None):
+        """
+        Önbellekte bulunmayan metinleri bir kez hazırlayıp ilgili modellerden geçir.
+        Aynı metin batch içinde birden fazla geçerse bir kez hesaplanır; hatasız sonuçlar önbelleğe yazılır.
+
+        Returns:
+            tuple: (duygu sonuçları | None, tema sonuçları | None) - giriş sırasıyla
+        """
+        sides = [side for side, wanted in (('sentiment', sentiment), ('theme', theme)) if wanted]
+        signatures = {side: self._cache_signature(side, threshold) for side in sides}
+        results = {side: [None] * len(texts) for side in sides}
+        # anahtar -> bu sonucu bekleyen giriş indeksleri
+        pending = {side: {} for side in sides}
+
+        chars = longest = 0
+        for i, text in enumerate(texts):
+            norm = self._cache_text(text)
+            chars += len(norm)
+            longest = max(longest, len(norm))
+            for side in sides:
+                key = make_key(side, signatures[side], norm)
+                cached = self.result_cache.get(key) if self.result_cache is not None else None
+                if cached is not None:
+                    results[side][i] = cached
+                else:
+                    pending[side].setdefault(key, []).append(i)
+
+        # Eksik metinler sadece ihtiyaç duyulan taraflar için bir kez hazırlanır
+        needed = {}
+        for side in sides:
+            for idxs in pending[side].values():
+                needed.setdefault(idxs[0], set()).add(side)
+        tracing.add(texts=len(texts), texts_computed=len(needed), text_chars=chars)
+        tracing.peak(max_text_chars=longest)
+        # Duygu normalizasyonu tüm eksik metinler için tek seferde (token'lar batch içinde tekilleşir)
+        # (sadece tema isteyen çağrılarda VNLP'ye dokunulmaz ve boş aşama örneği yazılmaz)
+        sentiment_idx = [i for i, need in sorted(needed.items()) if 'sentiment' in need]
+        preprocessed = {}
+        if sentiment_idx:
+            sentiment_texts = [texts[i] for i in sentiment_idx]
+            preprocessed = dict(zip(sentiment_idx, self._preprocess_for_sentiment_batch(sentiment_texts)))
+        prepared = {
+            i: self.prepare_text(texts[i], sentiment='sentiment' in need, theme='theme' in need,
+                                 preprocessed=preprocessed.get(i))
+            for i, need in sorted(needed.items())
         }
+
+        for side in sides:
+            if not pending[side]:
+                continue
+            keys = list(pending[side])
+            batch = [prepared[pending[side][key][0]] for key in keys]
+            with self._stage(f"{side}_inference", len(batch)):
+                if side == 'sentiment':
+                    outputs = self._sentiment_from_prepared(batch, sentiment_batch_size)
+                else:
+                    outputs = self._theme_from_prepared(batch, threshold, topic_batch_size)
+            for key, output in zip(keys, outputs):
+                if self.result_cache is not None and 'error' not in output:
+                    self.result_cache.put(key, output)
+                for i in pending[side][key]:
+                    results[side][i] = output
+
+        return results.get('sentiment'), results.get('theme')
+
+    @staticmethod
+    def _cache_text(text) -> str:
+        # Önbellek anahtarı için metin normalizasyonu (Unicode NFC + boşluk sadeleştirme)
+        text = "" if text is None else str(text)
+        return re.sub(r"\s+", " ", unicodedata.normalize('NFC', text)).strip()
+
+    def _cache_signature(self, side: str, threshold: float) -> tuple:
+        # Sonucu etkileyen model ve ayarlar; herhangi biri değişirse anahtar da değişir
+        if side == 'sentiment':
+            return (
+                self.sentiment_model_name, self.sentiment_adapter_name, self.backend, self.precision,
+                SENTIMENT_PIPELINE_VERSION, self.sentiment_max_length, self.sentence_splitter_mode,
+                self.sentence_splitter_auto_chars if self.sentence_splitter_mode == 'auto' else None,
+                astuple(self.voting), self.lexicon.signature if self.voting.lexicon else None
+            )
+        return (self.topic_model_name, self.backend, self.precision, self.topic_max_length, threshold,
+                self.keyword_extractor.signature)
+
+    def cache_stats(self) -> dict:
+        """Sonuç ve cümle önbelleklerinin isabet / ıskalama / tahliye sayaçları."""
+        stats = {'enabled': self.result_cache is not None}
+        if self.result_cache is not None:
+            stats.update(self.result_cache.stats())
+        if self.sentence_cache is not None:
+            stats['sentences'] = self.sentence_cache.stats()
+        if self.deasciify_cache is not None:
+            stats['deasciify'] = self.deasciify_cache.stats()
+        return stats
+
+    def cache_metrics(self) -> list:
+        """Önbellek sayaçları Prometheus family'leri olarak (scrape anında okunur, kayıt maliyeti yoktur)."""
+        caches = {'sentences': self.sentence_cache, 'deasciify': self.deasciify_cache}
+        if self.result_cache is not None:
+            caches['result'] = self.result_cache.memory
+        stats = {name: cache.stats() for name, cache in caches.items() if cache is not None}
+        families = [
+            family(f"nlp_cache_{key}_total", 'counter', f"Önbellek {key} sayısı",
+                   [({'cache': name}, s[key]) for name, s in stats.items()])
+            for key in ('hits', 'misses', 'evictions')
+        ]
+        families.append(family('nlp_cache_entries', 'gauge', 'Önbellekteki kayıt sayısı',
+                               [({'cache': name}, s['size']) for name, s in stats.items()]))
+        families.append(family('nlp_cache_hit_ratio', 'gauge', 'Önbellek isabet oranı (başlangıçtan beri)',
+                               [({'cache': name}, s['hit_rate']) for name, s in stats.items()]))
+        disk = self.result_cache.stats().get('disk') if self.result_cache is not None else None
+        if disk:
+            families[0]['samples'].append(('nlp_cache_hits_total', {'cache': 'result_disk'}, disk['hits']))
+            families[1]['samples'].append(('nlp_cache_misses_total', {'cache': 'result_disk'}, disk['misses']))
+        return families
+
+    def metrics_snapshot(self) -> list:
+        """Bu süreçteki metrikler + önbellek family'leri (InferenceWorkerPool worker'lardan toplar)."""
+        return REGISTRY.collect() + self.cache_metrics()
@@ -0,0 +1,138 @@
+"""
+ONNX Runtime Backend
+Sentiment ve tema modellerini ONNX'e aktarma (export_onnx.py) ve NLP_BACKEND=onnx modunda
+ONNX Runtime ile çalıştırma yardımcıları. Ön/son işleme NLPService'te aynen kalır;
+sadece forward pass ONNX Runtime'a devredilir.
+"""
+
+import inspect
+import os
+import re
+import shutil
+
+from .lazy_import import lazy_import
+
+torch = lazy_import('torch')
+transformers = lazy_import('transformers')
+
+ONNX_FILE = "model.onnx"
+
+
+def onnx_model_dir(cache_dir: str, model_name: str, adapter_name: str = '') -> str:
+    """models/onnx/<model>[__<adapter>] klasörü (HF cache isimlendirmesine benzer)."""
+    name = model_name if not adapter_name else f"{model_name}__{adapter_name}"
+    return os.path.join(cache_dir, "onnx", re.sub(r"[^A-Za-z0-9_.-]+", "--", name))
+
+
+def onnx_available(model_dir: str) -> bool:
+    return os.path.isfile(os.path.join(model_dir, ONNX_FILE))
+
+
+class OnnxClassifier:
+    """AutoModelForSequenceClassification yerine geçen ONNX Runtime oturumu (sadece logits)"""
+
+    def __init__(self, model_dir: str, use_cuda: bool = False):
+        import onnxruntime as ort
+
+        self.model_dir = model_dir
+        self.config = transformers.AutoConfig.from_pretrained(model_dir)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        threads = int(os.getenv('ORT_NUM_THREADS', '0'))  # 0: ORT varsayılanı (fiziksel çekirdek sayısı)
+        if threads > 0:
+            options.intra_op_num_threads = threads
+
+        providers = ['CPUExecutionProvider']
+        if use_cuda and 'CUDAExecutionProvider' in ort.get_available_providers():
+            providers.insert(0, 'CUDAExecutionProvider')
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, ONNX_FILE), sess_options=options, providers=providers
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def logits(self, batch) -> "torch.Tensor":
+        """tokenizer.pad(...) çıktısını çalıştırıp torch tensörü olarak logits döndür."""
+        feeds = {k: v.cpu().numpy().astype('int64') for k, v in batch.items() if k in self.input_names}
+        return torch.from_numpy(self.session.run(['logits'], feeds)[0])
+
+
+def load_onnx_classifier(model_dir: str, use_cuda: bool = False, use_fast: bool = None):
+    """Export klasöründen tokenizer + ONNX model yükle."""
+    kwargs = {} if use_fast is None else {'use_fast': use_fast}
+    tokenizer = transformers.AutoTokenizer.from_pretrained(model_dir, **kwargs)
+    return tokenizer, OnnxClassifier(model_dir, use_cuda=use_cuda)
+
+
+def export_classifier(model, tokenizer, out_dir: str, opset: int = 17, optimize: bool = True) -> str:
+    """
+    Sınıflandırma modelini dinamik batch/sekans eksenli ONNX'e aktar, grafik optimizasyonlarını uygula.
+    Tokenizer ve config de aynı klasöre yazılır; böylece klasör tek başına yüklenebilir.
+
+    Returns:
+        str: Yazılan model.onnx yolu
+    """
+    # PEFT adapter varsa ağırlıkları base modele göm
+    if hasattr(model, 'merge_and_unload'):
+        model = model.merge_and_unload()
+    model = model.cpu().eval()
+
+    os.makedirs(out_dir, exist_ok=True)
+    raw_path = os.path.join(out_dir, "model_raw.onnx")
+    final_path = os.path.join(out_dir, ONNX_FILE)
+
+    sample = tokenizer.pad({'input_ids': [tokenizer.build_inputs_with_special_tokens([5, 6, 7])]},
+                           padding=True, return_tensors='pt')
+    input_names = ['input_ids', 'attention_mask']
+    dynamic = {0: 'batch', 1: 'sequence'}
+    # torch>=2.9'da varsayılan dynamo exporter'dır (onnxscript ister, dynamic_axes'ı kullanmaz);
+    # dynamic_axes ile çalışan TorchScript exporter'ı açıkça seçilir
+    legacy = {'dynamo': False} if 'dynamo' in inspect.signature(torch.onnx.export).parameters else {}
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample['input_ids'], sample['attention_mask']),
+            raw_path,
+            input_names=input_names,
+            output_names=['logits'],
+            dynamic_axes={
+                'input_ids': dynamic,
+                'attention_mask': dynamic,
+                'logits': {0: 'batch'},
+            },
+            opset_version=opset,
+            do_constant_folding=True,
+            **legacy,
+        )
+
+    if optimize:
+        _optimize(raw_path, final_path, model.config)
+        os.remove(raw_path)
+    else:
+        shutil.move(raw_path, final_path)
+
+    model.config.save_pretrained(out_dir)
+    tokenizer.save_pretrained(out_dir)
+    return final_path
+
+
+def _optimize(raw_path: str, final_path: str, config):
+    """Transformer'a özel füzyonlar (attention, LayerNorm, GELU); olmazsa ORT'nin genel offline optimizasyonu."""
+    try:
+        from onnxruntime.transformers.optimizer import optimize_model
+
+        optimized = optimize_model(
+            raw_path,
+            model_type='bert',  # XLM-RoBERTa da BERT füzyonlarını kullanır
+            num_heads=config.num_attention_heads,
+            hidden_size=config.hidden_size,
+        )
+        optimized.save_model_to_file(final_path)
+    except Exception as e:
+        print(f"  ⚠️ Transformer optimizer failed ({e}), using ORT offline optimization")
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.optimized_model_filepath = final_path
+        ort.InferenceSession(raw_path, sess_options=options, providers=['CPUExecutionProvider'])
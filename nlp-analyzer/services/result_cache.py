@@ -0,0 +1,183 @@
+"""
+Sonuç Önbelleği
+Analiz sonuçları için içerik adresli, iki katmanlı önbellek:
+bellek içi LRU (boyut + TTL sınırlı) ve opsiyonel, süreçler arası paylaşılan SQLite katmanı
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+_MISSING = object()
+
+
+def make_key(*parts: Any) -> str:
+    """Parçalardan (metin, model adı, ayarlar...) kararlı bir SHA-256 anahtarı üret."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(str(part).encode('utf-8'))
+        h.update(b'\x1f')  # parça ayırıcı: ('ab', 'c') ile ('a', 'bc') çakışmasın
+    return h.hexdigest()
+
+
+class LRUCache:
+    """Thread-safe, boyut sınırlı ve opsiyonel TTL'li LRU önbellek"""
+
+    def __init__(self, max_size: int = 10000, ttl: Optional[float] = None):
+        """
+        Args:
+            max_size (int): En fazla tutulacak kayıt sayısı (dolunca en eski kullanılan atılır)
+            ttl (float): Saniye cinsinden yaşam süresi (None veya 0: süresiz)
+        """
+        self.max_size = max(1, int(max_size))
+        self.ttl = ttl if ttl and ttl > 0 else None
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                self.misses += 1
+                return default
+            value, expires = item
+            if expires is not None and expires < time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'max_size': self.max_size,
+                'ttl_sec': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class ResultCache:
+    """Bellek içi LRU + opsiyonel SQLite katmanlı, JSON serileştirilebilir sonuç önbelleği"""
+
+    def __init__(self, max_size: int = None, ttl: float = None, db_path: str = None):
+        """
+        Args:
+            max_size (int): Bellek katmanı boyutu (varsayılan: NLP_CACHE_SIZE, 10000)
+            ttl (float): Bellek katmanı TTL'i, saniye (varsayılan: NLP_CACHE_TTL_SEC, 3600)
+            db_path (str): SQLite dosyası (varsayılan: NLP_CACHE_DB; boşsa disk katmanı kapalı)
+        """
+        if max_size is None:
+            max_size = int(os.getenv('NLP_CACHE_SIZE', '10000'))
+        if ttl is None:
+            ttl = float(os.getenv('NLP_CACHE_TTL_SEC', '3600'))
+        if db_path is None:
+            db_path = os.getenv('NLP_CACHE_DB', '').strip() or None
+
+        self.memory = LRUCache(max_size, ttl)
+        self.db_path = db_path
+        self._db = None
+        self._db_lock = threading.Lock()
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.disk_writes = 0
+        self.disk_errors = 0
+
+        if db_path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+                self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+                # WAL: Flask süreci ve offline scriptler aynı dosyayı eşzamanlı okuyup yazabilir
+                self._db.execute('PRAGMA journal_mode=WAL')
+                self._db.execute(
+                    'CREATE TABLE IF NOT EXISTS results ('
+                    'key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)'
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ Result cache DB disabled ({db_path}): {e}")
+                self._db = None
+
+    def get(self, key: str):
+        """Önce bellekte, sonra diskte ara; diskten gelen sonuç belleğe alınır. Yoksa None."""
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if self._db is None:
+            return None
+
+        try:
+            with self._db_lock:
+                row = self._db.execute('SELECT value FROM results WHERE key = ?', (key,)).fetchone()
+        except sqlite3.Error:
+            self.disk_errors += 1
+            return None
+        if row is None:
+            self.disk_misses += 1
+            return None
+        self.disk_hits += 1
+        value = json.loads(row[0])
+        self.memory.put(key, value)
+        return value
+
+    def put(self, key: str, value):
+        """Sonucu iki katmana da yaz."""
+        self.memory.put(key, value)
+        if self._db is None:
+            return
+        try:
+            payload = json.dumps(value, ensure_ascii=False)
+            with self._db_lock:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO results (key, value, created) VALUES (?, ?, ?)',
+                    (key, payload, time.time())
+                )
+                self._db.commit()
+            self.disk_writes += 1
+        except (sqlite3.Error, TypeError, ValueError):
+            self.disk_errors += 1
+
+    def stats(self) -> dict:
+        stats = {'memory': self.memory.stats()}
+        if self._db is not None:
+            stats['disk'] = {
+                'path': self.db_path,
+                'hits': self.disk_hits,
+                'misses': self.disk_misses,
+                'writes': self.disk_writes,
+                'errors': self.disk_errors,
+            }
+        return stats
@@ -0,0 +1,114 @@
+"""
+Kural Tabanlı Cümle Bölücü
+VNLP SentenceSplitter'a hızlı alternatif: derlenmiş tek bir regex ile aday sınırları bulur, Türkçe
+kısaltmalar (dr., prof., vb., örn., ...), sıra sayıları ('3. sınıf'), baş harfler ('m. kemal'), üç nokta,
+(bkz: ...) / (ara: ...) referansları, URL'ler ve ifadeler (:) :D -_- ...) için sınır koymaz.
+SENTENCE_SPLITTER=vnlp|rules|auto ile seçilir; auto modunda SENTENCE_SPLITTER_AUTO_CHARS'tan
+(varsayılan 300) kısa metinler kural tabanlı, uzunlar VNLP ile bölünür.
+"""
+
+import os
+import re
+
+MODES = ('vnlp', 'rules', 'auto')
+
+# Sonunda nokta olduğunda cümle bitirmeyen kısaltmalar (küçük harf, noktasız)
+ABBREVIATIONS = frozenset({
+    'dr', 'prof', 'doç', 'yrd', 'uzm', 'op', 'av', 'müh', 'öğr', 'gör', 'arş', 'sn', 'hz',
+    'bkz', 'bknz', 'vb', 'vs', 'vd', 'örn', 'krş', 'yy', 'mö', 'ms', 'sf', 'syf', 'no', 'tel',
+    'cad', 'sok', 'mah', 'apt', 'blv', 'md', 'ltd', 'şti', 'alb', 'bnb', 'yzb', 'tğm', 'ütğm',
+    'ing', 'fr', 'alm', 'lat', 'mr', 'mrs', 'vol', 'dk', 'cm', 'km', 'kg', 'gr', 'ml',
+})
+
+_EMOTICON = r"(?<!\w)(?:[:;=8xX][-']?[)(\]\[dDpPoO/\\|*]+|\^[_.]?\^|-_+-|[oO]_[oO]|<3)(?!\w)"
+# Bölünmeyecek alanlar: Ekşi referansları, URL'ler, ifadeler
+_PROTECTED_RE = re.compile(
+    r"\((?:bkz|ara|gbkz|spoiler|bknz)\s*:[^)]*\)"
+    r"|(?:https?://|www\.)\S+?(?=[.,!?)]*(?:\s|$))"
+    r"|" + _EMOTICON
+)
+# Aday sınırlar: satır sonu, üç nokta, ardından boşluk / metin sonu gelen . ! ? dizileri
+_BOUNDARY_RE = re.compile(r"\n+|(?:\.{2,}|…)+[!?]*(?=\s|$)|[.!?]+(?=[\"'”’)\]]*(?:\s|$))")
+# Sınır sonrası önceki cümleye iliştirilen kapanış tırnak / parantezler ve ifadeler ('çok iyi. :)')
+_TRAILING_RE = re.compile(r"[\"'”’)\]]*(?:[ \t]*" + _EMOTICON + r")*")
+_LAST_WORD_RE = re.compile(r"(\w+)$")
+# Sınırdan sonraki ilk anlamlı karakter (kapanış tırnak / parantez ve boşluklar atlanır)
+_NEXT_CHAR_RE = re.compile(r"[\"'”’)\] \t]*(.?)")
+
+
+def splitter_settings_from_env():
+    """
+    SENTENCE_SPLITTER (varsayılan vnlp) ve SENTENCE_SPLITTER_AUTO_CHARS.
+
+    Returns:
+        tuple: (mod, auto eşiği)
+    """
+    mode = os.getenv('SENTENCE_SPLITTER', 'vnlp').strip().lower()
+    if mode not in MODES:
+        print(f"  ⚠️ Unknown SENTENCE_SPLITTER={mode}, using vnlp")
+        mode = 'vnlp'
+    return mode, int(os.getenv('SENTENCE_SPLITTER_AUTO_CHARS', '300'))
+
+
+class RuleSentenceSplitter:
+    """VNLP SentenceSplitter ile aynı split() arayüzünü sunan, model gerektirmeyen Türkçe cümle bölücü"""
+
+    def __init__(self, abbreviations=ABBREVIATIONS):
+        self.abbreviations = frozenset(a.lower() for a in abbreviations)
+
+    def _is_boundary(self, text: str, start: int, end: int, mark: str) -> bool:
+        if mark.startswith('\n'):
+            return True
+        quoted = end < len(text) and text[end] in '"\'”’'
+        nxt = _NEXT_CHAR_RE.match(text, end).group(1)
+        if '…' in mark or '..' in mark:
+            # Üç nokta: devam eden cümlede sık kullanılır; sadece büyük harf veya metin sonu öncesi sınır
+            return not nxt or nxt.isupper()
+        if quoted and nxt.islower():
+            # Alıntı içindeki soru / ünlem ('"ne?" dedi') cümleyi bitirmez
+            return False
+        if mark != '.':
+            return True
+        word = _LAST_WORD_RE.search(text, max(0, start - 16), start)
+        if word is None:
+            return True
+        word = word.group(1)
+        if word.lower() in self.abbreviations:
+            return False
+        # Baş harf ('m. kemal', 'a.b.d.') veya küçük harfle devam eden sıra sayısı ('3. sınıf')
+        if len(word) == 1 and word.isalpha() and (start < 2 or text[start - 2].isspace() or text[start - 2] == '.'):
+            return False
+        if word.isdigit() and nxt.islower():
+            return False
+        return True
+
+    def split(self, text: str) -> list:
+        """
+        Metni cümlelere böl (boş parçalar atlanır, parçalar kırpılır).
+
+        Returns:
+            list: Cümleler (metin sırasıyla)
+        """
+        if not text:
+            return []
+        protected = [m.span() for m in _PROTECTED_RE.finditer(text)]
+        sentences = []
+        begin = 0
+        p = 0
+        for m in _BOUNDARY_RE.finditer(text):
+            start, end = m.span()
+            while p < len(protected) and protected[p][1] <= start:
+                p += 1
+            if p < len(protected) and protected[p][0] <= start < protected[p][1]:
+                continue
+            if start < begin or not self._is_boundary(text, start, end, m.group()):
+                continue
+            end = _TRAILING_RE.match(text, end).end()
+            part = text[begin:end].strip()
+            if part:
+                sentences.append(part)
+            begin = end
+        tail = text[begin:].strip()
+        if tail:
+            sentences.append(tail)
+        return sentences
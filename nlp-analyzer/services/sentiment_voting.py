@@ -0,0 +1,171 @@
+"""
+Duygu Oylama Çekirdeği
+NLPService'in cümle bazlı oylama kurallarının ayarları ve NumPy ile vektörize edilmiş hali.
+Saklanan cümle olasılık matrisleri model yüklenmeden yeniden puanlanabilir (bkz. rescore_sentiment.py).
+"""
+
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+# Oy sınıflarının sırası: NLPService._vote_sentiment içindeki votes sözlüğü ile aynı
+SENTIMENTS = ('positive', 'negative', 'neutral')
+POSITIVE, NEGATIVE, NEUTRAL = 0, 1, 2
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)).strip())
+    except Exception:
+        return default
+
+
+@dataclass(frozen=True)
+class VotingParams:
+    """Oylama kurallarının ayarlanabilir eşikleri"""
+    last_weight_short: float = 1.1       # 1–3 cümle
+    last_weight_medium: float = 2.0      # 4–7 cümle
+    last_weight_long: float = 3.0        # 8+ cümle
+    tie_margin: float = 0.35             # oy toplamı ile en güçlü cümle çelişirse bu farkın altında cümle kazanır
+    neutral_min_conf: float = 0.55       # bu güvenin altındaki neutral kararlar gözden geçirilir
+    neutral_runner_up_min: float = 0.3   # ikinci sınıfın oyu bunu aşarsa neutral ona çevrilir
+    lexicon: bool = False                # sözlük tabanlı düzeltme
+
+    @classmethod
+    def from_env(cls):
+        """LAST_WEIGHT_*, SENTIMENT_TIE_MARGIN, SENTIMENT_NEUTRAL_* ve SENTIMENT_LEXICON_ENABLE'dan oku."""
+        return cls(
+            last_weight_short=_env_float('LAST_WEIGHT_SHORT', cls.last_weight_short),
+            last_weight_medium=_env_float('LAST_WEIGHT_MEDIUM', cls.last_weight_medium),
+            last_weight_long=_env_float('LAST_WEIGHT_LONG', cls.last_weight_long),
+            tie_margin=_env_float('SENTIMENT_TIE_MARGIN', cls.tie_margin),
+            neutral_min_conf=_env_float('SENTIMENT_NEUTRAL_MIN_CONF', cls.neutral_min_conf),
+            neutral_runner_up_min=_env_float('SENTIMENT_NEUTRAL_RUNNERUP_MIN', cls.neutral_runner_up_min),
+            lexicon=os.getenv('SENTIMENT_LEXICON_ENABLE', 'false').lower() in ('1', 'true', 'yes'),
+        )
+
+    def last_weight(self, total_sentences: int) -> float:
+        # Dinamik son cümle ağırlığı: kısa metinlerde düşük, uzunlarda yüksek
+        if total_sentences <= 3:
+            return self.last_weight_short
+        if total_sentences <= 7:
+            return self.last_weight_medium
+        return self.last_weight_long
+
+
+def precompute(probs, offsets, class_to_sentiment, class_known=None) -> dict:
+    """
+    Oylama ayarlarından bağımsız kısımları bir kez hesapla (ayar taramasında tekrar kullanılır).
+
+    Args:
+        probs (array): (toplam cümle, sınıf) olasılık matrisi; entry'lerin cümleleri art arda
+        offsets (array): (entry + 1,) entry i'nin cümleleri probs[offsets[i]:offsets[i+1]]
+        class_to_sentiment (array): Model sınıf indeksi -> SENTIMENTS indeksi
+        class_known (array): Etiketi tanınan sınıflar (tanınmayan etiket neutral / 0.5 sayılır)
+    """
+    probs = np.asarray(probs, dtype=np.float64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    class_to_sentiment = np.asarray(class_to_sentiment, dtype=np.int64)
+    n_entries = len(offsets) - 1
+    counts = np.diff(offsets)
+    live = counts > 0
+    n_sent = probs.shape[0]
+
+    head_votes = np.zeros((n_entries, 3))
+    last_votes = np.zeros((n_entries, 3))
+    best_sent = np.full(n_entries, NEUTRAL, dtype=np.int64)
+    best_conf = np.full(n_entries, 0.5)
+    pre = {'counts': counts, 'live': live, 'head_votes': head_votes, 'last_votes': last_votes,
+           'best_sent': best_sent, 'best_conf': best_conf}
+    if n_sent == 0 or not live.any():
+        return pre
+
+    # Cümle bazında en olası sınıf ve güveni (argmax eşitlikte ilk sınıfı seçer, max() ile aynı)
+    top = probs.argmax(axis=1)
+    sent_conf = probs[np.arange(n_sent), top]
+    sent_cls = class_to_sentiment[top]
+    if class_known is not None:
+        known = np.asarray(class_known, dtype=bool)[top]
+        sent_cls = np.where(known, sent_cls, NEUTRAL)
+        sent_conf = np.where(known, sent_conf, 0.5)
+
+    # Son cümle (birden fazla cümle varsa) ağırlıklı oy alır; diğerleri sırayla toplanır
+    entry = np.repeat(np.arange(n_entries), counts)
+    is_last = (np.arange(n_sent) == offsets[entry + 1] - 1) & (counts[entry] > 1)
+    np.add.at(head_votes, (entry[~is_last], sent_cls[~is_last]), sent_conf[~is_last])
+    last_votes[entry[is_last], sent_cls[is_last]] = sent_conf[is_last]
+
+    # En güçlü tek karar: entry içinde en yüksek güvenli ilk cümle
+    starts = offsets[:-1][live]
+    seg_max = np.full(n_entries, -np.inf)
+    seg_max[live] = np.maximum.reduceat(sent_conf, starts)
+    candidate = np.where(sent_conf == seg_max[entry], np.arange(n_sent), n_sent)
+    best_idx = np.minimum.reduceat(candidate, starts)
+    best_sent[live] = sent_cls[best_idx]
+    best_conf[live] = sent_conf[best_idx]
+    return pre
+
+
+def vote(pre: dict, params: VotingParams, lexicon_counts=None):
+    """
+    precompute() çıktısına NLPService._vote_sentiment kurallarını uygula.
+
+    Args:
+        pre (dict): precompute() çıktısı
+        params (VotingParams): Oylama ayarları
+        lexicon_counts (array): (entry, 2) son cümledeki pozitif / negatif sözlük eşleşmeleri
+
+    Returns:
+        tuple: (sentiment indeksleri, güven değerleri) - entry başına, SENTIMENTS sırasıyla
+    """
+    counts, live = pre['counts'], pre['live']
+    best_sent, best_conf = pre['best_sent'], pre['best_conf']
+    n_entries = len(counts)
+    rows = np.arange(n_entries)
+
+    last_weight = np.where(counts <= 3, params.last_weight_short,
+                           np.where(counts <= 7, params.last_weight_medium, params.last_weight_long))
+    votes = pre['head_votes'] + last_weight[:, None] * pre['last_votes']
+    final = votes.argmax(axis=1)
+    denom = np.maximum(1.0, counts)
+
+    # Oy toplamı ile en güçlü tek karar çelişirse ve fark küçükse o cümleyi tercih et
+    tie = (final != best_sent) & (np.abs(votes[rows, final] - votes[rows, best_sent]) < params.tie_margin)
+
+    base_conf = votes[rows, final] / denom
+    polar = final != NEUTRAL
+    out_sent = final.copy()
+    out_conf = np.where(polar, np.clip(base_conf, 0.65, 0.99), np.clip(base_conf, 0.50, 0.85))
+
+    # Düşük güvenli neutral: ikinci en yüksek oy (eşitlikte sıra korunur) yeterliyse ona çevir
+    runner_up = np.argsort(-votes, axis=1, kind='stable')[:, 1]
+    runner_votes = votes[rows, runner_up]
+    weak_neutral = ~polar & (base_conf < params.neutral_min_conf)
+    flip = weak_neutral & (runner_votes > params.neutral_runner_up_min)
+    out_sent = np.where(flip, runner_up, out_sent)
+    out_conf = np.where(flip, np.clip(runner_votes / denom, 0.60, 0.85), out_conf)
+    out_conf = np.where(weak_neutral & ~flip, np.clip(base_conf, 0.45, 0.85), out_conf)
+
+    out_sent = np.where(tie, best_sent, out_sent)
+    out_conf = np.where(tie, best_conf, out_conf)
+
+    # Sözlük tabanlı düzeltme (opsiyonel, çok kuvvetli ipuçlarında)
+    if params.lexicon and lexicon_counts is not None:
+        lex = np.asarray(lexicon_counts, dtype=np.int64)
+        lex_p, lex_n = lex[:, 0], lex[:, 1]
+        to_pos = (out_sent == NEGATIVE) & (lex_p >= 2) & (lex_n == 0) & (out_conf >= 0.75)
+        out_sent = np.where(to_pos, POSITIVE, out_sent)
+        out_conf = np.where(to_pos, np.clip(out_conf - 0.05, 0.6, 0.85), out_conf)
+        to_neg = (out_sent == POSITIVE) & (lex_n >= 2) & (lex_p == 0) & (out_conf >= 0.75)
+        out_sent = np.where(to_neg, NEGATIVE, out_sent)
+        out_conf = np.where(to_neg, np.clip(out_conf - 0.05, 0.6, 0.85), out_conf)
+
+    # Cümlesi olmayan entry'ler neutral / 0.5
+    return np.where(live, out_sent, NEUTRAL), np.where(live, out_conf, 0.5)
+
+
+def vote_batch(probs, offsets, class_to_sentiment, params: VotingParams,
+               class_known=None, lexicon_counts=None):
+    """Tek seferlik kullanım için precompute() + vote()."""
+    return vote(precompute(probs, offsets, class_to_sentiment, class_known), params, lexicon_counts)
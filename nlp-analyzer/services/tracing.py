@@ -0,0 +1,175 @@
+"""
+İstek İzleme (Tracing)
+Her HTTP isteği için bir Trace (istek id'si + zamanlanmış span'ler + sayaçlar) contextvars ile taşınır;
+NLPService aşamaları (_stage), Ekşi API çağrıları ve worker çağrıları aktif izlere span olarak yazılır.
+Mikro-batcher bir batch'i çalıştırırken batch'teki tüm isteklerin izlerini birlikte aktif eder; batch
+içindeki aşamalar her isteğin izine eklenir (sayaçlar batch'in tamamını kapsar).
+Aktif iz yoksa kayıt fonksiyonları hemen döner.
+SLOW_REQUEST_MS (varsayılan 5000; 0 kapatır) eşiğini aşan istekler tek satır JSON olarak loglanır.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+MAX_REQUEST_ID_LENGTH = 128
+
+logger = logging.getLogger("nlp-analyzer.slow")
+
+# Aktif izler: istek thread'inde tek iz, mikro-batch dağıtıcısında batch'teki isteklerin izleri
+_active: ContextVar[tuple] = ContextVar('active_traces', default=())
+
+
+def slow_request_ms_from_env() -> float:
+    """SLOW_REQUEST_MS (varsayılan 5000 ms; 0 veya negatif: slow-request logu kapalı)."""
+    return float(os.getenv('SLOW_REQUEST_MS', '5000'))
+
+
+def new_request_id(incoming: str = None) -> str:
+    """Gelen X-Request-ID makul uzunluktaysa onu, değilse yeni bir id döndür."""
+    if incoming:
+        incoming = incoming.strip()
+        if 0 < len(incoming) <= MAX_REQUEST_ID_LENGTH and incoming.isprintable():
+            return incoming
+    return uuid.uuid4().hex
+
+
+class Trace:
+    """Tek bir isteğin span toplamları ve sayaçları"""
+
+    def __init__(self, request_id: str, name: str = ''):
+        self.request_id = request_id
+        self.name = name
+        self.started = time.perf_counter()
+        self.spans = {}  # span adı -> [çağrı, öğe, toplam saniye, en uzun saniye]
+        self.counts = {}
+        self.peaks = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, elapsed: float, items: int = 1):
+        with self._lock:
+            span = self.spans.get(name)
+            if span is None:
+                span = self.spans[name] = [0, 0, 0.0, 0.0]
+            span[0] += 1
+            span[1] += items
+            span[2] += elapsed
+            span[3] = max(span[3], elapsed)
+
+    def add(self, **counts):
+        with self._lock:
+            for key, value in counts.items():
+                self.counts[key] = self.counts.get(key, 0) + value
+
+    def peak(self, **values):
+        with self._lock:
+            for key, value in values.items():
+                self.peaks[key] = max(self.peaks.get(key, value), value)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def summary(self, **extra) -> dict:
+        """Log / yanıt için span dökümü (en uzun süren span'ler önce)."""
+        with self._lock:
+            spans = sorted(self.spans.items(), key=lambda kv: kv[1][2], reverse=True)
+            return {
+                'request_id': self.request_id,
+                'name': self.name,
+                'duration_ms': round(self.elapsed_ms(), 2),
+                **extra,
+                'spans': {
+                    name: {
+                        'calls': calls,
+                        'items': items,
+                        'total_ms': round(sec * 1000, 2),
+                        'max_ms': round(max_sec * 1000, 2),
+                    }
+                    for name, (calls, items, sec, max_sec) in spans
+                },
+                'counts': {**self.counts, **self.peaks},
+            }
+
+
+def start(request_id: str, name: str = ''):
+    """
+    Yeni izi bu context'te aktif et.
+
+    Returns:
+        tuple: (Trace, finish() için token)
+    """
+    trace = Trace(request_id, name)
+    return trace, _active.set((trace,))
+
+
+def finish(token):
+    _active.reset(token)
+
+
+def current():
+    """Context'teki ilk aktif iz (yoksa None)."""
+    traces = _active.get()
+    return traces[0] if traces else None
+
+
+def current_request_id() -> str:
+    trace = current()
+    return trace.request_id if trace is not None else ''
+
+
+@contextmanager
+def activate(traces):
+    """Verilen izleri (örn. bir mikro-batch'teki isteklerinkini) blok boyunca aktif et."""
+    token = _active.set(tuple(t for t in traces if t is not None))
+    try:
+        yield
+    finally:
+        _active.reset(token)
+
+
+def record(name: str, elapsed: float, items: int = 1):
+    """Önceden ölçülmüş bir süreyi aktif izlere span olarak yaz."""
+    for trace in _active.get():
+        trace.record(name, elapsed, items)
+
+
+@contextmanager
+def span(name: str, items: int = 1):
+    """Blok süresini aktif izlere yaz (aktif iz yoksa ölçüm yapılmaz)."""
+    traces = _active.get()
+    if not traces:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        for trace in traces:
+            trace.record(name, elapsed, items)
+
+
+def add(**counts):
+    """Aktif izlerin sayaçlarını artır (örn. sentences=3, sentiment_tokens=120)."""
+    for trace in _active.get():
+        trace.add(**counts)
+
+
+def peak(**values):
+    """Aktif izlerde en büyük değeri tut (örn. max_text_chars)."""
+    for trace in _active.get():
+        trace.peak(**values)
+
+
+def log_if_slow(trace: Trace, threshold_ms: float, **extra) -> bool:
+    """Süre eşiği aştıysa izin özetini tek satır JSON olarak logla."""
+    if threshold_ms <= 0 or trace.elapsed_ms() < threshold_ms:
+        return False
+    logger.warning("slow_request %s", json.dumps(trace.summary(**extra), ensure_ascii=False))
+    return True
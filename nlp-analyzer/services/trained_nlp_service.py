@@ -4,17 +4,13 @@ Duygu analizi ve tema analizi için GPU-aware ve debug log destekli örnek servi
 Bu sınıf, gerçek modellerinizi kolayca entegre edebilmeniz için esnek bırakılmıştır.
 """
 
+import importlib.util
 import logging
 import random
 from typing import Any, Dict, List, Optional
 
-# Torch opsiyonel; yoksa CPU'ya düşer
-try:
-    import torch  # type: ignore
-    HAS_TORCH = True
-except Exception:  # torch yoksa buraya düşer
-    torch = None  # type: ignore
-    HAS_TORCH = False
+# Torch opsiyonel; yoksa CPU'ya düşer. Sadece varlığı kontrol edilir, import cihaz seçiminde yapılır
+HAS_TORCH = importlib.util.find_spec("torch") is not None
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +32,9 @@ def _get_device() -> int:
         except ValueError:
             logger.warning("[DEVICE] NLP_DEVICE env integer değil: %r", env_device)
 
+    if HAS_TORCH:
+        import torch  # type: ignore
+
     if HAS_TORCH and torch.cuda.is_available():  # type: ignore[attr-defined]
         logger.info("[DEVICE] CUDA kullanılabilir, GPU:0 seçildi (ör. RTX 3060 6GB).")
         return 0
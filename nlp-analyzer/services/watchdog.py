@@ -0,0 +1,188 @@
+"""
+Zaman Aşımı Denetimi
+Toplu analiz scriptleri için çağrı başına zaman aşımı uygulayan uzun ömürlü yürütücü ve
+entry başına gecikme yüzdelikleri. Süreç içi (WatchdogExecutor) takılan thread öldürülemez, sadece
+bırakılıp yenisi açılır; bırakılan thread CPU / GIL için yarışmasın diye o çağrıdan dönene kadar (sınırlı
+süre) yeni çağrı başlatılmaz. Öldürülebilir izolasyon için InferenceWorkerPool.call(..., timeout=...) kullanılır.
+"""
+
+import math
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FuturesTimeout
+
+
+class LatencyStats:
+    """Entry başına gecikme örnekleri ve zaman aşımı sayacı (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = []
+        self.timeouts = 0
+        self.timed_out_entries = 0
+        self.blocked_calls = 0  # bırakılan thread'in bitmesini beklemek zorunda kalan çağrılar
+        self.blocked_sec = 0.0
+
+    def record(self, seconds: float, entries: int = 1):
+        """Bir çağrının süresini işlediği entry sayısına bölerek kaydet."""
+        if entries <= 0:
+            return
+        with self._lock:
+            self._samples.extend([seconds / entries] * entries)
+
+    def record_timeout(self, entries: int = 1):
+        with self._lock:
+            self.timeouts += 1
+            self.timed_out_entries += entries
+
+    def record_blocked(self, seconds: float):
+        """Yeni çağrının bırakılan (takılan) thread'i beklediği süreyi kaydet."""
+        with self._lock:
+            self.blocked_calls += 1
+            self.blocked_sec += seconds
+
+    def summary(self) -> dict:
+        with self._lock:
+            samples = sorted(self._samples)
+            timeouts, timed_out = self.timeouts, self.timed_out_entries
+            blocked_calls, blocked_sec = self.blocked_calls, self.blocked_sec
+        summary = {'entries': len(samples), 'timeouts': timeouts, 'timed_out_entries': timed_out,
+                   'blocked_calls': blocked_calls, 'blocked_ms': round(blocked_sec * 1000, 2)}
+        if samples:
+            summary['mean_ms'] = round(sum(samples) / len(samples) * 1000, 2)
+            for p in (50, 90, 95, 99):
+                summary[f'p{p}_ms'] = round(_percentile(samples, p) * 1000, 2)
+            summary['max_ms'] = round(samples[-1] * 1000, 2)
+        return summary
+
+    def format(self) -> str:
+        s = self.summary()
+        blocked = (f"; {s['blocked_calls']} call(s) waited {s['blocked_ms'] / 1000:.1f}s for hung threads"
+                   if s['blocked_calls'] else "")
+        if not s['entries']:
+            return f"no completed entries, timeouts: {s['timeouts']}{blocked}"
+        return (f"mean {s['mean_ms']:.1f} ms, p50 {s['p50_ms']:.1f}, p90 {s['p90_ms']:.1f}, "
+                f"p95 {s['p95_ms']:.1f}, p99 {s['p99_ms']:.1f}, max {s['max_ms']:.1f} ms "
+                f"({s['entries']} entries); timeouts: {s['timeouts']} calls / {s['timed_out_entries']} entries"
+                f"{blocked}")
+
+
+def _percentile(sorted_values: list, p: float) -> float:
+    # En yakın sıra yöntemi
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class WatchdogExecutor:
+    """
+    Servis metodlarını tek, uzun ömürlü bir daemon thread'de zaman aşımıyla çalıştırır.
+    Zaman aşımında takılan thread bırakılır ve yeni bir thread açılır (Python thread'i öldürülemez);
+    bırakılan thread sayısı `abandoned` ile izlenir. Bırakılan thread hâlâ çalışırken yeni çağrı başlatılmaz
+    (wait_abandoned): iki analiz aynı anda CPU / GIL için yarışıp gecikmeleri bozmaz. Bekleme, takılan
+    çağrının zaman aşımının NLP_ABANDON_WAIT_FACTOR (varsayılan 3) katıyla sınırlıdır; sınır aşılırsa
+    çağrılar fallback_factory ile kurulan öldürülebilir havuza (örn. InferenceWorkerPool) taşınır, fallback
+    yoksa kalan çağrılar TimeoutError ile düşürülür. Daemon olduğu için takılan thread çıkışı engellemez.
+    InferenceWorkerPool ile aynı call() imzasını sunar.
+    """
+
+    def __init__(self, service, name: str = 'nlp-watchdog', fallback_factory=None, wait_factor: float = None):
+        """
+        Args:
+            service: Metodları çağrılacak servis (NLPService)
+            name (str): Çalışan thread'in adı
+            fallback_factory: Takılan thread sınırda dönmezse çağrılan, call(method, ..., timeout=...) sunan
+                              ve load() ile hazırlanan yürütücüyü döndüren fonksiyon (None: kalan çağrılar düşer)
+            wait_factor (float): Bırakılan thread için en fazla beklenecek süre / takılan çağrının zaman aşımı
+        """
+        self.service = service
+        self.name = name
+        self.abandoned = 0
+        self.fallback = None  # sınır aşılıp geçilen yürütücü
+        self.wedged = False  # takılan thread sınırda dönmedi ve fallback kurulamadı
+        self.wait_factor = wait_factor if wait_factor is not None else float(
+            os.getenv('NLP_ABANDON_WAIT_FACTOR', '3'))
+        self._fallback_factory = fallback_factory
+        self._tasks = None
+        self._thread = None
+        self._stragglers = []  # (bırakılan thread, beklemenin bırakılacağı an) — henüz dönmemiş olanlar
+        self._start_thread()
+
+    def _start_thread(self):
+        self._tasks = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, args=(self._tasks,), name=self.name, daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def _run(tasks):
+        while True:
+            item = tasks.get()
+            if item is None:
+                return
+            future, fn, args, kwargs = item
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def wait_abandoned(self) -> float:
+        """
+        Bırakılan thread'ler takıldıkları çağrıdan dönene kadar (en fazla bekleme sınırına kadar) bekle.
+        Sınırda dönmeyen thread varsa çağrılar fallback yürütücüye taşınır (bkz. _give_up).
+
+        Returns:
+            float: Beklenen süre (saniye; bırakılan thread yoksa 0)
+        """
+        self._stragglers = [(t, limit) for t, limit in self._stragglers if t.is_alive()]
+        if not self._stragglers:
+            return 0.0
+        started = time.monotonic()
+        for thread, give_up_at in self._stragglers:
+            thread.join(max(0.0, give_up_at - time.monotonic()))
+            if thread.is_alive():
+                self._give_up()
+                break
+        self._stragglers = []
+        return time.monotonic() - started
+
+    def _give_up(self):
+        # Takılan thread sınırda dönmedi: öldürülebilir yürütücüye geç ya da kalan çağrıları düşür
+        print(f"   ⚠️ Hung in-process call did not return within {self.wait_factor:g}x its timeout", flush=True)
+        if self._fallback_factory is None:
+            self.wedged = True
+            return
+        print("   ♻️ Switching to an isolated worker process (as with --isolate)", flush=True)
+        try:
+            fallback = self._fallback_factory()
+            fallback.load()
+        except Exception as e:
+            print(f"   ❌ Could not start isolated worker: {e}", flush=True)
+            self.wedged = True
+            return
+        self.fallback = fallback
+
+    def call(self, method: str, *args, timeout: float = None, **kwargs):
+        if self.fallback is None and not self.wedged:
+            self.wait_abandoned()
+        if self.fallback is not None:
+            return self.fallback.call(method, *args, timeout=timeout, **kwargs)
+        if self.wedged:
+            raise TimeoutError(f"{method} not started: in-process runner is stuck on a hung call")
+        future = Future()
+        self._tasks.put((future, getattr(self.service, method), args, kwargs))
+        try:
+            return future.result(timeout=timeout)
+        except FuturesTimeout:
+            # Takılan thread çağrıdan dönerse durma sinyalini görüp çıkar; yeni çağrılar yeni thread'e gider
+            # ama o dönene (ya da bekleme sınırı dolana) kadar başlatılmaz (wait_abandoned)
+            self._tasks.put(None)
+            self._stragglers.append((self._thread, time.monotonic() + self.wait_factor * timeout))
+            self._start_thread()
+            self.abandoned += 1
+            raise TimeoutError(f"{method} timeout > {timeout}s")
+
+    def close(self):
+        self._tasks.put(None)
+        if self.fallback is not None:
+            self.fallback.close()
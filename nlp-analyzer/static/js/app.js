@@ -389,35 +389,37 @@ async function analyzeEntry(entry, index) {
     analysisSection.innerHTML = '<span class="analysis-badge">Analiz ediliyor...</span>';
 
     try {
-        // Call sentiment and theme analysis APIs
-        const [sentimentResponse, themeResponse] = await Promise.all([
-            fetch(`${API_BASE_URL}/api/analyze/sentiment`, {
+        // Sentiment + theme analysis in a single round trip
+        let response;
+        for (let attempt = 0; ; attempt++) {
+            response = await fetch(`${API_BASE_URL}/api/analyze/combined`, {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({ text, entry_id: entry.id || index })
-            }),
-            fetch(`${API_BASE_URL}/api/analyze/theme`, {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ text, entry_id: entry.id || index })
-            })
-        ]);
+            });
+            // Modeller hâlâ yükleniyorsa Retry-After kadar bekleyip tekrar dene
+            const retryAfter = parseInt(response.headers.get('Retry-After'), 10);
+            if (response.status !== 503 || !retryAfter || attempt >= 5) {
+                break;
+            }
+            analysisSection.innerHTML = '<span class="analysis-badge">Modeller yükleniyor...</span>';
+            await new Promise(resolve => setTimeout(resolve, retryAfter * 1000));
+        }
 
-        const sentimentData = await sentimentResponse.json();
-        const themeData = await themeResponse.json();
+        const data = await response.json();
 
-        if (!sentimentData.success || !themeData.success) {
+        if (!data.success) {
             throw new Error('Analiz başarısız');
         }
 
         // Store results
         analyzedEntries.set(index, {
-            sentiment: sentimentData.data,
-            theme: themeData.data
+            sentiment: data.data.sentiment,
+            theme: data.data.theme
         });
 
         // Render results
-        renderAnalysisResults(analysisSection, sentimentData.data, themeData.data);
+        renderAnalysisResults(analysisSection, data.data.sentiment, data.data.theme);
 
         // Update stats
         updateStats();
@@ -0,0 +1,6 @@
+"""pytest: testler nlp-analyzer dizininden import yapabilsin diye kök dizini sys.path'e ekle."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
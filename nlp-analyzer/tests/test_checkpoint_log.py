@@ -0,0 +1,82 @@
+"""CheckpointLog: ekleme, --resume ile geri yükleme, yarım satır kurtarma ve resume'suz döndürme."""
+
+import json
+import os
+
+from services.checkpoint_log import CheckpointLog, text_hash
+
+
+def _write_log(path, rows):
+    log = CheckpointLog(str(path))
+    for row_id, text, sentiment in rows:
+        log.append(row_id, text, sentiment=sentiment)
+    log.close()
+    return log
+
+
+def test_resume_restores_unchanged_rows(tmp_path):
+    path = tmp_path / 'run_checkpoint.jsonl'
+    first = _write_log(path, [(0, 'güzel film', 'positive'), (1, 'berbat', 'negative')])
+    assert first.appended == 2
+
+    log = CheckpointLog(str(path), resume=True)
+    assert log.appended == 0
+    assert log.get(0, 'güzel film')['sentiment'] == 'positive'
+    # Metni değişen satır yeniden işlenmeli
+    assert log.get(1, 'aslında fena değil') is None
+    assert log.get(2, 'yeni satır') is None
+
+    log.append(1, 'aslında fena değil', sentiment='neutral')
+    log.close()
+    assert log.appended == 1
+
+    # Aynı satır tekrar yazıldıysa sonuncusu geçerli
+    reopened = CheckpointLog(str(path), resume=True)
+    assert reopened.get(1, 'aslında fena değil')['sentiment'] == 'neutral'
+    assert reopened.get(1, 'berbat') is None
+    reopened.close()
+
+
+def test_resume_drops_partial_line(tmp_path):
+    path = tmp_path / 'run_checkpoint.jsonl'
+    _write_log(path, [(0, 'a', 'positive'), (1, 'b', 'negative')])
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"row": 2, "hash": "')  # çökme anında yarım kalan kayıt
+
+    log = CheckpointLog(str(path), resume=True)
+    assert set(log.records) == {'0', '1'}
+    log.append(2, 'c', sentiment='neutral')
+    log.close()
+
+    with open(path, encoding='utf-8') as f:
+        lines = [json.loads(line) for line in f]
+    assert [r['row'] for r in lines] == [0, 1, 2]
+    assert lines[-1]['hash'] == text_hash('c')
+
+
+def test_without_resume_rotates_existing_log(tmp_path):
+    path = tmp_path / 'run_checkpoint.jsonl'
+    _write_log(path, [(0, 'a', 'positive')])
+
+    log = CheckpointLog(str(path))
+    assert log.records == {}
+    assert log.rotated_to is not None and os.path.exists(log.rotated_to)
+    assert os.path.basename(log.rotated_to).startswith('run_checkpoint.')
+    assert log.rotated_to.endswith('.jsonl')
+    log.close()
+    assert os.path.getsize(path) == 0
+
+    # İkinci döndürme öncekinin üzerine yazmaz (aynı saniyede -n soneki alır)
+    _write_log(path, [(0, 'b', 'negative')])
+    second = CheckpointLog(str(path))
+    second.close()
+    assert second.rotated_to not in (None, log.rotated_to)
+    assert os.path.exists(log.rotated_to)
+
+
+def test_without_resume_keeps_empty_log(tmp_path):
+    path = tmp_path / 'run_checkpoint.jsonl'
+    path.write_text('')
+    log = CheckpointLog(str(path))
+    log.close()
+    assert log.rotated_to is None
@@ -0,0 +1,45 @@
+"""RuleSentenceSplitter sınır durumları (kısaltma, sıra sayısı, üç nokta, referans, URL, tırnak, ifade)."""
+
+import pytest
+
+from services.sentence_splitter import RuleSentenceSplitter, splitter_settings_from_env
+
+
+@pytest.fixture(scope='module')
+def splitter():
+    return RuleSentenceSplitter()
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("bugün hava güzel. yarın yağmur var.", ["bugün hava güzel.", "yarın yağmur var."]),
+    ("gerçekten mi? evet! tamam.", ["gerçekten mi?", "evet!", "tamam."]),
+    ("ilk satır\nikinci satır", ["ilk satır", "ikinci satır"]),
+    # Kısaltmalar ve baş harfler
+    ("dr. ahmet geldi. prof. mehmet gelmedi.", ["dr. ahmet geldi.", "prof. mehmet gelmedi."]),
+    ("elma, armut vb. meyveler aldım. çok güzeldi.", ["elma, armut vb. meyveler aldım.", "çok güzeldi."]),
+    ("m. kemal atatürk büyük liderdi.", ["m. kemal atatürk büyük liderdi."]),
+    # Sıra sayıları
+    ("3. sınıfta okuyorum. zor geçiyor.", ["3. sınıfta okuyorum.", "zor geçiyor."]),
+    # Cümle ortasında üç nokta
+    ("bilmiyorum... belki de haklısın.", ["bilmiyorum... belki de haklısın."]),
+    # Ekşi referansları ve URL'ler
+    ("şu filme bakın (bkz: yüzüklerin efendisi. ikinci film) harika.",
+     ["şu filme bakın (bkz: yüzüklerin efendisi. ikinci film) harika."]),
+    ("detaylar www.ornek.com.tr adresinde. herkese tavsiye ederim.",
+     ["detaylar www.ornek.com.tr adresinde.", "herkese tavsiye ederim."]),
+    # Tırnak içindeki soru işareti cümleyi bitirmez
+    ('"ne?" dedi ve gitti.', ['"ne?" dedi ve gitti.']),
+    # Sondaki ifadeler önceki cümleye iliştirilir
+    ("çok iyi. :) ama pahalı. :D", ["çok iyi. :)", "ama pahalı. :D"]),
+    ("", []),
+])
+def test_split(splitter, text, expected):
+    assert splitter.split(text) == expected
+
+
+def test_settings_from_env(monkeypatch):
+    monkeypatch.setenv('SENTENCE_SPLITTER', 'Rules')
+    monkeypatch.setenv('SENTENCE_SPLITTER_AUTO_CHARS', '120')
+    assert splitter_settings_from_env() == ('rules', 120)
+    monkeypatch.setenv('SENTENCE_SPLITTER', 'bilinmeyen')
+    assert splitter_settings_from_env()[0] == 'vnlp'
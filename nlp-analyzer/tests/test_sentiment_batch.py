@@ -0,0 +1,66 @@
+"""
+analyze_sentiment_batch, tek tek analyze_sentiment ile aynı sonucu vermeli (cümleler entry'ler arası
+aynı forward batch'ine düşse, padding ve sıralama değişse bile). Ağ gerektirmeyen küçük rastgele ağırlıklı
+model paketiyle (benchmarks.stages.build_tiny_bundle) çalışır.
+"""
+
+import pytest
+
+pytest.importorskip('torch')
+pytest.importorskip('tokenizers')
+pytest.importorskip('transformers')
+
+from benchmarks.common import build_service  # noqa: E402
+from benchmarks.stages import build_tiny_bundle  # noqa: E402
+
+TEXTS = [
+    "bu film gerçekten çok güzeldi. herkese tavsiye ederim.",
+    "berbat bir hizmet, bir daha asla gitmem!",
+    "dr. ahmet bey 3. katta oturuyor... bilmiyorum, belki de haklısın.",
+    "şu entry'e bakın (bkz: ekşi sözlük) çok komik :)",
+    "detaylar www.ornek.com.tr adresinde. fiyatlar pahalı ama kalite iyi.",
+    "kısa",
+    "",
+    "ilk satır\nikinci satır\nüçüncü satır uzun bir cümle olarak burada devam ediyor ve bitmiyor.",
+    "bu film gerçekten çok güzeldi. herkese tavsiye ederim.",  # tekrar eden metin
+]
+
+
+@pytest.fixture(scope='module', params=['vnlp', 'rules'])
+def service(request, tmp_path_factory):
+    bundle_dir = build_tiny_bundle(str(tmp_path_factory.mktemp('bundle')), TEXTS * 4)
+    service = build_service(load=False, NLP_MODEL_BUNDLE=bundle_dir, SENTENCE_SPLITTER=request.param)
+    service._configure_runtime()
+    service._load_component('sentiment', service._load_sentiment)
+    try:
+        service._load_component('vnlp', service._load_vnlp)
+    except Exception:
+        pass  # VNLP yoksa iki yol da aynı yedek (küçük harf + kural tabanlı bölme) ile çalışır
+    return service
+
+
+@pytest.mark.parametrize('batch_size', [1, 4, 64])
+def test_batch_matches_per_text(service, batch_size):
+    expected = [service.analyze_sentiment(t) for t in TEXTS]
+    actual = service.analyze_sentiment_batch(TEXTS, batch_size=batch_size)
+    assert len(actual) == len(TEXTS)
+    for text, exp, got in zip(TEXTS, expected, actual):
+        assert got.keys() == exp.keys(), text
+        assert got['sentiment'] == exp['sentiment'], text
+        assert got.get('label') == exp.get('label'), text
+        assert got.get('confidence', 0.0) == pytest.approx(exp.get('confidence', 0.0), abs=0.011), text
+
+
+@pytest.mark.parametrize('batch_size', [1, 4, 64])
+def test_batch_probs_match_per_text(service, batch_size):
+    # Rastgele ağırlıklı model çoğu entry'de aynı sınıfı seçer; padding / sıralama hatası olasılıklarda görünür
+    expected = [service.sentiment_probs_batch([t], batch_size=1)[0] for t in TEXTS]
+    actual = service.sentiment_probs_batch(TEXTS, batch_size=batch_size)
+    for text, exp, got in zip(TEXTS, expected, actual):
+        assert ('error' in got) == ('error' in exp), text
+        if 'error' in exp:
+            continue
+        assert got['lexicon'] == exp['lexicon'], text
+        assert len(got['probs']) == len(exp['probs']), text
+        for got_row, exp_row in zip(got['probs'], exp['probs']):
+            assert got_row == pytest.approx(exp_row, abs=1e-6), text
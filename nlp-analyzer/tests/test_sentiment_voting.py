@@ -0,0 +1,59 @@
+"""sentiment_voting.vote_batch, NLPService._vote_sentiment ile (entry entry oylama) aynı kararı vermeli."""
+
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from services.nlp_service import NLPService  # noqa: E402
+from services.sentiment_voting import SENTIMENTS, VotingParams, vote_batch  # noqa: E402
+
+LABEL_SETS = [
+    {0: 'negative', 1: 'neutral', 2: 'positive'},
+    {0: 'LABEL_0', 1: 'LABEL_1', 2: 'LABEL_2'},
+    {0: 'olumsuz', 1: 'olumlu', 2: 'karışık', 3: 'nötr'},  # 'karışık' tanınmaz: neutral / 0.5
+]
+PARAMS = [
+    VotingParams(),
+    VotingParams(lexicon=True),
+    VotingParams(last_weight_short=1.0, last_weight_medium=3.0, last_weight_long=4.0, tie_margin=0.5,
+                 neutral_min_conf=0.8, neutral_runner_up_min=0.2, lexicon=True),
+]
+
+
+def _random_entries(rng, n_classes, n_entries=300):
+    probs, offsets, texts, lexicon = [], [0], [], []
+    for i in range(n_entries):
+        n = int(rng.integers(0, 12))
+        p = rng.dirichlet(np.full(n_classes, 0.6), size=n)
+        if n and i % 7 == 0:
+            p[-1] = p[0]  # en güçlü tek karar için eşitlik
+        probs.append(p)
+        offsets.append(offsets[-1] + n)
+        texts.append(f"entry {i}")
+        lexicon.append((int(rng.integers(0, 4)), int(rng.integers(0, 3))))
+    return np.concatenate(probs), np.array(offsets), texts, lexicon
+
+
+@pytest.mark.parametrize('id2label', LABEL_SETS)
+@pytest.mark.parametrize('params', PARAMS)
+def test_vote_batch_matches_vote_sentiment(id2label, params):
+    service = NLPService(load=False)
+    service.sentiment_model = SimpleNamespace(config=SimpleNamespace(id2label=id2label, num_labels=len(id2label)))
+    service.voting = params
+    rng = np.random.default_rng(len(id2label))
+    probs, offsets, texts, lexicon = _random_entries(rng, len(id2label))
+    lexicon_by_text = dict(zip(texts, lexicon))
+    service._lexicon_counts = lexicon_by_text.__getitem__
+
+    _, mapping, known = service.sentiment_label_map()
+    sent_idx, conf = vote_batch(probs, offsets, mapping, params, class_known=known, lexicon_counts=lexicon)
+
+    for i, text in enumerate(texts):
+        rows = probs[offsets[i]:offsets[i + 1]].tolist()
+        if not rows:
+            continue  # boş entry _vote_sentiment'e hiç gelmez
+        expected = service._vote_sentiment(rows, [text])
+        assert SENTIMENTS[sent_idx[i]] == expected['sentiment'], i
+        assert round(float(conf[i]), 2) == expected['confidence'], i